@@ -0,0 +1,431 @@
+"""
+ml/ 핫 패스 벤치마크 모음
+합성 데이터셋(기본 1k ~ 1M 샘플)으로 색상 변환, 증강, JSON 로드, 다양성 손실
+학습 스텝, 예측 처리량, 색상 다양성 평가, TensorFlow.js 내보내기, 팔레트 최근접 이웃
+인덱스(생성, brute force 대비 질의 지연 시간과 recall)의 소요 시간과 처리량을 측정하고,
+환경 정보와 함께 JSON으로 저장합니다.
+GPU를 사용하지 않으며(CPU 전용) 네트워크 없이 실행됩니다.
+
+사용법:
+    python benchmark.py                                   # 1k, 10k, 100k, 1M
+    python benchmark.py --scales 1000 10000 --stages predict export
+    python benchmark.py --compare benchmark_results_old.json  # 이전 결과 대비 느려진 항목 표시
+"""
+
+import os
+
+# TensorFlow 임포트 전에 설정해야 적용됨
+os.environ.setdefault('CUDA_VISIBLE_DEVICES', '-1')
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_SCALES = [1000, 10000, 100000, 1000000]
+STAGES = ['hex_to_rgb', 'augmentation', 'json_load', 'loss_step', 'predict',
+          'color_diversity', 'export', 'palette_index']
+CATEGORIES = ['vibrant', 'harmonious', 'cool', 'warm', 'neutral', 'contrast', 'random']
+
+
+def make_synthetic_face_color(num_samples, rng):
+    """얼굴-색상 학습 데이터와 같은 형태의 합성 X (N, 148), y (N, 15)"""
+    X = np.empty((num_samples, 148), dtype=np.float32)
+    X[:, :128] = np.clip(rng.normal(0, 0.12, (num_samples, 128)), -0.35, 0.35)
+    X[:, 128:] = rng.random((num_samples, 20), dtype=np.float32)
+    y = rng.random((num_samples, 15), dtype=np.float32)
+    extremes = rng.random(y.shape) < 0.2  # 극값(0 또는 1) 포함
+    y[extremes] = np.round(y[extremes])
+    return X, y
+
+
+def make_synthetic_palettes(num_samples, rng):
+    """MBTI 지표 학습 데이터와 같은 형태의 '#RRGGBB' 팔레트 목록과 라벨"""
+    values = rng.integers(0, 1 << 24, size=(num_samples, 5))
+    palettes = [[f"#{value:06x}" for value in row] for row in values.tolist()]
+    labels = np.where(rng.random(num_samples) < 0.5, 'E', 'I')
+    return palettes, labels
+
+
+def write_synthetic_face_color_json(path, X, y, rng):
+    """diverse-face-color/training-data.json 형식의 합성 JSON 파일 작성"""
+    colors = (np.clip(y, 0, 1) * 255).astype(np.uint32).reshape(len(y), 5, 3)
+    packed = (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+    characteristics = rng.random((len(X), 5)).round(4).tolist()
+    categories = rng.integers(0, len(CATEGORIES), len(X)).tolist()
+    metadata = [
+        {
+            'colors': [f"#{value:06x}" for value in row],
+            'colorCharacteristics': dict(zip(
+                ['brightness', 'saturation', 'temperature', 'contrast', 'harmony'], traits
+            )),
+            'colorCategory': CATEGORIES[category]
+        }
+        for row, traits, category in zip(packed.tolist(), characteristics, categories)
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'X': X.round(5).tolist(), 'y': y.round(5).tolist(), 'metadata': metadata}, f)
+
+
+def _measure(fn, repeats=3, max_seconds=5.0):
+    """fn의 최소 실행 시간(초). 한 번 실행이 max_seconds를 넘으면 반복하지 않음"""
+    best = float('inf')
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        if elapsed > max_seconds:
+            break
+    return best
+
+
+@contextlib.contextmanager
+def _quiet():
+    """벤치마크 대상 함수의 진행 출력 숨기기"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+class BenchmarkRecorder:
+    """측정 결과 목록과 진행 출력"""
+
+    def __init__(self, repeats):
+        self.repeats = repeats
+        self.results = []
+
+    def run(self, stage, variant, samples, fn, repeats=None):
+        seconds = _measure(fn, self.repeats if repeats is None else repeats)
+        result = {
+            'stage': stage,
+            'variant': variant,
+            'samples': int(samples),
+            'seconds': seconds,
+            'samples_per_second': samples / seconds if seconds > 0 else float('inf')
+        }
+        self.results.append(result)
+        print(f"   {stage:>16} {variant:<28} {samples:>9,} {seconds * 1000:>11.2f}ms "
+              f"{result['samples_per_second']:>14,.0f}/s")
+        return result
+
+
+def bench_hex_to_rgb(recorder, scales, rng, max_scalar_samples):
+    from palette_augmentation import hex_palettes_to_array
+    from train_model import hex_to_rgb_normalized
+
+    for n in scales:
+        palettes, _ = make_synthetic_palettes(n, rng)
+        if n <= max_scalar_samples:
+            recorder.run('hex_to_rgb', 'hex_to_rgb_normalized', n, lambda: [
+                [c for color in palette for c in hex_to_rgb_normalized(color)] for palette in palettes
+            ])
+        recorder.run('hex_to_rgb', 'hex_palettes_to_array', n, lambda: hex_palettes_to_array(palettes))
+
+
+def bench_augmentation(recorder, scales, rng, max_scalar_samples):
+    from itertools import islice
+    from palette_augmentation import (
+        hex_palettes_to_array, iter_augmented_batches, augmented_steps_per_epoch
+    )
+    from train_model import augment_color_palette, prepare_data_for_training
+
+    for n in scales:
+        palettes, labels = make_synthetic_palettes(n, rng)
+        X = hex_palettes_to_array(palettes)
+        if n <= max_scalar_samples:
+            rows = X.tolist()
+            recorder.run('augmentation', 'augment_color_palette x5', n, lambda: [
+                augment_color_palette(row) for row in rows for _ in range(5)
+            ])
+
+        def prepare(lazy):
+            with _quiet():
+                return prepare_data_for_training({'e-i': {'X': X, 'labels': labels}},
+                                                 lazy_augmentation=lazy, seed=0)['e-i']
+
+        def lazy_epoch():
+            # 지연 증강은 전처리에서 증강본을 만들지 않으므로 학습 한 에포크 분량의 배치 생성까지 측정
+            data = prepare(True)
+            steps = augmented_steps_per_epoch(len(data['X']), data['augmentation_count'])
+            batches = iter_augmented_batches(
+                data['X'], data['y'], data['augmentation_count'],
+                noise_factor=data['noise_factor'], rng=np.random.default_rng(0)
+            )
+            for _ in islice(batches, steps):
+                pass
+
+        recorder.run('augmentation', 'prepare_data_for_training', n, lambda: prepare(False))
+        recorder.run('augmentation', 'prepare_data (lazy) + 1 epoch', n, lazy_epoch)
+
+
+def bench_json_load(recorder, scales, rng, work_dir, max_json_samples):
+    from dataset_cache import load_face_color_arrays, cache_dir_for
+
+    for n in [n for n in scales if n <= max_json_samples]:
+        X, y = make_synthetic_face_color(n, rng)
+        path = os.path.join(work_dir, f"training-data-{n}.json")
+        write_synthetic_face_color_json(path, X, y, rng)
+        del X, y
+
+        def build_cache():
+            shutil.rmtree(cache_dir_for(path), ignore_errors=True)
+            with _quiet():
+                load_face_color_arrays(path)
+
+        def load_cached():
+            with _quiet():
+                X, y, metadata = load_face_color_arrays(path)
+                float(X[-1, -1] + y[-1, -1])
+
+        recorder.run('json_load', 'json.load (no cache)',
+                     n, lambda: load_face_color_arrays(path, use_cache=False))
+        recorder.run('json_load', 'build .npcache', n, build_cache, repeats=1)
+        recorder.run('json_load', 'load .npcache (mmap)', n, load_cached)
+        os.remove(path)
+
+
+def bench_loss_step(recorder, rng, batch_size=64, steps=50):
+    """다양성 손실별 학습 스텝(순전파 + 역전파 + 갱신) 시간"""
+    import tensorflow as tf
+    from tensorflow import keras
+    from diversity_losses import create_color_diversity_loss, create_improved_diversity_loss
+    from train_diverse_face_to_color import create_enhanced_diverse_model
+
+    X, y = make_synthetic_face_color(batch_size * steps, rng)
+    dataset = tf.data.Dataset.from_tensor_slices((X, y)).batch(batch_size).cache()
+
+    for name, loss in [('mse', 'mse'),
+                       ('color_diversity_loss', create_color_diversity_loss()),
+                       ('improved_diversity_loss', create_improved_diversity_loss())]:
+        model = create_enhanced_diverse_model()
+        model.compile(optimizer=keras.optimizers.Adam(learning_rate=0.001), loss=loss)
+        model.fit(dataset, epochs=1, verbose=0)  # 트레이싱
+        result = recorder.run('loss_step', f"{name} (batch {batch_size})", len(X),
+                              lambda: model.fit(dataset, epochs=1, verbose=0))
+        result['step_ms'] = result['seconds'] / steps * 1000
+
+
+def bench_export(recorder, rng, work_dir):
+    """save_diverse_model_as_tfjs 전체(최적화 전/후)를 임시 디렉토리로 내보내기"""
+    from streaming_data import StreamingStandardScaler
+    from train_diverse_face_to_color import create_enhanced_diverse_model, save_diverse_model_as_tfjs
+
+    X, _ = make_synthetic_face_color(4096, rng)
+    model = create_enhanced_diverse_model()
+    scaler = StreamingStandardScaler().partial_fit(X)
+    model_dir = os.path.join(work_dir, 'export')
+
+    # 마지막 내보내기(float32, 최적화 없음)를 예측 단계의 NumPy 추론에 사용
+    for variant, options in [('save (uint8)', {'quantization': 'uint8'}),
+                             ('save (optimize=True)', {'optimize': True}),
+                             ('save_diverse_model_as_tfjs', {})]:
+        def export():
+            with _quiet():
+                save_diverse_model_as_tfjs(model, scaler, model_dir=model_dir, **options)
+        recorder.run('export', variant, 1, export)
+
+    return model, scaler, model_dir
+
+
+def bench_predict(recorder, scales, rng, model, model_dir):
+    from numpy_runtime import NumpyModel
+
+    numpy_model = NumpyModel.load(model_dir)
+    for n in scales:
+        X, _ = make_synthetic_face_color(n, rng)
+        model.predict(X[:4096], batch_size=4096, verbose=0)  # 트레이싱
+        recorder.run('predict', 'keras model.predict', n,
+                     lambda: model.predict(X, batch_size=4096, verbose=0))
+        recorder.run('predict', 'NumpyModel.predict', n,
+                     lambda: numpy_model.predict(X, batch_size=4096))
+
+
+def bench_color_diversity(recorder, scales, rng, model):
+    from train_diverse_face_to_color import test_color_diversity
+
+    for n in scales:
+        X, y = make_synthetic_face_color(n, rng)
+
+        def evaluate():
+            with _quiet():
+                test_color_diversity(model, X, y)
+        recorder.run('color_diversity', 'test_color_diversity', n, evaluate)
+
+
+def bench_palette_index(recorder, scales, rng, num_queries=1000, k=10, nprobes=(1, 4, 16)):
+    """팔레트 IVF 인덱스 생성과 배치 k-NN 질의를 brute force와 비교
+
+    질의는 인덱스의 팔레트에 학습 증강과 같은 노이즈(σ=0.05)를 더한 "비슷한 팔레트"이고,
+    nprobe별 recall@k는 brute force 결과 기준입니다. 질의 단계의 샘플 수는 질의 수입니다.
+    """
+    from palette_index import PaletteIndex, brute_force_knn, default_num_lists
+
+    for n in scales:
+        codes = rng.integers(0, 256, size=(n, 15), dtype=np.uint8)
+        labels = rng.integers(0, 2, size=n)
+        vectors = codes.astype(np.float32) / 255.0
+        queries = np.clip(
+            vectors[rng.integers(0, n, num_queries)] + rng.normal(0, 0.05, (num_queries, 15)), 0, 1
+        ).astype(np.float32)
+
+        built = {}
+        recorder.run('palette_index', f'build (lists={default_num_lists(n)})', n,
+                     lambda: built.update(index=PaletteIndex.build(codes, labels, ['E', 'I'])), repeats=1)
+        index = built['index']
+
+        exact = brute_force_knn(vectors, queries, k)[1]
+        result = recorder.run('palette_index', f'brute force k={k} ({n:,})', num_queries,
+                              lambda: brute_force_knn(vectors, queries, k))
+        result['index_size'] = n
+        for nprobe in nprobes:
+            found = index.search(queries, k=k, nprobe=nprobe)[1]
+            result = recorder.run('palette_index', f'IVF nprobe={nprobe} ({n:,})', num_queries,
+                                  lambda: index.search(queries, k=k, nprobe=nprobe))
+            result['index_size'] = n
+            result['recall'] = float(np.mean([
+                len(np.intersect1d(row, truth)) / k for row, truth in zip(found, exact)
+            ]))
+            print(f"   {'':>16} {'recall@' + str(k):<28} {result['recall']:>9.3f}")
+
+
+def environment_info():
+    """결과 비교에 필요한 실행 환경 정보"""
+    info = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__
+    }
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            info['cpu'] = next(line.split(':', 1)[1].strip()
+                               for line in f if line.startswith('model name'))
+    except (OSError, StopIteration):
+        info['cpu'] = platform.processor()
+    try:
+        info['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info['git_commit'] = None
+    if 'tensorflow' in sys.modules:
+        import tensorflow as tf
+        info['tensorflow'] = tf.__version__
+        info['keras'] = tf.keras.__version__ if hasattr(tf.keras, '__version__') else None
+        info['gpus'] = len(tf.config.list_physical_devices('GPU'))
+    return info
+
+
+def compare_results(results, baseline_path, threshold=1.2):
+    """이전 결과 파일과 같은 (단계, 방식, 샘플 수) 항목의 시간 비율 출력
+
+    threshold배 이상 느려진 항목 목록을 반환합니다.
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {
+            (item['stage'], item['variant'], item['samples']): item['seconds']
+            for item in json.load(f)['results']
+        }
+
+    regressions = []
+    print(f"\n📊 이전 결과 대비 ({baseline_path}):")
+    for item in results:
+        previous = baseline.get((item['stage'], item['variant'], item['samples']))
+        if not previous:
+            continue
+        ratio = item['seconds'] / previous
+        marker = '🔴' if ratio >= threshold else ('🟢' if ratio <= 1 / threshold else '  ')
+        print(f"   {marker} {item['stage']:>16} {item['variant']:<28} {item['samples']:>9,} {ratio:>6.2f}x")
+        if ratio >= threshold:
+            regressions.append({**item, 'ratio': ratio})
+    return regressions
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, stages=STAGES, repeats=3, seed=0,
+                   max_scalar_samples=100000, max_json_samples=100000):
+    """선택한 단계의 벤치마크를 실행하고 결과 목록 반환
+
+    순수 Python 기준 구현(hex_to_rgb_normalized, augment_color_palette)은
+    max_scalar_samples 이하, JSON 로드는 max_json_samples 이하 규모에서만 측정합니다.
+    """
+    rng = np.random.default_rng(seed)
+    recorder = BenchmarkRecorder(repeats)
+    work_dir = tempfile.mkdtemp(prefix='ml-benchmark-')
+    print(f"   {'단계':>16} {'방식':<28} {'샘플':>9} {'시간':>13} {'처리량':>16}")
+
+    try:
+        if 'hex_to_rgb' in stages:
+            bench_hex_to_rgb(recorder, scales, rng, max_scalar_samples)
+        if 'augmentation' in stages:
+            bench_augmentation(recorder, scales, rng, max_scalar_samples)
+        if 'json_load' in stages:
+            bench_json_load(recorder, scales, rng, work_dir, max_json_samples)
+        if 'loss_step' in stages:
+            bench_loss_step(recorder, rng)
+        if {'export', 'predict', 'color_diversity'} & set(stages):
+            # 내보낸 모델은 NumPy 추론 비교에도 사용
+            model, _, model_dir = bench_export(recorder, rng, work_dir)
+            if 'export' not in stages:
+                recorder.results = [r for r in recorder.results if r['stage'] != 'export']
+            if 'predict' in stages:
+                bench_predict(recorder, scales, rng, model, model_dir)
+            if 'color_diversity' in stages:
+                bench_color_diversity(recorder, scales, rng, model)
+        if 'palette_index' in stages:
+            bench_palette_index(recorder, scales, rng)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return recorder.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ml/ 핫 패스 벤치마크 (CPU 전용, 합성 데이터)")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeats', type=int, default=3, help="측정 반복 횟수 (최소 시간 사용)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-scalar-samples', type=int, default=100000,
+                        help="순수 Python 기준 구현을 측정할 최대 샘플 수")
+    parser.add_argument('--max-json-samples', type=int, default=100000,
+                        help="합성 JSON 로드를 측정할 최대 샘플 수 (1M 샘플 JSON은 약 2GB)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일")
+    parser.add_argument('--threshold', type=float, default=1.2, help="느려짐으로 표시할 시간 비율")
+    args = parser.parse_args()
+
+    print(f"⏱️ ml 벤치마크: 규모 {', '.join(f'{n:,}' for n in args.scales)}")
+    start = time.perf_counter()
+    results = run_benchmarks(args.scales, args.stages, args.repeats, args.seed,
+                             args.max_scalar_samples, args.max_json_samples)
+
+    report = {
+        'environment': environment_info(),
+        'config': vars(args),
+        'total_seconds': time.perf_counter() - start,
+        'results': results
+    }
+    if args.compare:
+        report['regressions'] = compare_results(results, args.compare, args.threshold)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 결과 저장: {args.output} ({report['total_seconds']:.1f}초)")
+    if report.get('regressions'):
+        print(f"🔴 {len(report['regressions'])}개 항목이 {args.threshold}배 이상 느려졌습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+색상 다양성 손실 함수 마이크로 벤치마크
+기존 이중 루프 구현과 쌍 거리 행렬 구현(diversity_losses)의 손실+그래디언트
+스텝 시간을 배치 크기별로 비교하고, 두 구현의 결과가 같은지 확인합니다.
+
+사용법:
+    python benchmark_diversity_loss.py --batch-sizes 32 256 1024 4096 --steps 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from diversity_losses import create_color_diversity_loss, create_improved_diversity_loss
+
+
+def _loop_color_diversity_loss():
+    """기존 구현 (train_diverse_face_to_color.create_color_diversity_loss)"""
+    def diversity_loss(y_true, y_pred):
+        mse_loss = tf.keras.losses.mse(y_true, y_pred)
+        batch_size = tf.shape(y_pred)[0]
+        colors = tf.reshape(y_pred, (batch_size, 5, 3))
+        color_distances = []
+        for i in range(5):
+            for j in range(i+1, 5):
+                dist = tf.norm(colors[:, i, :] - colors[:, j, :], axis=1)
+                color_distances.append(dist)
+        avg_distance = tf.reduce_mean(tf.stack(color_distances, axis=1), axis=1)
+        diversity_penalty = tf.exp(-avg_distance)
+        return mse_loss + 0.1 * tf.reduce_mean(diversity_penalty)
+    return diversity_loss
+
+
+def _loop_improved_diversity_loss():
+    """기존 구현 (train_face_to_color.create_improved_diversity_loss)"""
+    def improved_diversity_loss(y_true, y_pred):
+        mse_loss = tf.keras.losses.mse(y_true, y_pred)  # 기존 구현에서도 사용되지 않음
+        extreme_value_mask = tf.cast(
+            (tf.abs(y_true - 0.0) < 0.01) | (tf.abs(y_true - 1.0) < 0.01),
+            tf.float32
+        )
+        extreme_weight = 1.0 + 0.5 * extreme_value_mask
+        weighted_mse = tf.reduce_mean(tf.square(y_true - y_pred) * extreme_weight)
+        batch_size = tf.shape(y_pred)[0]
+        colors = tf.reshape(y_pred, (batch_size, 5, 3))
+        color_distances = []
+        for i in range(5):
+            for j in range(i+1, 5):
+                dist = tf.norm(colors[:, i, :] - colors[:, j, :], axis=1)
+                color_distances.append(dist)
+        avg_distance = tf.reduce_mean(tf.stack(color_distances, axis=1), axis=1)
+        diversity_penalty = tf.exp(-avg_distance * 2)
+        color_contrast = tf.reduce_mean(tf.math.reduce_std(colors, axis=1))
+        contrast_penalty = tf.exp(-color_contrast * 3)
+        return weighted_mse + 0.15 * tf.reduce_mean(diversity_penalty) + 0.1 * contrast_penalty
+    return improved_diversity_loss
+
+
+LOSS_VARIANTS = {
+    'color_diversity': (_loop_color_diversity_loss, create_color_diversity_loss),
+    'improved_diversity': (_loop_improved_diversity_loss, create_improved_diversity_loss)
+}
+
+
+def _make_step(loss_fn, jit_compile):
+    """손실과 예측값에 대한 그래디언트를 계산하는 학습 스텝 (손실 부분만)"""
+    @tf.function(jit_compile=jit_compile)
+    def step(y_true, y_pred):
+        with tf.GradientTape() as tape:
+            tape.watch(y_pred)
+            loss = tf.reduce_mean(loss_fn(y_true, y_pred))
+        return loss, tape.gradient(loss, y_pred)
+    return step
+
+
+def _time_step(step, y_true, y_pred, steps):
+    step(y_true, y_pred)  # 트레이싱·컴파일
+    start = time.perf_counter()
+    for _ in range(steps):
+        loss, grad = step(y_true, y_pred)
+    grad.numpy()  # 비동기 실행 완료 대기
+    return (time.perf_counter() - start) / steps
+
+
+def run_benchmark(batch_sizes=(32, 128, 512, 1024, 4096), steps=200, seed=0):
+    """배치 크기별 스텝 시간(마이크로초) 결과 목록 반환"""
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for name, (make_loop, make_vectorized) in LOSS_VARIANTS.items():
+        print(f"\n⚡ {name} 손실 (스텝당 μs, 손실 + 그래디언트):")
+        print(f"   {'배치':>6} {'루프':>10} {'루프+XLA':>10} {'행렬':>10} {'행렬+XLA':>10} {'속도 향상':>9} {'최대 오차':>10}")
+        for batch_size in batch_sizes:
+            y_true = rng.random((batch_size, 15), dtype=np.float32)
+            y_true[rng.random(y_true.shape) < 0.2] = 1.0  # 극값 포함
+            y_true = tf.constant(y_true)
+            y_pred = tf.constant(rng.random((batch_size, 15), dtype=np.float32))
+
+            timings = {}
+            outputs = {}
+            for impl, make_loss in [('loop', make_loop), ('vectorized', make_vectorized)]:
+                for jit in (False, True):
+                    step = _make_step(make_loss(), jit)
+                    timings[(impl, jit)] = _time_step(step, y_true, y_pred, steps) * 1e6
+                    outputs[(impl, jit)] = step(y_true, y_pred)
+
+            # 두 구현의 손실과 그래디언트 비교
+            reference = outputs[('loop', False)]
+            max_error = max(
+                float(np.max(np.abs(a.numpy() - b.numpy())))
+                for out in outputs.values() for a, b in zip(reference, out)
+            )
+            speedup = timings[('loop', False)] / timings[('vectorized', True)]
+            print(f"   {batch_size:>6} {timings[('loop', False)]:>10.1f} {timings[('loop', True)]:>10.1f} "
+                  f"{timings[('vectorized', False)]:>10.1f} {timings[('vectorized', True)]:>10.1f} "
+                  f"{speedup:>8.2f}x {max_error:>10.2e}")
+            results.append({
+                'loss': name,
+                'batch_size': batch_size,
+                'loop_us': timings[('loop', False)],
+                'loop_xla_us': timings[('loop', True)],
+                'vectorized_us': timings[('vectorized', False)],
+                'vectorized_xla_us': timings[('vectorized', True)],
+                'max_error': max_error
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="색상 다양성 손실 함수 마이크로 벤치마크")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[32, 128, 512, 1024, 4096])
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.batch_sizes, args.steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+얼굴-색상 / MBTI 모델 통합 명령줄 도구
+세 학습 스크립트를 하위 명령으로 묶고, TensorFlow는 학습·내보내기처럼
+실제로 필요한 명령에서만 임포트합니다.
+
+사용법:
+    python cli.py analyze                       # 데이터 분석 (TensorFlow 미사용)
+    python cli.py train diverse                 # 학습 (indicators | face | diverse)
+    python cli.py train indicators --multihead
+    python cli.py train diverse --distill       # 학습 후 브라우저용 소형 student 증류
+    python cli.py train diverse --prune 0.5     # 은닉 유닛 50% 구조적 가지치기 후 좁은 모델 저장
+    python cli.py train face --descriptor-rank 32  # descriptor를 PCA 32차원으로 투영해 학습
+    python cli.py train indicators --cv-folds 5  # 병렬 k-fold 교차 검증 후 재학습 모델 저장
+    python cli.py train indicators --palette-index  # 학습 팔레트 최근접 이웃 인덱스도 함께 저장
+    python cli.py train indicators --parallel   # 지표별 모델을 워커 프로세스에서 병렬 학습
+    python cli.py train indicators --lazy-augmentation  # 에포크마다 배치 단위로 팔레트 증강
+    python cli.py train diverse --incremental   # 체크포인트에서 증분 재학습
+    python cli.py train face --tf-data          # tf.data 입력 파이프라인으로 학습
+    python cli.py train diverse --streaming --chunk-size 32768  # 청크 단위 디스크 스트리밍 학습
+    python cli.py train diverse --telemetry --profile-steps 100 120
+    python cli.py export diverse --checkpoint best_diverse_model.h5 --optimize
+    python cli.py evaluate --limit 10000        # 내보낸 모델 평가 (NumPy 추론)
+    python cli.py train diverse --data ../public/data/diverse-face-color/generated
+"""
+
+import argparse
+import json
+import os
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_DIR = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "models", "diverse-face-to-color")
+)
+DEFAULT_DATA_PATH = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "data", "diverse-face-color", "training-data.json")
+)
+DATA_HELP = "학습 데이터 JSON 또는 generate_diverse_data.py로 만든 바이너리 데이터셋 디렉토리"
+
+# 하위 명령 대상 이름 → 학습 스크립트 모듈
+TRAINING_SCRIPTS = {
+    'indicators': 'train_model',
+    'face': 'train_face_to_color',
+    'diverse': 'train_diverse_face_to_color'
+}
+
+
+def _import_script(target):
+    import importlib
+    return importlib.import_module(TRAINING_SCRIPTS[target])
+
+
+def _load_scaler(scaler_path):
+    """scaler_info.json의 평균/스케일로 정규화기 복원 (정규화 정보가 없으면 None)"""
+    if not scaler_path or not os.path.exists(scaler_path):
+        return None
+    with open(scaler_path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    if 'mean' not in info:
+        return None
+
+    from streaming_data import StreamingStandardScaler
+
+    return StreamingStandardScaler.from_stats(info['mean'], info['scale'])
+
+
+def cmd_analyze(args):
+    from dataset_cache import load_face_color_metadata
+    from train_diverse_face_to_color import analyze_color_diversity
+
+    # 분석에는 메타데이터 컬럼만 필요하므로 X, y는 로드하지 않음
+    data_path = args.data or DEFAULT_DATA_PATH
+    print(f"📊 메타데이터 로드 중: {data_path}")
+    metadata = load_face_color_metadata(data_path, use_cache=not args.no_cache)
+    print(f"   총 샘플 수: {len(metadata)}")
+    analyze_color_diversity(None, metadata)
+
+
+def cmd_train(args):
+    script = _import_script(args.target)
+    if args.target == 'indicators':
+        if args.data:
+            raise SystemExit("❌ --data는 얼굴-색상 모델(face, diverse)에만 사용할 수 있습니다.")
+        if args.prune:
+            raise SystemExit("❌ --prune은 얼굴-색상 모델(face, diverse)에만 사용할 수 있습니다.")
+        if args.descriptor_rank:
+            raise SystemExit("❌ --descriptor-rank는 얼굴-색상 모델(face, diverse)에만 사용할 수 있습니다.")
+        if args.streaming or args.chunk_size is not None:
+            raise SystemExit("❌ --streaming, --chunk-size는 얼굴-색상 모델(face, diverse)에만 사용할 수 있습니다.")
+        if args.cv_folds is not None:
+            if args.multihead:
+                raise SystemExit("❌ --cv-folds는 지표별 모델에서만 사용할 수 있습니다 (--multihead 제외).")
+            if args.cv_folds < 2:
+                raise SystemExit("❌ --cv-folds는 2 이상이어야 합니다.")
+            if args.telemetry or args.profile_steps:
+                raise SystemExit("❌ --telemetry, --profile-steps는 --cv-folds와 함께 사용할 수 없습니다.")
+        script.main(multihead=args.multihead, use_tf_data=args.tf_data,
+                    telemetry=args.telemetry, profile_steps=args.profile_steps,
+                    cv_folds=args.cv_folds,
+                    cv_export=None if args.cv_export == 'none' else args.cv_export,
+                    palette_index=args.palette_index, parallel=args.parallel,
+                    augmentation_count=args.augmentation_count,
+                    lazy_augmentation=args.lazy_augmentation)
+    else:
+        if args.palette_index:
+            raise SystemExit("❌ --palette-index는 MBTI 지표 모델(indicators)에서만 사용할 수 있습니다.")
+        if args.parallel:
+            raise SystemExit("❌ --parallel은 MBTI 지표 모델(indicators)에서만 사용할 수 있습니다.")
+        if args.lazy_augmentation or args.augmentation_count != 5:
+            raise SystemExit("❌ --lazy-augmentation, --augmentation-count는 MBTI 지표 모델(indicators)에서만 "
+                             "사용할 수 있습니다.")
+        if args.distill and args.target != 'diverse':
+            raise SystemExit("❌ --distill은 diverse 모델에서만 사용할 수 있습니다.")
+        options = {'distill': args.distill} if args.target == 'diverse' else {}
+        script.main(incremental=args.incremental, use_tf_data=args.tf_data,
+                    telemetry=args.telemetry, profile_steps=args.profile_steps, data_path=args.data,
+                    prune_sparsity=args.prune, descriptor_rank=args.descriptor_rank,
+                    streaming=args.streaming, chunk_size=args.chunk_size or 65536, **options)
+
+
+def cmd_export(args):
+    if args.target == 'indicators':
+        raise SystemExit("❌ MBTI 지표 모델은 체크포인트를 저장하지 않으므로 'train indicators'로 다시 학습해주세요.")
+
+    # 저장 함수가 출력 디렉토리를 다시 만들기 전에 기존 정규화 정보를 읽어 둠
+    scaler_path = args.scaler
+    if scaler_path is None and args.target == 'diverse':
+        scaler_path = os.path.join(DEFAULT_MODEL_DIR, 'scaler_info.json')
+    scaler = _load_scaler(scaler_path)
+    if scaler is None:
+        # 정규화를 모델에 접어 내보낸 뒤에는 scaler_info.json에 통계가 없으므로 학습 상태에서 복원
+        from warm_start import load_training_state, scaler_from_state
+        scaler = scaler_from_state(load_training_state(args.checkpoint))
+    if args.target == 'diverse' and scaler is None:
+        raise SystemExit("❌ 정규화 정보(scaler_info.json 또는 체크포인트 학습 상태)를 찾을 수 없습니다. "
+                         "--scaler로 경로를 지정해주세요.")
+
+    script = _import_script(args.target)
+    from tensorflow import keras
+    from descriptor_projection import DescriptorProjection, load_descriptor_projection
+    from pruning import pruned_checkpoint_path
+
+    # 가지치기로 학습한 체크포인트는 가지치기한 가중치를 내보내야 좁은 모델이 유지됨
+    checkpoint = args.checkpoint
+    pruned = pruned_checkpoint_path(args.checkpoint)
+    if not args.unpruned and os.path.exists(pruned):
+        print(f"   ✂️ 가지치기한 체크포인트를 사용합니다: {pruned} (--unpruned: 가지치기 전 모델)")
+        checkpoint = pruned
+
+    print(f"📦 체크포인트 로드: {checkpoint}")
+    # 커스텀 손실 함수는 추론에 필요 없으므로 컴파일하지 않고 로드
+    model = keras.models.load_model(checkpoint, compile=False)
+
+    # descriptor 투영으로 학습한 체크포인트는 투영을 합성해야 하므로 항상 최적화 경로로 저장
+    if args.projection:
+        projection = DescriptorProjection.load(args.projection)
+    else:
+        projection = load_descriptor_projection(args.checkpoint)
+    optimize = args.optimize
+    if projection is not None and not optimize:
+        print(f"   🗜️ descriptor 투영(rank {projection.rank})을 합성하기 위해 --optimize로 저장합니다.")
+        optimize = True
+    if checkpoint == pruned and not optimize:
+        print("   ✂️ 가지치기된 유닛을 제거하기 위해 --optimize로 저장합니다.")
+        optimize = True
+    # 학습 데이터의 검증 행으로 그래프 접기와 양자화에 따른 float32 대비 오차를 확인
+    try:
+        from warm_start import held_out_inputs
+        X, _, _ = script.load_diverse_face_color_data(data_path=args.data)
+        reference_inputs = held_out_inputs(X, args.checkpoint)
+    except FileNotFoundError:
+        print("   ⚠️ 학습 데이터를 찾을 수 없어 임의 입력으로 검증합니다 (--data로 지정 가능).")
+        reference_inputs = None
+    script.save_diverse_model_as_tfjs(
+        model, scaler, num_shards=args.num_shards,
+        quantization=args.quantization, optimize=optimize, projection=projection,
+        reference_inputs=reference_inputs
+    )
+
+
+def cmd_evaluate(args):
+    from numpy_runtime import NumpyModel
+    from streaming_data import split_mask, gather_rows
+    from train_diverse_face_to_color import load_diverse_face_color_data
+    from train_face_to_color import evaluate_model_performance
+
+    model = NumpyModel.load(args.model_dir)
+    scaler = _load_scaler(os.path.join(args.model_dir, 'scaler_info.json'))
+    print(f"📦 내보낸 모델 로드: {args.model_dir} (NumPy 추론)")
+
+    X, y, _ = load_diverse_face_color_data(use_cache=not args.no_cache, data_path=args.data)
+    val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+    X_val = gather_rows(X, val_mask, limit=args.limit)
+    y_val = gather_rows(y, val_mask, limit=args.limit)
+    if scaler is not None:
+        X_val = scaler.transform(X_val)
+
+    evaluate_model_performance(model, X_val, y_val, None)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="얼굴-색상 / MBTI 모델 통합 명령줄 도구")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    analyze = subparsers.add_parser('analyze', help="학습 데이터 색상 다양성 분석")
+    analyze.add_argument('--no-cache', action='store_true', help="바이너리 캐시를 사용하지 않음")
+    analyze.add_argument('--data', help=DATA_HELP)
+    analyze.set_defaults(func=cmd_analyze)
+
+    train = subparsers.add_parser('train', help="모델 학습 및 TensorFlow.js 저장")
+    train.add_argument('target', choices=list(TRAINING_SCRIPTS))
+    train.add_argument('--multihead', action='store_true', help="MBTI 다중 헤드 모델로 학습 (indicators)")
+    train.add_argument('--incremental', action='store_true',
+                       help="이전 체크포인트에서 새 샘플만으로 미세 조정 (face, diverse)")
+    train.add_argument('--tf-data', action='store_true',
+                       help="tf.data 입력 파이프라인(셔플·병렬 map·prefetch)으로 학습")
+    train.add_argument('--telemetry', action='store_true',
+                       help="에포크별 시간·처리량·RSS·학습률을 모델 디렉토리의 training_telemetry.jsonl에 기록")
+    train.add_argument('--profile-steps', type=int, nargs=2, metavar=('START', 'STOP'),
+                       help="이 전역 스텝 구간의 TensorBoard 프로파일러 트레이스 수집 (logs/profile)")
+    train.add_argument('--data', help=DATA_HELP + " (face, diverse)")
+    train.add_argument('--streaming', action='store_true',
+                       help="데이터를 메모리로 복사하지 않고 청크 단위로 읽으며 학습 (face, diverse)")
+    train.add_argument('--chunk-size', type=int, default=None, metavar='ROWS',
+                       help="스트리밍·정규화 통계 계산의 청크 행 수 (face, diverse, 기본 65536)")
+    train.add_argument('--cv-folds', type=int, default=None, metavar='K',
+                       help="지표별 k-fold 교차 검증을 병렬로 수행 (indicators)")
+    train.add_argument('--distill', action='store_true',
+                       help="학습한 모델을 teacher로 소형 student를 증류해 함께 저장 (diverse)")
+    train.add_argument('--prune', type=float, default=None, metavar='SPARSITY',
+                       help="학습 후 은닉 Dense 유닛을 이 비율(0~1)만큼 구조적으로 가지치기 (face, diverse)")
+    train.add_argument('--descriptor-rank', type=int, default=None, metavar='RANK',
+                       help="128차원 descriptor를 PCA로 이 차원까지 투영해 학습하고 내보낼 때 합성 (face, diverse)")
+    train.add_argument('--parallel', action='store_true',
+                       help="지표별 모델을 워커 프로세스에서 병렬 학습 (indicators, 기본: 순차 학습)")
+    train.add_argument('--augmentation-count', type=int, default=5, metavar='N',
+                       help="원본 팔레트당 노이즈 증강본 수 (indicators, 0이면 증강 안 함)")
+    train.add_argument('--lazy-augmentation', action='store_true',
+                       help="증강본을 미리 만들지 않고 에포크마다 배치 단위로 생성 (indicators)")
+    train.add_argument('--palette-index', action='store_true',
+                       help="학습 팔레트·라벨의 최근접 이웃(IVF) 인덱스를 함께 저장 (indicators)")
+    train.add_argument('--cv-export', choices=['refit', 'best', 'none'], default='refit',
+                       help="교차 검증 후 저장할 모델: 전체 데이터 재학습, 최고 폴드, 저장 안 함")
+    train.set_defaults(func=cmd_train)
+
+    export = subparsers.add_parser('export', help="저장된 체크포인트를 TensorFlow.js 형식으로 다시 내보내기")
+    export.add_argument('target', choices=list(TRAINING_SCRIPTS))
+    export.add_argument('--checkpoint', required=True, help="Keras 체크포인트(.h5/.keras) 경로")
+    export.add_argument('--scaler', help="scaler_info.json 경로 (diverse 기본값: 기존 내보내기의 정규화 정보, "
+                                         "없으면 체크포인트 학습 상태의 정규화 통계)")
+    export.add_argument('--num-shards', type=int, default=None)
+    export.add_argument('--quantization', choices=['float16', 'uint8', 'uint16'], default=None)
+    export.add_argument('--optimize', action='store_true', help="BatchNormalization·정규화 접기, Dropout 제거")
+    export.add_argument('--unpruned', action='store_true',
+                        help="가지치기한 체크포인트(.pruned.h5)가 있어도 가지치기 전 체크포인트를 내보냄")
+    export.add_argument('--projection',
+                        help="descriptor 투영 파일(.projection.npz) 경로 (기본: 체크포인트 옆에 있으면 사용)")
+    export.add_argument('--data', help=DATA_HELP + " (검증 행으로 내보내기 오차 확인)")
+    export.set_defaults(func=cmd_export)
+
+    evaluate = subparsers.add_parser('evaluate', help="내보낸 모델을 검증 데이터로 평가 (TensorFlow 미사용)")
+    evaluate.add_argument('--model-dir', default=DEFAULT_MODEL_DIR)
+    evaluate.add_argument('--limit', type=int, default=10000, help="평가할 최대 검증 샘플 수")
+    evaluate.add_argument('--no-cache', action='store_true', help="바이너리 캐시를 사용하지 않음")
+    evaluate.add_argument('--data', help=DATA_HELP)
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start_time = time.perf_counter()
+    args.func(args)
+    print(f"\n⏱️ '{args.command}' 완료: {time.perf_counter() - start_time:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+벡터화된 색상 예측 평가
+검증 데이터 전체를 청크 단위로 한 번만 예측하고, 고유 색상 수(24비트 정수
+압축 + np.unique), 색상 간 평균 거리, 극값 예측 정확도를 NumPy 연산으로 계산합니다.
+"""
+
+import numpy as np
+
+NUM_COLORS = 5
+_PAIRS_I, _PAIRS_J = np.triu_indices(NUM_COLORS, k=1)
+
+
+def pack_rgb24(colors):
+    """(..., 3) 0~1 RGB를 0xRRGGBB 정수로 압축 (rgb_to_hex와 같은 int(n * 255) 절사)"""
+    channels = np.clip((np.asarray(colors, dtype=np.float32) * np.float32(255)).astype(np.int64), 0, 255)
+    channels = channels.astype(np.uint32)
+    return (channels[..., 0] << 16) | (channels[..., 1] << 8) | channels[..., 2]
+
+
+def pairwise_color_distances(predictions):
+    """(N, 15) 팔레트에서 5개 색상의 모든 쌍 거리 (N, 10)"""
+    colors = np.asarray(predictions, dtype=np.float32).reshape(-1, NUM_COLORS, 3)
+    return np.linalg.norm(colors[:, _PAIRS_I] - colors[:, _PAIRS_J], axis=-1)
+
+
+def extreme_value_mask(y_true, tolerance=0.01):
+    """목표값이 0 또는 1에 tolerance 이내인 위치"""
+    return (np.abs(y_true) < tolerance) | (np.abs(y_true - 1.0) < tolerance)
+
+
+def predict_in_batches(model, X, batch_size=4096, chunk_size=262144):
+    """X를 chunk_size 행씩 읽어 예측한 결과를 (청크 시작, 입력, 예측) 순서로 반환
+
+    메모리 매핑 배열도 청크 단위로만 메모리에 올립니다. Keras 모델과
+    numpy_runtime.NumpyModel 모두 사용할 수 있습니다.
+    """
+    for start in range(0, len(X), chunk_size):
+        X_chunk = np.asarray(X[start:start + chunk_size], dtype=np.float32)
+        predictions = np.asarray(model.predict(X_chunk, batch_size=batch_size, verbose=0))
+        yield start, X_chunk, predictions
+
+
+def evaluate_color_model(model, X_val, y_val, batch_size=4096, chunk_size=262144,
+                         extreme_tolerance=0.01, extreme_threshold=0.1):
+    """검증 데이터 전체에 대한 회귀·색상 다양성 지표 계산
+
+    반환값: mse, mae, extreme_accuracy, unique_colors, avg_distance,
+    diversity_score(샘플당 고유 색상 비율, %), num_samples
+    """
+    squared_error = 0.0
+    absolute_error = 0.0
+    extreme_hits = 0
+    extreme_count = 0
+    distance_sum = 0.0
+    unique_parts = []
+
+    for start, _, y_pred in predict_in_batches(model, X_val, batch_size, chunk_size):
+        y_true = np.asarray(y_val[start:start + len(y_pred)], dtype=np.float32)
+        error = y_true - y_pred
+        squared_error += float(np.sum(np.square(error, dtype=np.float64)))
+        absolute_error += float(np.sum(np.abs(error), dtype=np.float64))
+
+        mask = extreme_value_mask(y_true, extreme_tolerance)
+        extreme_hits += int(np.count_nonzero(np.abs(error[mask]) < extreme_threshold))
+        extreme_count += int(np.count_nonzero(mask))
+
+        distance_sum += float(pairwise_color_distances(y_pred).sum(dtype=np.float64))
+        unique_parts.append(np.unique(pack_rgb24(y_pred.reshape(-1, NUM_COLORS, 3))))
+
+    num_samples = len(X_val)
+    num_values = max(num_samples * (y_val.shape[1] if len(y_val) else 0), 1)
+    unique_colors = len(np.unique(np.concatenate(unique_parts))) if unique_parts else 0
+    return {
+        'mse': squared_error / num_values,
+        'mae': absolute_error / num_values,
+        'extreme_accuracy': extreme_hits / extreme_count if extreme_count else float('nan'),
+        'unique_colors': unique_colors,
+        'avg_distance': distance_sum / max(num_samples * len(_PAIRS_I), 1),
+        'diversity_score': unique_colors / max(num_samples, 1) * 100,
+        'num_samples': num_samples
+    }
+
+
+def print_diversity_report(results):
+    """색상 다양성 지표 출력 (기존 test_color_diversity 출력 형식)"""
+    print(f"   평가 샘플 수: {results['num_samples']}개")
+    print(f"   예측된 고유 색상 수: {results['unique_colors']}개")
+    print(f"   평균 색상 간 거리: {results['avg_distance']:.3f}")
+    print(f"   색상 다양성 점수: {results['diversity_score']:.1f}%")
@@ -0,0 +1,346 @@
+"""
+학습 데이터 바이너리 캐시
+JSON 학습 데이터를 한 번만 파싱해 메모리 매핑 가능한 .npy 파일로 변환하고,
+원본 파일의 내용 해시를 키로 사용해 이후 실행에서는 복사 없이 로드합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+CACHE_DIR_NAME = ".npcache"
+CACHE_FORMAT_VERSION = 1
+
+CHARACTERISTIC_NAMES = ['brightness', 'saturation', 'temperature', 'contrast', 'harmony']
+
+
+def file_content_hash(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시 (앞 16자리)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def cache_dir_for(source_path):
+    """원본 파일 옆 .npcache 아래의 해시 기반 캐시 디렉토리 경로"""
+    source_path = os.path.normpath(source_path)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(
+        os.path.dirname(source_path), CACHE_DIR_NAME,
+        f"{stem}-{file_content_hash(source_path)}"
+    )
+
+
+def pack_hex_colors(color_lists):
+    """'#RRGGBB' 문자열 목록의 목록을 (N, K) uint32 (0xRRGGBB) 배열로 변환"""
+    if len(color_lists) == 0:
+        return np.empty((0, 0), dtype=np.uint32)
+
+    joined = ''.join(color.lstrip('#') for colors in color_lists for color in colors)
+    rgb = np.frombuffer(bytes.fromhex(joined), dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    return packed.reshape(len(color_lists), -1)
+
+
+def unpack_hex_color(value):
+    """0xRRGGBB 정수를 '#rrggbb' 문자열로 변환"""
+    return f"#{int(value):06x}"
+
+
+class ColumnarMetadata:
+    """컬럼 형태로 저장된 색상 메타데이터
+
+    colorCategory는 범주 코드 배열, colorCharacteristics는 float32 배열,
+    colors는 uint32로 압축된 색상 배열로 보관합니다. 인덱싱과 순회 시에는
+    기존 코드와 호환되도록 dict 형태로 복원합니다.
+    """
+
+    def __init__(self, category_codes, categories, characteristics, colors):
+        self.category_codes = category_codes
+        self.categories = list(categories)
+        self.characteristics = characteristics
+        self.colors = colors
+
+    @classmethod
+    def from_records(cls, metadata):
+        """메타데이터 dict 목록을 컬럼 형태로 변환"""
+        categories = sorted({item['colorCategory'] for item in metadata})
+        lookup = {name: code for code, name in enumerate(categories)}
+
+        category_codes = np.fromiter(
+            (lookup[item['colorCategory']] for item in metadata),
+            dtype=np.uint8, count=len(metadata)
+        )
+        characteristics = np.array(
+            [[item['colorCharacteristics'][name] for name in CHARACTERISTIC_NAMES]
+             for item in metadata],
+            dtype=np.float32
+        ).reshape(len(metadata), len(CHARACTERISTIC_NAMES))
+        colors = pack_hex_colors([item['colors'] for item in metadata])
+
+        return cls(category_codes, categories, characteristics, colors)
+
+    def characteristic(self, name):
+        """colorCharacteristics의 한 항목 컬럼"""
+        return self.characteristics[:, CHARACTERISTIC_NAMES.index(name)]
+
+    def category_counts(self):
+        """색상 카테고리별 샘플 수 {카테고리: 개수} (np.bincount)"""
+        counts = np.bincount(self.category_codes, minlength=len(self.categories))
+        return dict(zip(self.categories, counts.tolist()))
+
+    def characteristic_ranges(self, chunk_size=1 << 20):
+        """colorCharacteristics 항목별 (최소, 최대) 값 {항목: (최소, 최대)}
+
+        메모리 매핑 배열도 chunk_size 행씩만 읽어 축별 최소/최대를 누적합니다.
+        """
+        minimum = np.full(len(CHARACTERISTIC_NAMES), np.inf, dtype=np.float32)
+        maximum = np.full(len(CHARACTERISTIC_NAMES), -np.inf, dtype=np.float32)
+        for start in range(0, len(self), chunk_size):
+            chunk = np.asarray(self.characteristics[start:start + chunk_size])
+            np.minimum(minimum, chunk.min(axis=0), out=minimum)
+            np.maximum(maximum, chunk.max(axis=0), out=maximum)
+        return {
+            name: (float(low), float(high))
+            for name, low, high in zip(CHARACTERISTIC_NAMES, minimum, maximum)
+        }
+
+    def unique_color_count(self, chunk_size=1 << 20):
+        """고유 색상 수
+
+        0xRRGGBB 값은 24비트이므로 정렬 없이 2^24 크기 비트맵(16MB)에
+        표시한 뒤 개수를 셉니다.
+        """
+        seen = np.zeros(1 << 24, dtype=bool)
+        for start in range(0, len(self), chunk_size):
+            seen[np.asarray(self.colors[start:start + chunk_size]).ravel()] = True
+        return int(np.count_nonzero(seen))
+
+    def __len__(self):
+        return len(self.category_codes)
+
+    def __getitem__(self, index):
+        return {
+            'colors': [unpack_hex_color(value) for value in self.colors[index]],
+            'colorCharacteristics': {
+                name: float(value)
+                for name, value in zip(CHARACTERISTIC_NAMES, self.characteristics[index])
+            },
+            'colorCategory': self.categories[self.category_codes[index]]
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def as_columnar_metadata(metadata):
+    """메타데이터 dict 목록이면 컬럼 형태로 변환 (이미 컬럼 형태면 그대로 반환)"""
+    if isinstance(metadata, ColumnarMetadata):
+        return metadata
+    return ColumnarMetadata.from_records(metadata)
+
+
+def _write_arrays(cache_dir, arrays, info):
+    """임시 디렉토리에 기록한 뒤 원자적으로 캐시 디렉토리로 교체"""
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+    with open(os.path.join(tmp_dir, 'info.json'), 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.replace(tmp_dir, cache_dir)
+
+
+def _read_cache(cache_dir):
+    """캐시 디렉토리의 info.json과 메모리 매핑 배열 로드 (없으면 None)"""
+    info_path = os.path.join(cache_dir, 'info.json')
+    if not os.path.exists(info_path):
+        return None
+
+    with open(info_path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    if info.get('format_version') != CACHE_FORMAT_VERSION:
+        return None
+
+    arrays = {
+        name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode='r')
+        for name in info['arrays']
+    }
+    return info, arrays
+
+
+def _read_binary_dataset(dataset_dir):
+    """generate_diverse_data.py가 기록한 바이너리 데이터셋 디렉토리 로드"""
+    cached = _read_cache(dataset_dir)
+    if cached is None:
+        raise FileNotFoundError(f"바이너리 데이터셋(info.json)을 찾을 수 없습니다: {dataset_dir}")
+    return cached
+
+
+def _columnar_metadata(info, arrays):
+    return ColumnarMetadata(
+        arrays['category_codes'], info['categories'],
+        arrays['characteristics'], arrays['colors']
+    )
+
+
+def _prune_stale_caches(cache_dir):
+    """같은 원본 파일에 대한 이전 해시의 캐시 삭제
+
+    '<stem>-<해시>' 형식이 정확히 맞는 디렉토리만 지우므로, 이름이 같은 접두사로
+    시작하는 다른 원본(예: training-data-v2.json)의 캐시는 유지됩니다.
+    """
+    parent = os.path.dirname(cache_dir)
+    stem, digest = os.path.basename(cache_dir).rsplit('-', 1)
+    pattern = re.compile(re.escape(stem) + f"-[0-9a-f]{{{len(digest)}}}")
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if pattern.fullmatch(name) and path != cache_dir and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_face_color_arrays(data_path, use_cache=True):
+    """얼굴-색상 학습 데이터(X, y, metadata) 로드
+
+    캐시가 있으면 X, y를 메모리 매핑으로, metadata를 ColumnarMetadata로
+    반환합니다. 캐시가 없으면 JSON을 한 번 파싱해 캐시를 만든 뒤 반환합니다.
+    data_path가 바이너리 데이터셋 디렉토리(generate_diverse_data.py 출력)이면
+    JSON 없이 그 디렉토리를 바로 메모리 매핑합니다.
+    """
+    if os.path.isdir(data_path):
+        print(f"   ⚡ 바이너리 데이터셋 사용: {data_path}")
+        info, arrays = _read_binary_dataset(data_path)
+        return arrays['X'], arrays['y'], _columnar_metadata(info, arrays)
+
+    if not use_cache:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        X = np.array(data['X'], dtype=np.float32)
+        y = np.array(data['y'], dtype=np.float32)
+        return X, y, data['metadata']
+
+    cache_dir = cache_dir_for(data_path)
+    cached = _read_cache(cache_dir)
+    if cached is None:
+        print(f"   💾 바이너리 캐시 생성 중: {cache_dir}")
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        columns = ColumnarMetadata.from_records(data['metadata'])
+        arrays = {
+            'X': np.array(data['X'], dtype=np.float32),
+            'y': np.array(data['y'], dtype=np.float32),
+            'category_codes': columns.category_codes,
+            'characteristics': columns.characteristics,
+            'colors': columns.colors
+        }
+        del data
+
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        _prune_stale_caches(cache_dir)
+        _write_arrays(cache_dir, arrays, {
+            'format_version': CACHE_FORMAT_VERSION,
+            'source': os.path.basename(data_path),
+            'arrays': list(arrays),
+            'categories': columns.categories,
+            'characteristic_names': CHARACTERISTIC_NAMES
+        })
+        cached = _read_cache(cache_dir)
+    else:
+        print(f"   ⚡ 바이너리 캐시 사용: {cache_dir}")
+
+    info, arrays = cached
+    return arrays['X'], arrays['y'], _columnar_metadata(info, arrays)
+
+
+def load_face_color_metadata(data_path, use_cache=True):
+    """얼굴-색상 학습 데이터의 metadata만 ColumnarMetadata로 로드
+
+    캐시가 있으면 X, y는 열지 않고 메타데이터 컬럼만 메모리 매핑합니다.
+    캐시가 없으면 load_face_color_arrays로 캐시를 만든 뒤 반환합니다.
+    바이너리 데이터셋 디렉토리도 같은 방식으로 메타데이터 컬럼만 엽니다.
+    """
+    if os.path.isdir(data_path):
+        cache_dir = data_path
+    elif not use_cache:
+        return as_columnar_metadata(load_face_color_arrays(data_path, use_cache=False)[2])
+    else:
+        cache_dir = cache_dir_for(data_path)
+    info_path = os.path.join(cache_dir, 'info.json')
+    if not os.path.exists(info_path):
+        return load_face_color_arrays(data_path)[2]
+
+    with open(info_path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    if info.get('format_version') != CACHE_FORMAT_VERSION:
+        return load_face_color_arrays(data_path)[2]
+
+    print(f"   ⚡ 바이너리 캐시 사용 (메타데이터): {cache_dir}")
+    columns = {
+        name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode='r')
+        for name in ('category_codes', 'characteristics', 'colors')
+    }
+    return ColumnarMetadata(
+        columns['category_codes'], info['categories'],
+        columns['characteristics'], columns['colors']
+    )
+
+
+def load_indicator_arrays(data_path, use_cache=True):
+    """MBTI 지표 학습 데이터를 팔레트 배열과 라벨 배열로 로드
+
+    반환값은 {'X': (N, 15) float32, 'labels': (N,) 문자열 배열}입니다.
+    """
+    from palette_augmentation import hex_palettes_to_array
+
+    if not use_cache:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {
+            'X': hex_palettes_to_array([item['palette'] for item in data]),
+            'labels': np.array([item['label'] for item in data])
+        }
+
+    cache_dir = cache_dir_for(data_path)
+    cached = _read_cache(cache_dir)
+    if cached is None:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        classes, label_codes = np.unique(
+            np.array([item['label'] for item in data]), return_inverse=True
+        )
+        arrays = {
+            'X': hex_palettes_to_array([item['palette'] for item in data]),
+            'label_codes': label_codes.astype(np.int32)
+        }
+        del data
+
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        _prune_stale_caches(cache_dir)
+        _write_arrays(cache_dir, arrays, {
+            'format_version': CACHE_FORMAT_VERSION,
+            'source': os.path.basename(data_path),
+            'arrays': list(arrays),
+            'classes': classes.tolist()
+        })
+        cached = _read_cache(cache_dir)
+
+    info, arrays = cached
+    return {
+        'X': arrays['X'],
+        'labels': np.array(info['classes'])[arrays['label_codes']]
+    }
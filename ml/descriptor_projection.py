@@ -0,0 +1,361 @@
+"""
+얼굴 descriptor 저차원 투영 (PCA)
+148차원 입력 중 128차원 descriptor 블록(0:128)을 훈련 행의 주성분 rank개로
+투영하고, 물리적 특징(15)과 랜덤 시드(5)는 그대로 이어 붙여 rank + 20차원 입력으로
+학습합니다. 첫 Dense 레이어의 입력 폭이 줄어 학습 시 연산량과 메모리가 함께 줄고,
+내보낼 때는 투영을 Dense 가중치로 합성하므로 클라이언트는 148차원 입력을 그대로 사용합니다.
+
+사용법 (rank별 팔레트 오차 비교):
+    python descriptor_projection.py                          # rank 8 16 32 64 96 + 투영 없음
+    python descriptor_projection.py --ranks 16 32 --epochs 20 --max-samples 200000
+    python descriptor_projection.py --data ../public/data/diverse-face-color/generated
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from streaming_data import split_mask
+
+keras = lazy_import('tensorflow.keras')
+
+DESCRIPTOR_DIM = 128
+PROJECTION_SUFFIX = '.projection.npz'
+DEFAULT_SWEEP_RANKS = [8, 16, 32, 64, 96]
+FUSION_MODES = ['auto', 'fused', 'factorized']
+
+
+def projection_path(checkpoint_path):
+    """체크포인트에 대응하는 descriptor 투영 파일 경로"""
+    return os.path.splitext(checkpoint_path)[0] + PROJECTION_SUFFIX
+
+
+class DescriptorProjection:
+    """descriptor 블록의 PCA 투영 (나머지 특성은 그대로 통과)
+
+    공분산은 청크 단위로 누적하므로 메모리 매핑된 X도 한 번의 패스로 학습합니다.
+    """
+
+    def __init__(self, rank):
+        if not 1 <= rank <= DESCRIPTOR_DIM:
+            raise ValueError(f"descriptor 투영 차원은 1~{DESCRIPTOR_DIM} 사이여야 합니다: {rank}")
+        self.rank = int(rank)
+        self.mean_ = None
+        self.components_ = None
+        self.explained_variance_ratio_ = None
+        self.n_features_in_ = None
+        self.n_samples_seen_ = 0
+
+    @property
+    def output_dim(self):
+        return self.rank + self.n_features_in_ - DESCRIPTOR_DIM
+
+    def fit(self, X, rows=None, chunk_size=65536):
+        """rows(인덱스 또는 불리언 마스크)에 해당하는 행의 descriptor로 주성분 계산"""
+        if rows is None:
+            rows = np.arange(len(X))
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        rows = np.sort(rows)
+
+        total = np.zeros(DESCRIPTOR_DIM)
+        outer = np.zeros((DESCRIPTOR_DIM, DESCRIPTOR_DIM))
+        for start in range(0, len(rows), chunk_size):
+            chunk = np.asarray(X[rows[start:start + chunk_size], :DESCRIPTOR_DIM], dtype=np.float64)
+            total += chunk.sum(axis=0)
+            outer += chunk.T @ chunk
+
+        n = len(rows)
+        mean = total / n
+        covariance = (outer - n * np.outer(mean, mean)) / max(n - 1, 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1]
+        eigenvalues = np.clip(eigenvalues[order], 0.0, None)
+
+        self.mean_ = mean
+        self.components_ = eigenvectors[:, order[:self.rank]].T
+        self.explained_variance_ratio_ = eigenvalues[:self.rank] / max(eigenvalues.sum(), 1e-12)
+        self.n_features_in_ = X.shape[1]
+        self.n_samples_seen_ = n
+        return self
+
+    def transform(self, X):
+        """(N, 148) → (N, rank + 20): [descriptor 주성분, 물리적 특징, 랜덤 시드]"""
+        X = np.asarray(X, dtype=np.float32)
+        projected = (X[:, :DESCRIPTOR_DIM] - self.mean_.astype(np.float32)) @ self.components_.T.astype(np.float32)
+        return np.concatenate([projected, X[:, DESCRIPTOR_DIM:]], axis=1)
+
+    def transform_array(self, X, chunk_size=65536):
+        """X 전체를 청크 단위로 투영해 메모리 배열로 반환 (메모리 매핑 입력용)"""
+        projected = np.empty((len(X), self.output_dim), dtype=np.float32)
+        for start in range(0, len(X), chunk_size):
+            projected[start:start + chunk_size] = self.transform(X[start:start + chunk_size])
+        return projected
+
+    def affine(self):
+        """투영을 Dense 가중치로 표현: transform(x) = x @ kernel + bias (float64)"""
+        kernel = np.zeros((self.n_features_in_, self.output_dim))
+        kernel[:DESCRIPTOR_DIM, :self.rank] = self.components_.T
+        kernel[DESCRIPTOR_DIM:, self.rank:] = np.eye(self.n_features_in_ - DESCRIPTOR_DIM)
+        bias = np.zeros(self.output_dim)
+        bias[:self.rank] = -self.mean_ @ self.components_.T
+        return kernel, bias
+
+    def summary(self):
+        """model_info.json·보고서에 기록할 투영 정보"""
+        return {
+            'method': 'pca',
+            'rank': self.rank,
+            'input_dim': int(self.n_features_in_),
+            'projected_dim': int(self.output_dim),
+            'explained_variance': float(self.explained_variance_ratio_.sum()),
+            'fit_samples': int(self.n_samples_seen_)
+        }
+
+    def save(self, path):
+        np.savez(
+            path, rank=self.rank, mean=self.mean_, components=self.components_,
+            explained_variance_ratio=self.explained_variance_ratio_,
+            n_features_in=self.n_features_in_, n_samples_seen=self.n_samples_seen_
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            projection = cls(int(data['rank']))
+            projection.mean_ = data['mean']
+            projection.components_ = data['components']
+            projection.explained_variance_ratio_ = data['explained_variance_ratio']
+            projection.n_features_in_ = int(data['n_features_in'])
+            projection.n_samples_seen_ = int(data['n_samples_seen'])
+        return projection
+
+
+def load_descriptor_projection(checkpoint_path):
+    """체크포인트와 함께 저장된 투영 (없으면 None)"""
+    path = projection_path(checkpoint_path)
+    return DescriptorProjection.load(path) if os.path.exists(path) else None
+
+
+def training_rows(num_samples, index_split):
+    """학습 함수와 같은 분할의 훈련 행
+
+    index_split=True이면 스트리밍·tf.data 경로의 split_mask, 아니면 NumPy 경로의
+    train_test_split(random_state=42)를 인덱스에 적용한 결과와 같습니다.
+    """
+    if index_split:
+        return ~split_mask(num_samples, test_size=0.2, random_state=42)
+    from sklearn.model_selection import train_test_split
+    return train_test_split(np.arange(num_samples), test_size=0.2, random_state=42)[0]
+
+
+def validation_rows(num_samples, index_split):
+    """training_rows와 같은 분할의 검증 행 번호 (오름차순)"""
+    train_mask = np.zeros(num_samples, dtype=bool)
+    train_mask[training_rows(num_samples, index_split)] = True
+    return np.flatnonzero(~train_mask)
+
+
+def project_descriptor_inputs(X, checkpoint_path, rank=None, resume=False, index_split=False,
+                              chunk_size=65536):
+    """학습 입력에 descriptor 투영을 적용하고 (투영 또는 None, 학습에 사용할 X) 반환
+
+    resume=True(증분 학습)이면 체크포인트와 함께 저장된 투영을 그대로 사용하고,
+    rank를 지정하면 훈련 행으로 새로 학습해 체크포인트 옆에 저장합니다. 둘 다 아니면
+    이전 학습의 투영 파일을 지워 투영 없이 학습한 체크포인트와 섞이지 않게 합니다.
+    투영한 X는 (N, rank + 20) float32 메모리 배열이므로 스트리밍 경로에서도 원본보다 작습니다.
+    """
+    path = projection_path(checkpoint_path)
+    if resume:
+        projection = load_descriptor_projection(checkpoint_path)
+        if rank and (projection is None or projection.rank != rank):
+            print(f"   ⚠️ 증분 학습은 체크포인트의 입력 형태를 유지하므로 descriptor 투영 설정({rank})을 무시합니다.")
+    elif rank:
+        projection = DescriptorProjection(rank).fit(X, training_rows(len(X), index_split), chunk_size)
+        projection.save(path)
+    else:
+        if os.path.exists(path):
+            os.remove(path)
+        projection = None
+
+    if projection is None:
+        return None, X
+
+    print(f"   🗜️ descriptor 투영: {DESCRIPTOR_DIM} → {projection.rank}차원 (PCA, 설명 분산 "
+          f"{projection.explained_variance_ratio_.sum():.1%}), 입력 {projection.n_features_in_} → "
+          f"{projection.output_dim}차원")
+    return projection, projection.transform_array(X, chunk_size)
+
+
+def _dense_specs(model):
+    return [
+        (layer.get_weights()[0].astype(np.float64), layer.get_weights()[1].astype(np.float64),
+         keras.activations.serialize(layer.activation))
+        for layer in model.layers
+    ]
+
+
+def fuse_descriptor_projection(folded, projection, mode='auto'):
+    """접힌 Dense 전용 모델 앞에 투영을 합성해 148차원 입력 모델을 만들고 (모델, 방식) 반환
+
+    - 'fused': 투영을 첫 Dense에 곱해 넣음 (W' = P W, b' = b_P W + b). 레이어 수는
+      그대로지만 첫 커널이 다시 148 × 폭이 됩니다.
+    - 'factorized': 투영을 선형 Dense(rank + 20)로 앞에 둠. 첫 커널이 저차원 인수로
+      나뉘어 rank가 작을수록 파라미터와 곱셈-덧셈이 줄어듭니다.
+    - 'auto': 두 방식 중 파라미터가 적은 쪽.
+    """
+    if mode not in FUSION_MODES:
+        raise ValueError(f"지원하지 않는 투영 합성 방식입니다: {mode}")
+    specs = _dense_specs(folded)
+    proj_kernel, proj_bias = projection.affine()
+    kernel, bias, activation = specs[0]
+
+    fused_params = proj_kernel.shape[0] * kernel.shape[1] + kernel.shape[1]
+    factorized_params = proj_kernel.size + proj_bias.size + kernel.size + bias.size
+    if mode == 'auto':
+        mode = 'fused' if fused_params <= factorized_params else 'factorized'
+
+    if mode == 'fused':
+        specs[0] = (proj_kernel @ kernel, proj_bias @ kernel + bias, activation)
+    else:
+        specs.insert(0, (proj_kernel, proj_bias, 'linear'))
+
+    model = keras.Sequential(
+        [keras.Input(shape=(proj_kernel.shape[0],))] +
+        [keras.layers.Dense(k.shape[1], activation=act) for k, _, act in specs]
+    )
+    model.set_weights([array.astype(np.float32) for k, b, _ in specs for array in (k, b)])
+    return model, mode
+
+
+def verify_fused_projection(folded, fused, projection, reference_inputs=None, atol=1e-4):
+    """투영 전 입력(148차원)에 대해 fused(x)와 folded(투영(x))를 비교해 최대 절대 오차 반환
+
+    reference_inputs가 없으면 generate_diverse_data의 분포로 입력을 생성합니다.
+    """
+    if reference_inputs is None:
+        from generate_diverse_data import generate_face_features
+        reference_inputs = generate_face_features(256, np.random.default_rng(0))
+
+    reference_inputs = np.asarray(reference_inputs, dtype=np.float32)
+    expected = folded.predict(projection.transform(reference_inputs), batch_size=1024, verbose=0)
+    actual = fused.predict(reference_inputs, batch_size=1024, verbose=0)
+    max_error = float(np.max(np.abs(expected - actual)))
+
+    print(f"   🔍 투영 합성 검증: 최대 출력 오차 {max_error:.2e} (허용 {atol:.0e})")
+    if max_error > atol:
+        raise ValueError(f"투영을 합성한 모델의 출력 오차({max_error:.2e})가 허용 범위를 넘었습니다.")
+    return max_error
+
+
+def sweep_descriptor_ranks(X, y, ranks=DEFAULT_SWEEP_RANKS, epochs=30, batch_size=64,
+                           patience=5, seed=42):
+    """rank별로 같은 조건의 diverse 모델을 짧게 학습해 팔레트 오차와 비용 비교
+
+    rank None(투영 없음)을 기준으로 함께 학습합니다. 분할은 NumPy 학습 경로와 같은
+    train_test_split(random_state=42)이고, 크기와 지연 시간은 투영을 합성해 내보낸
+    모델 기준입니다 (distillation.measure_inference).
+    """
+    from sklearn.preprocessing import StandardScaler
+    from color_evaluation import evaluate_color_model
+    from distillation import measure_inference
+    from train_diverse_face_to_color import create_enhanced_diverse_model
+
+    train_rows = np.sort(training_rows(len(X), index_split=False))
+    val_rows = np.setdiff1d(np.arange(len(X)), train_rows)
+    y_train = np.asarray(y[train_rows], dtype=np.float32)
+    y_val = np.asarray(y[val_rows], dtype=np.float32)
+
+    results = []
+    for rank in [None] + sorted(set(ranks)):
+        label = '투영 없음' if rank is None else f'rank {rank}'
+        print(f"\n🗜️ {label} 학습 ({epochs} 에포크 이내)")
+        projection = None
+        X_in = np.asarray(X, dtype=np.float32)
+        if rank is not None:
+            projection = DescriptorProjection(rank).fit(X, train_rows)
+            X_in = projection.transform_array(X)
+        scaler = StandardScaler().fit(X_in[train_rows])
+        X_train, X_val = scaler.transform(X_in[train_rows]), scaler.transform(X_in[val_rows])
+        del X_in
+
+        keras.utils.set_random_seed(seed)
+        model = create_enhanced_diverse_model(input_dim=X_train.shape[1])
+        start_time = time.perf_counter()
+        history = model.fit(
+            X_train, y_train,
+            validation_data=(X_val, y_val),
+            epochs=epochs,
+            batch_size=batch_size,
+            callbacks=[keras.callbacks.EarlyStopping(
+                monitor='val_loss', patience=patience, restore_best_weights=True
+            )],
+            verbose=0
+        )
+        train_seconds = time.perf_counter() - start_time
+        epochs_run = len(history.history['loss'])
+
+        quality = evaluate_color_model(model, X_val, y_val)
+        stats = measure_inference(model, scaler, projection=projection, latency_repeats=500)
+        results.append({
+            'rank': rank,
+            'input_dim': int(X_train.shape[1]),
+            'explained_variance': (float(projection.explained_variance_ratio_.sum())
+                                   if projection is not None else 1.0),
+            'epochs': epochs_run,
+            'train_seconds': train_seconds,
+            'seconds_per_epoch': train_seconds / epochs_run,
+            **quality,
+            **stats
+        })
+        print(f"   팔레트 MSE {quality['mse']:.6f}, 에포크당 {train_seconds / epochs_run:.2f}초, "
+              f"파라미터 {stats['params']:,}개")
+
+    print_rank_sweep(results)
+    return results
+
+
+def print_rank_sweep(results):
+    """rank별 팔레트 오차와 학습·모델 비용을 투영 없는 기준 대비로 출력"""
+    baseline = results[0]
+    print(f"\n📊 descriptor rank 비교 (검증 {baseline['num_samples']:,}개):")
+    print(f"   {'rank':>6s}{'설명 분산':>10s}{'팔레트 MSE':>13s}{'MSE 변화':>10s}{'에포크당(s)':>12s}"
+          f"{'파라미터':>10s}{'내보낸 크기':>12s}{'1회 지연(ms)':>13s}")
+    for result in results:
+        rank = '없음' if result['rank'] is None else str(result['rank'])
+        change = (result['mse'] / max(baseline['mse'], 1e-12) - 1) * 100
+        print(f"   {rank:>6s}{result['explained_variance']:>10.1%}{result['mse']:>13.6f}{change:>+9.1f}%"
+              f"{result['seconds_per_epoch']:>12.2f}{result['params']:>10,}{result['export_bytes']:>11,}B"
+              f"{result['latency_ms']:>13.4f}")
+
+
+def main(argv=None):
+    from train_diverse_face_to_color import load_diverse_face_color_data
+
+    parser = argparse.ArgumentParser(description="얼굴 descriptor 투영 rank별 팔레트 오차 비교")
+    parser.add_argument('--data', default=None,
+                        help="학습 데이터 JSON 또는 바이너리 데이터셋 디렉토리 (기본: diverse 학습 데이터)")
+    parser.add_argument('--ranks', type=int, nargs='+', default=DEFAULT_SWEEP_RANKS)
+    parser.add_argument('--epochs', type=int, default=30, help="rank별 최대 학습 에포크 (조기 종료 포함)")
+    parser.add_argument('--max-samples', type=int, default=None, help="앞에서부터 사용할 최대 샘플 수")
+    parser.add_argument('--output', default='rank_sweep.json')
+    args = parser.parse_args(argv)
+
+    X, y, _ = load_diverse_face_color_data(data_path=args.data)
+    if args.max_samples:
+        X, y = X[:args.max_samples], y[:args.max_samples]
+
+    results = sweep_descriptor_ranks(X, y, args.ranks, epochs=args.epochs)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n📝 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+다양한 얼굴-색상 모델 지식 증류 (teacher → 브라우저용 소형 student)
+train_diverse_face_to_color_model로 학습한 teacher의 출력을 실제 훈련 입력과
+generate_diverse_data로 새로 생성한 입력 모두에 대해 계산하고, 파라미터 또는
+지연 시간 예산에 맞춘 BatchNormalization·Dropout 없는 작은 Dense 모델을 그 출력으로
+학습합니다. student는 같은 save_diverse_model_as_tfjs 경로로(정규화 접기 포함) 내보내고,
+teacher 대비 팔레트 MSE·색상 다양성 차이와 크기·지연 시간 감소를 함께 보고합니다.
+
+사용법:
+    python distillation.py                                  # best_diverse_model.h5 → student
+    python distillation.py --param-budget 8000 --generated-ratio 2
+    python distillation.py --latency-budget-ms 0.05
+    python distillation.py --widths 48 24 --model-dir ../public/models/diverse-face-to-color
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from color_evaluation import evaluate_color_model, predict_in_batches
+from graph_optimizer import fold_inference_graph
+from descriptor_projection import fuse_descriptor_projection, load_descriptor_projection, training_rows
+from tfjs_export import write_tfjs_model
+from numpy_runtime import NumpyModel
+from generate_diverse_data import generate_face_features
+
+keras = lazy_import('tensorflow.keras')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STUDENT_MODEL_DIR = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "models", "diverse-face-to-color-student")
+)
+TEACHER_MODEL_DIR = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "models", "diverse-face-to-color")
+)
+# 클라이언트(ColorPredictor)가 student를 먼저 로드할지 판단하는 모델 목록
+FACE_COLOR_MANIFEST_PATH = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "models", "face-color-models.json")
+)
+REPORT_FILE_NAME = 'distillation_report.json'
+
+# 큰 것부터 작은 순서의 student 은닉층 후보 (예산을 만족하는 가장 큰 후보 선택)
+STUDENT_CANDIDATES = [
+    [128, 64], [96, 48], [64, 32], [48, 24], [32, 16], [32], [16]
+]
+# 예산을 지정하지 않았을 때 teacher 파라미터 수 대비 student 예산 비율
+DEFAULT_PARAM_FRACTION = 1 / 8
+
+
+def create_student_model(widths, input_dim=148, output_dim=15, learning_rate=0.002):
+    """BatchNormalization·Dropout 없는 Dense 전용 student 모델"""
+    model = keras.Sequential(
+        [keras.Input(shape=(input_dim,))] +
+        [keras.layers.Dense(width, activation='relu') for width in widths] +
+        [keras.layers.Dense(output_dim, activation='sigmoid')]
+    )
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        loss='mse',
+        metrics=['mae']
+    )
+    return model
+
+
+def dense_param_count(widths, input_dim=148, output_dim=15):
+    """Dense 전용 모델의 파라미터 수 (커널 + 편향)"""
+    sizes = [input_dim] + list(widths) + [output_dim]
+    return sum(n_in * n_out + n_out for n_in, n_out in zip(sizes[:-1], sizes[1:]))
+
+
+def measure_inference(model, scaler=None, latency_repeats=2000, batch_size=1024, projection=None):
+    """추론 그래프를 접어 TensorFlow.js로 내보낸 모델의 크기와 NumPy 추론 속도
+
+    latency_ms는 샘플 1개(얼굴 분석 1회) 추론의 중앙값, flops는 샘플당
+    곱셈-덧셈 수입니다. NumPy 추론은 브라우저 CPU 백엔드처럼 레이어별 행렬곱을
+    순서대로 실행하므로 기기와 무관한 상대 비교에 사용합니다.
+    projection(descriptor 투영)이 있으면 내보낼 때처럼 투영을 합성한 모델을 측정합니다.
+    """
+    folded = fold_inference_graph(model, scaler)
+    if projection is not None:
+        folded, _ = fuse_descriptor_projection(folded, projection)
+    export_dir = tempfile.mkdtemp(prefix='distill-export-')
+    try:
+        write_tfjs_model(folded, export_dir)
+        export_bytes = sum(
+            os.path.getsize(os.path.join(export_dir, name)) for name in os.listdir(export_dir)
+        )
+        runtime = NumpyModel.load(export_dir)
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    input_dim = folded.input_shape[-1]
+    rng = np.random.default_rng(0)
+    sample = rng.random((1, input_dim), dtype=np.float32)
+    for _ in range(50):
+        runtime.predict(sample)
+    timings = np.empty(latency_repeats)
+    for i in range(latency_repeats):
+        start = time.perf_counter()
+        runtime.predict(sample)
+        timings[i] = time.perf_counter() - start
+
+    batch = rng.random((batch_size, input_dim), dtype=np.float32)
+    runtime.predict(batch)
+    start = time.perf_counter()
+    for _ in range(10):
+        runtime.predict(batch)
+    throughput = batch_size * 10 / (time.perf_counter() - start)
+
+    return {
+        'params': int(folded.count_params()),
+        'flops': int(sum(layer.kernel.shape[0] * layer.kernel.shape[1] for layer in folded.layers)),
+        'export_bytes': int(export_bytes),
+        'latency_ms': float(np.median(timings) * 1000),
+        'samples_per_second': float(throughput)
+    }
+
+
+def select_student_widths(teacher_params, param_budget=None, latency_budget_ms=None,
+                          input_dim=148, output_dim=15):
+    """예산을 만족하는 가장 큰 STUDENT_CANDIDATES 후보
+
+    latency_budget_ms가 있으면 후보마다 measure_inference로 샘플 1개 지연 시간을
+    재고, 없으면 param_budget(기본: teacher 파라미터 × DEFAULT_PARAM_FRACTION)으로 고릅니다.
+    만족하는 후보가 없으면 가장 작은 후보를 반환합니다.
+    """
+    if latency_budget_ms is None and param_budget is None:
+        param_budget = int(teacher_params * DEFAULT_PARAM_FRACTION)
+
+    for widths in STUDENT_CANDIDATES:
+        if param_budget is not None and dense_param_count(widths, input_dim, output_dim) > param_budget:
+            continue
+        if latency_budget_ms is not None:
+            latency = measure_inference(
+                create_student_model(widths, input_dim, output_dim), latency_repeats=500
+            )['latency_ms']
+            print(f"   후보 {widths}: {latency:.3f}ms")
+            if latency > latency_budget_ms:
+                continue
+        return list(widths)
+    return list(STUDENT_CANDIDATES[-1])
+
+
+def teacher_predictions(teacher, X_scaled, batch_size=4096):
+    """teacher 출력(소프트 타깃)을 청크 단위 예측으로 계산"""
+    return np.concatenate([
+        predictions for _, _, predictions in predict_in_batches(teacher, X_scaled, batch_size)
+    ]) if len(X_scaled) else np.empty((0, teacher.output_shape[-1]), dtype=np.float32)
+
+
+def distill_diverse_model(teacher, scaler, X, y, widths=None, param_budget=None,
+                          latency_budget_ms=None, generated_ratio=1.0, label_weight=0.2,
+                          epochs=100, batch_size=256, max_eval_samples=100000, seed=42,
+                          projection=None, index_split=False):
+    """teacher를 작은 student로 증류하고 (student, 보고서) 반환
+
+    훈련/검증 분할은 teacher 학습과 같은 descriptor_projection.training_rows를 사용해
+    (index_split=True: 스트리밍·tf.data의 split_mask, 아니면 NumPy 경로의
+    train_test_split) teacher가 보지 않은 검증 행에서만 비교합니다. 실제 훈련 행의 타깃은 teacher 출력과 정답을
+    label_weight 비율로 섞고, 훈련 행 수 × generated_ratio개의 생성 입력은 teacher
+    출력만 타깃으로 사용합니다. student 입력에는 teacher와 같은 정규화를 적용하므로
+    내보낼 때 scaler를 첫 Dense에 접어 넣을 수 있습니다.
+    teacher를 descriptor 투영(projection)으로 학습했다면 student도 같은 투영 입력으로 학습합니다.
+    """
+    print("🧪 지식 증류: teacher → student")
+    input_dim = projection.output_dim if projection is not None else X.shape[1]
+    output_dim = y.shape[1]
+    train_mask = np.zeros(len(X), dtype=bool)
+    train_mask[training_rows(len(X), index_split)] = True
+    train_rows, val_rows = np.flatnonzero(train_mask), np.flatnonzero(~train_mask)
+
+    def transform(inputs):
+        inputs = np.asarray(inputs, dtype=np.float32)
+        if projection is not None:
+            inputs = projection.transform(inputs)
+        return scaler.transform(inputs).astype(np.float32) if scaler is not None else inputs
+
+    teacher_stats = measure_inference(teacher, scaler, projection=projection)
+    if widths is None:
+        widths = select_student_widths(
+            teacher_stats['params'], param_budget, latency_budget_ms, input_dim, output_dim
+        )
+    print(f"   teacher: 파라미터 {teacher_stats['params']:,}개, student 은닉층: {widths} "
+          f"(파라미터 {dense_param_count(widths, input_dim, output_dim):,}개)")
+
+    # 소프트 타깃: 실제 훈련 입력 + 생성 입력에 대한 teacher 출력
+    X_real = transform(X[train_rows])
+    soft_real = teacher_predictions(teacher, X_real)
+    targets_real = (1 - label_weight) * soft_real + label_weight * np.asarray(y[train_rows], dtype=np.float32)
+
+    num_generated = int(len(train_rows) * generated_ratio)
+    X_generated = transform(generate_face_features(num_generated, np.random.default_rng(seed)))
+    targets_generated = teacher_predictions(teacher, X_generated)
+    print(f"   증류 데이터: 실제 {len(X_real):,}개 + 생성 {num_generated:,}개 (정답 가중치 {label_weight})")
+
+    X_train = np.concatenate([X_real, X_generated])
+    y_train = np.concatenate([targets_real, targets_generated])
+    del X_real, X_generated
+
+    X_val = transform(X[val_rows[:max_eval_samples]])
+    y_val = np.asarray(y[val_rows[:max_eval_samples]], dtype=np.float32)
+    soft_val = teacher_predictions(teacher, X_val)
+
+    keras.utils.set_random_seed(seed)
+    student = create_student_model(widths, input_dim, output_dim)
+    callbacks = [
+        # 검증 행의 teacher 출력 재현 오차 기준 조기 종료
+        keras.callbacks.EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True, verbose=1),
+        keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=4, min_lr=1e-6, verbose=1)
+    ]
+    start_time = time.perf_counter()
+    history = student.fit(
+        X_train, y_train,
+        validation_data=(X_val, soft_val),
+        epochs=epochs,
+        batch_size=batch_size,
+        callbacks=callbacks,
+        verbose=2
+    )
+    train_seconds = time.perf_counter() - start_time
+
+    # 품질 비교 (검증 행 정답 기준) 및 teacher 재현 오차
+    teacher_quality = evaluate_color_model(teacher, X_val, y_val)
+    student_quality = evaluate_color_model(student, X_val, y_val)
+    fidelity = evaluate_color_model(student, X_val, soft_val)['mse']
+    student_stats = measure_inference(student, scaler, projection=projection)
+
+    report = {
+        'widths': widths,
+        'teacher': {**teacher_stats, **teacher_quality},
+        'student': {**student_stats, **student_quality},
+        'student_teacher_mse': fidelity,
+        'size_reduction': teacher_stats['export_bytes'] / max(student_stats['export_bytes'], 1),
+        'latency_speedup': teacher_stats['latency_ms'] / max(student_stats['latency_ms'], 1e-9),
+        'flops_reduction': teacher_stats['flops'] / max(student_stats['flops'], 1),
+        'training': {
+            'real_samples': int(len(train_rows)), 'generated_samples': num_generated,
+            'label_weight': label_weight, 'epochs': len(history.history['loss']),
+            'train_seconds': train_seconds, 'seed': seed
+        }
+    }
+    print_distillation_report(report)
+    return student, report
+
+
+def print_distillation_report(report):
+    """teacher 대비 student 품질 차이와 크기·지연 시간 감소 출력"""
+    teacher, student = report['teacher'], report['student']
+    print(f"\n📊 증류 결과 (검증 {student['num_samples']:,}개, student {report['widths']}):")
+    print(f"   {'':12s}{'teacher':>14s}{'student':>14s}")
+    rows = [
+        ('팔레트 MSE', 'mse', '{:.6f}'), ('MAE', 'mae', '{:.6f}'),
+        ('극값 정확도', 'extreme_accuracy', '{:.3f}'), ('고유 색상', 'unique_colors', '{:,}'),
+        ('평균 색상 거리', 'avg_distance', '{:.3f}'), ('다양성 점수', 'diversity_score', '{:.1f}%'),
+        ('파라미터', 'params', '{:,}'), ('곱셈-덧셈', 'flops', '{:,}'),
+        ('내보낸 크기', 'export_bytes', '{:,}B'), ('1회 지연(ms)', 'latency_ms', '{:.4f}'),
+        ('샘플/초', 'samples_per_second', '{:,.0f}')
+    ]
+    for label, key, fmt in rows:
+        print(f"   {label:12s}{fmt.format(teacher[key]):>14s}{fmt.format(student[key]):>14s}")
+    print(f"   student-teacher 출력 MSE: {report['student_teacher_mse']:.6f}")
+    print(f"   ⚡ 크기 {report['size_reduction']:.1f}배 감소, 곱셈-덧셈 {report['flops_reduction']:.1f}배 감소, "
+          f"1회 지연 {report['latency_speedup']:.1f}배 빠름 (NumPy 추론 기준)")
+
+
+def save_student_model(student, scaler, report, model_dir=STUDENT_MODEL_DIR, quantization=None,
+                       projection=None):
+    """student를 teacher와 같은 save_diverse_model_as_tfjs 경로로 저장하고 보고서 기록
+
+    정규화는 첫 Dense에 접어 넣으므로(optimize=True) 클라이언트는 입력을 그대로 사용합니다.
+    """
+    from train_diverse_face_to_color import save_diverse_model_as_tfjs
+
+    model_dir = save_diverse_model_as_tfjs(
+        student, scaler, quantization=quantization, optimize=True, model_dir=model_dir,
+        projection=projection
+    )
+    with open(os.path.join(model_dir, REPORT_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"   📝 증류 보고서: {os.path.join(model_dir, REPORT_FILE_NAME)}")
+    if os.path.normpath(model_dir) == STUDENT_MODEL_DIR:
+        write_face_color_manifest(student=True)
+    return model_dir
+
+
+def write_face_color_manifest(student):
+    """클라이언트가 student를 먼저 로드할지 public/models/face-color-models.json에 기록
+
+    ColorPredictor는 이 파일에 student가 있다고 기록된 경우에만 student를 요청하므로
+    student가 없을 때 404 요청을 하지 않습니다.
+    """
+    manifest = {'student': bool(student), 'model': os.path.basename(TEACHER_MODEL_DIR)}
+    if student:
+        manifest['model'] = os.path.basename(STUDENT_MODEL_DIR)
+    with open(FACE_COLOR_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"   📝 모델 목록 갱신: {FACE_COLOR_MANIFEST_PATH} (student {'사용' if student else '없음'})")
+    return FACE_COLOR_MANIFEST_PATH
+
+
+def discard_student_model(model_dir=STUDENT_MODEL_DIR):
+    """teacher 디렉토리로 새 모델을 내보낼 때 이전 teacher로 증류한 student 삭제
+
+    save_diverse_model_as_tfjs(두 학습 스크립트, cli export, pipeline 공통)가 호출하며,
+    모델 목록도 student 없음으로 갱신해 클라이언트가 새 teacher를 바로 로드하게 합니다.
+    """
+    if os.path.isdir(model_dir):
+        shutil.rmtree(model_dir)
+        print(f"   🗑️ 이전 student 모델 삭제: {model_dir}")
+    write_face_color_manifest(student=False)
+
+
+def main(argv=None):
+    from train_diverse_face_to_color import CHECKPOINT_PATH, load_diverse_face_color_data
+    from warm_start import load_training_state, scaler_from_state
+
+    parser = argparse.ArgumentParser(description="다양한 얼굴-색상 모델 지식 증류 (teacher → student)")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help="teacher 체크포인트 경로")
+    parser.add_argument('--scaler', help="scaler_info.json 경로 (기본: 체크포인트 학습 상태의 정규화 통계)")
+    parser.add_argument('--data', default=None,
+                        help="학습 데이터 JSON 또는 generate_diverse_data.py로 만든 바이너리 데이터셋 디렉토리")
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--widths', type=int, nargs='+', help="student 은닉층 너비 (예: 64 32)")
+    budget.add_argument('--param-budget', type=int, help="student 최대 파라미터 수")
+    budget.add_argument('--latency-budget-ms', type=float, help="샘플 1개 추론 최대 지연 시간(ms, NumPy 기준)")
+    parser.add_argument('--generated-ratio', type=float, default=1.0, help="훈련 행 대비 생성 입력 비율")
+    parser.add_argument('--label-weight', type=float, default=0.2, help="실제 행 타깃에서 정답의 비율")
+    parser.add_argument('--epochs', type=int, default=100)
+    parser.add_argument('--quantization', choices=['float16', 'uint8', 'uint16'], default=None)
+    parser.add_argument('--model-dir', default=STUDENT_MODEL_DIR,
+                        help="student 저장 위치 (기본 위치면 모델 목록에 기록되어 브라우저가 teacher보다 먼저 로드)")
+    args = parser.parse_args(argv)
+
+    # teacher 학습 때 기록한 분할 방식으로 teacher가 보지 않은 검증 행을 고름
+    state = load_training_state(args.checkpoint) or {}
+    if args.scaler:
+        from streaming_data import StreamingStandardScaler
+        with open(args.scaler, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        if 'mean' not in info:
+            raise SystemExit("❌ scaler_info.json에 정규화 통계가 없습니다 (정규화가 모델에 접힌 내보내기).")
+        scaler = StreamingStandardScaler.from_stats(info['mean'], info['scale'])
+    else:
+        scaler = scaler_from_state(state)
+        if scaler is None:
+            raise SystemExit(f"❌ {args.checkpoint}의 학습 상태(정규화 통계)가 없습니다. --scaler로 지정해주세요.")
+
+    print(f"📦 teacher 체크포인트 로드: {args.checkpoint}")
+    teacher = keras.models.load_model(args.checkpoint, compile=False)
+    projection = load_descriptor_projection(args.checkpoint)
+    X, y, _ = load_diverse_face_color_data(data_path=args.data)
+
+    student, report = distill_diverse_model(
+        teacher, scaler, X, y, widths=args.widths, param_budget=args.param_budget,
+        latency_budget_ms=args.latency_budget_ms, generated_ratio=args.generated_ratio,
+        label_weight=args.label_weight, epochs=args.epochs, projection=projection,
+        index_split=state.get('index_split', False)
+    )
+    save_student_model(student, scaler, report, args.model_dir, args.quantization, projection=projection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+색상 다양성 손실 함수
+5개 색상 사이의 10개 쌍 거리를 상수 차분 행렬과의 한 번의 곱으로 계산해,
+쌍마다 tf.norm을 만들던 이중 루프 대신 XLA(jit_compile=True)로 융합되는
+하나의 연산 그래프를 만듭니다.
+"""
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+
+NUM_COLORS = 5
+
+
+def pair_difference_matrix(num_colors=NUM_COLORS):
+    """(쌍 수, 색상 수) 차분 행렬: 쌍 (i, j) 행은 i에 +1, j에 -1
+
+    행 순서는 기존 이중 루프의 (i, j) 순서(i < j)와 같습니다.
+    """
+    pairs_i, pairs_j = np.triu_indices(num_colors, k=1)
+    matrix = np.zeros((len(pairs_i), num_colors), dtype=np.float32)
+    matrix[np.arange(len(pairs_i)), pairs_i] = 1.0
+    matrix[np.arange(len(pairs_i)), pairs_j] = -1.0
+    return matrix
+
+
+def pairwise_color_distances(colors, difference_matrix):
+    """(배치, 색상, 3) 색상의 모든 쌍 유클리드 거리 (배치, 쌍 수)"""
+    differences = tf.einsum('pk,bkc->bpc', difference_matrix, colors)
+    return tf.norm(differences, axis=-1)
+
+
+def create_color_diversity_loss(diversity_weight=0.1, num_colors=NUM_COLORS):
+    """MSE + 색상 간 평균 거리가 가까울수록 커지는 다양성 페널티"""
+    difference_matrix = tf.constant(pair_difference_matrix(num_colors))
+
+    def diversity_loss(y_true, y_pred):
+        mse_loss = tf.reduce_mean(tf.square(y_true - y_pred), axis=-1)
+
+        colors = tf.reshape(y_pred, (-1, num_colors, 3))
+        avg_distance = tf.reduce_mean(pairwise_color_distances(colors, difference_matrix), axis=1)
+        diversity_penalty = tf.exp(-avg_distance)  # 거리가 가까우면 페널티
+
+        return mse_loss + diversity_weight * tf.reduce_mean(diversity_penalty)
+
+    return diversity_loss
+
+
+def create_improved_diversity_loss(extreme_weight=0.5, diversity_weight=0.15, contrast_weight=0.1,
+                                   diversity_scale=2.0, contrast_scale=3.0, num_colors=NUM_COLORS):
+    """극값 가중 MSE + 다양성 페널티 + 대비 페널티
+
+    극값(0 또는 1에 0.01 이내)인 목표값의 제곱 오차에 (1 + extreme_weight)배
+    가중치를 주고, 색상 간 평균 거리와 색상별 표준편차가 작을수록 페널티를 줍니다.
+    """
+    difference_matrix = tf.constant(pair_difference_matrix(num_colors))
+
+    def improved_diversity_loss(y_true, y_pred):
+        extreme_value_mask = tf.cast(
+            (tf.abs(y_true) < 0.01) | (tf.abs(y_true - 1.0) < 0.01), y_pred.dtype
+        )
+        weighted_mse = tf.reduce_mean(
+            tf.square(y_true - y_pred) * (1.0 + extreme_weight * extreme_value_mask)
+        )
+
+        colors = tf.reshape(y_pred, (-1, num_colors, 3))
+        avg_distance = tf.reduce_mean(pairwise_color_distances(colors, difference_matrix), axis=1)
+        diversity_penalty = tf.exp(-avg_distance * diversity_scale)
+
+        color_contrast = tf.reduce_mean(tf.math.reduce_std(colors, axis=1))
+        contrast_penalty = tf.exp(-color_contrast * contrast_scale)
+
+        return (weighted_mse
+                + diversity_weight * tf.reduce_mean(diversity_penalty)
+                + contrast_weight * contrast_penalty)
+
+    return improved_diversity_loss
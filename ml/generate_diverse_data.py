@@ -0,0 +1,279 @@
+"""
+다양한 얼굴-색상 학습 데이터 생성기 (NumPy 벡터화)
+scripts/generateDiverseFaceColorData.ts와 같은 색상 카테고리 구성
+(vibrant 20%, harmonious 20%, cool 15%, warm 15%, neutral 10%, contrast 10%,
+random 10%)과 입력 구성(descriptor 128 + 물리적 특징 15 + 시드 5)으로 데이터를
+청크 단위로 생성해, JSON 없이 바이너리 데이터셋(.npy + info.json)으로 바로 기록합니다.
+기록된 디렉토리는 load_face_color_arrays / load_diverse_face_color_data(data_path=...)로
+메모리 매핑해 사용합니다.
+
+사용법:
+    python generate_diverse_data.py --samples 1000000 --output ../public/data/diverse-face-color/generated-1m
+    python generate_diverse_data.py --samples 20000 --seed 7 --ordered
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from dataset_cache import CACHE_FORMAT_VERSION, CHARACTERISTIC_NAMES
+
+NUM_COLORS = 5
+DESCRIPTOR_DIM = 128
+PHYSICAL_DIM = 15
+SEED_DIM = 5
+INPUT_DIM = DESCRIPTOR_DIM + PHYSICAL_DIM + SEED_DIM
+
+# 카테고리별 비율과 팔레트 규칙 (TS 생성기의 generate*Palette와 같은 범위)
+#   hue = (base + 색상 인덱스 × step + jitter) % 360 (JS와 같이 음수 나머지 유지)
+#   각 범위는 (최솟값, 폭)으로 최솟값 + U(0, 1) × 폭을 뜻함
+CATEGORY_SPECS = {
+    'vibrant': {
+        'fraction': 0.2, 'base': (0, 360), 'step': 72, 'jitter': (-15, 30),
+        'saturation': (0.7, 0.3), 'lightness': [(0.3, 0.4)] * NUM_COLORS,
+        'characteristics': [(0.6, 0.3), (0.8, 0.2), (-1, 2), (0.7, 0.3), (0.4, 0.3)]
+    },
+    'harmonious': {
+        'fraction': 0.2, 'base': (0, 360), 'step': 15, 'jitter': (-5, 10),
+        'saturation': (0.3, 0.4), 'lightness': [(0.4, 0.4)] * NUM_COLORS,
+        'characteristics': [(0.5, 0.3), (0.4, 0.3), (-1, 2), (0.2, 0.3), (0.7, 0.3)]
+    },
+    'cool': {
+        'fraction': 0.15, 'base': (180, 120), 'step': 0, 'jitter': (-30, 60),
+        'saturation': (0.4, 0.5), 'lightness': [(0.3, 0.5)] * NUM_COLORS,
+        'characteristics': [(0.4, 0.4), (0.5, 0.4), (-0.5, -0.5), (0.3, 0.4), (0.6, 0.3)]
+    },
+    'warm': {
+        'fraction': 0.15, 'base': (300, 60), 'step': 0, 'jitter': (-30, 60),
+        'saturation': (0.5, 0.4), 'lightness': [(0.4, 0.4)] * NUM_COLORS,
+        'characteristics': [(0.5, 0.4), (0.6, 0.3), (0.5, 0.5), (0.4, 0.4), (0.5, 0.3)]
+    },
+    'neutral': {
+        'fraction': 0.1, 'base': (0, 0), 'step': 0, 'jitter': (0, 360),
+        'saturation': (0, 0.3), 'lightness': [(0.3, 0.5)] * NUM_COLORS,
+        'characteristics': [(0.4, 0.4), (0.1, 0.2), (-0.2, 0.4), (0.2, 0.3), (0.8, 0.2)]
+    },
+    'contrast': {
+        'fraction': 0.1, 'base': (0, 360), 'step': 72, 'jitter': (-10, 20),
+        'saturation': (0.6, 0.4),
+        'lightness': [(0.2, 0.3) if i % 2 == 0 else (0.6, 0.3) for i in range(NUM_COLORS)],
+        'characteristics': [(0.4, 0.4), (0.6, 0.3), (-1, 2), (0.8, 0.2), (0.3, 0.3)]
+    },
+    'random': {
+        'fraction': 0.1, 'base': (0, 0), 'step': 0, 'jitter': (0, 360),
+        'saturation': (0, 1), 'lightness': [(0, 1)] * NUM_COLORS,
+        'characteristics': [(0, 1), (0, 1), (-1, 2), (0, 1), (0, 1)]
+    }
+}
+CATEGORIES = list(CATEGORY_SPECS)
+
+# 물리적 특징 15개의 베타 근사 분포 (alpha, beta): 얼굴형 4, 눈 4, 입 3, 코 2, 비율 2
+PHYSICAL_FEATURE_SHAPES = np.array([
+    (2, 2), (1.5, 1.5), (2, 1.5), (1.5, 1.5),
+    (2, 2), (1.5, 2), (2, 1.5), (1.5, 1.5),
+    (2, 1.5), (1.5, 2), (2, 2),
+    (1.5, 2), (2, 1.5),
+    (2, 1.5), (1.5, 2)
+])
+EXTREME_PROBABILITY = 0.1
+
+# descriptor 구간별 배율 (전체 형태, 중간 특징, 세부 특징, 미세 특징)
+DESCRIPTOR_SCALES = np.repeat([1.1, 0.9, 0.8, 0.95], DESCRIPTOR_DIM // 4)
+
+
+def category_counts(num_samples):
+    """카테고리별 샘플 수 (TS와 같이 비율 × 샘플 수의 내림)
+
+    내림으로 남는 샘플은 random 카테고리에 더해 전체 샘플 수를 맞춥니다.
+    """
+    counts = np.array([int(num_samples * spec['fraction']) for spec in CATEGORY_SPECS.values()])
+    counts[CATEGORIES.index('random')] += num_samples - counts.sum()
+    return counts
+
+
+def hsl_to_rgb_bytes(hue, saturation, lightness):
+    """TS hslToHex와 같은 HSL → RGB 바이트 변환 (배열 단위)
+
+    hue가 [0, 360) 밖이면(음수 나머지) TS와 같이 색상 성분 없이 m만 남습니다.
+    반올림은 JS Math.round(0.5 올림)와 같습니다.
+    """
+    c = (1 - np.abs(2 * lightness - 1)) * saturation
+    x = c * (1 - np.abs(np.fmod(hue / 60, 2) - 1))
+    m = lightness - c / 2
+    sector = np.where((hue >= 0) & (hue < 360), np.floor(hue / 60), -1)
+
+    zero = np.zeros_like(c)
+    rgb = np.zeros(hue.shape + (3,))
+    for index, components in enumerate([(c, x, zero), (x, c, zero), (zero, c, x),
+                                        (zero, x, c), (x, zero, c), (c, zero, x)]):
+        mask = sector == index
+        for channel, value in enumerate(components):
+            rgb[..., channel][mask] = value[mask]
+
+    return np.clip(np.floor((rgb + m[..., None]) * 255 + 0.5), 0, 255).astype(np.uint8)
+
+
+def generate_palettes(codes, rng):
+    """카테고리 코드별 팔레트 RGB 바이트 (N, 5, 3)와 색상 특성 (N, 5)"""
+    n = len(codes)
+    color_index = np.arange(NUM_COLORS)
+    rgb = np.empty((n, NUM_COLORS, 3), dtype=np.uint8)
+    characteristics = np.empty((n, len(CHARACTERISTIC_NAMES)), dtype=np.float32)
+
+    for code, spec in enumerate(CATEGORY_SPECS.values()):
+        rows = np.flatnonzero(codes == code)
+        if len(rows) == 0:
+            continue
+        k = len(rows)
+        base = spec['base'][0] + rng.random((k, 1)) * spec['base'][1]
+        jitter = spec['jitter'][0] + rng.random((k, NUM_COLORS)) * spec['jitter'][1]
+        hue = np.fmod(base + color_index * spec['step'] + jitter, 360)
+        saturation = spec['saturation'][0] + rng.random((k, NUM_COLORS)) * spec['saturation'][1]
+        light_lo, light_width = np.array(spec['lightness']).T
+        lightness = light_lo + rng.random((k, NUM_COLORS)) * light_width
+        rgb[rows] = hsl_to_rgb_bytes(hue, saturation, lightness)
+
+        trait_lo, trait_width = np.array(spec['characteristics']).T
+        characteristics[rows] = trait_lo + rng.random((k, len(trait_lo))) * trait_width
+
+    return rgb, characteristics
+
+
+def generate_face_features(n, rng):
+    """(N, 148) 입력 벡터: descriptor 128 + 물리적 특징 15 + 시드 5"""
+    X = np.empty((n, INPUT_DIM), dtype=np.float32)
+
+    # 128차원 descriptor: N(0, 0.15)를 ±0.35로 자르고 구간별 배율 적용 후 다시 자름
+    descriptor = np.clip(rng.normal(0, 0.15, (n, DESCRIPTOR_DIM)), -0.35, 0.35)
+    descriptor = np.clip(descriptor * DESCRIPTOR_SCALES, -0.35, 0.35)
+    X[:, :DESCRIPTOR_DIM] = descriptor
+
+    # 15차원 물리적 특징: 10%는 극값(0 또는 1), 나머지는 u^(1/a) / (u^(1/a) + v^(1/b))
+    alpha, beta = PHYSICAL_FEATURE_SHAPES.T
+    gamma1 = rng.random((n, PHYSICAL_DIM)) ** (1 / alpha)
+    gamma2 = rng.random((n, PHYSICAL_DIM)) ** (1 / beta)
+    physical = gamma1 / (gamma1 + gamma2)
+    extreme = rng.random((n, PHYSICAL_DIM)) < EXTREME_PROBABILITY
+    physical[extreme] = (rng.random(int(extreme.sum())) >= 0.5).astype(np.float64)
+    X[:, DESCRIPTOR_DIM:DESCRIPTOR_DIM + PHYSICAL_DIM] = physical
+
+    # 5차원 시드: |d[k] + d[k + 5]| % 1 (TS generateConsistentSeed)
+    X[:, DESCRIPTOR_DIM + PHYSICAL_DIM:] = np.fmod(
+        np.abs(descriptor[:, :SEED_DIM] + descriptor[:, SEED_DIM:2 * SEED_DIM]), 1
+    )
+    return X
+
+
+def generate_chunk(codes, rng):
+    """카테고리 코드 배열에 대한 X, y, 색상 특성, 압축 색상 생성"""
+    rgb, characteristics = generate_palettes(codes, rng)
+    X = generate_face_features(len(codes), rng)
+    y = rgb.reshape(len(codes), -1).astype(np.float32) / 255.0
+    packed = rgb.astype(np.uint32)
+    colors = (packed[..., 0] << 16) | (packed[..., 1] << 8) | packed[..., 2]
+    return X, y, characteristics, colors
+
+
+def generate_diverse_face_color_dataset(num_samples, output_dir, seed=0, chunk_size=262144,
+                                        shuffle=True):
+    """num_samples개 데이터를 output_dir에 바이너리 데이터셋으로 기록
+
+    청크 k는 SeedSequence([seed, k])로 만든 난수 생성기를 사용하므로 같은 seed와
+    chunk_size에서 항상 같은 데이터가 생성됩니다. shuffle=False이면 TS 생성기와
+    같이 카테고리 순서대로 블록을 배치하고, True이면 카테고리 배치를 섞어
+    청크 단위 스트리밍 학습에서도 배치마다 카테고리가 고르게 섞이도록 합니다.
+    """
+    codes = np.repeat(np.arange(len(CATEGORIES), dtype=np.uint8), category_counts(num_samples))
+    if shuffle:
+        codes = np.random.default_rng(np.random.SeedSequence([seed, 2**32 - 1])).permutation(codes)
+
+    output_dir = os.path.normpath(output_dir)
+    tmp_dir = f"{output_dir}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    def allocate(name, shape, dtype):
+        return np.lib.format.open_memmap(
+            os.path.join(tmp_dir, f"{name}.npy"), mode='w+', dtype=dtype, shape=shape
+        )
+
+    arrays = {
+        'X': allocate('X', (num_samples, INPUT_DIM), np.float32),
+        'y': allocate('y', (num_samples, NUM_COLORS * 3), np.float32),
+        'category_codes': allocate('category_codes', (num_samples,), np.uint8),
+        'characteristics': allocate('characteristics', (num_samples, len(CHARACTERISTIC_NAMES)), np.float32),
+        'colors': allocate('colors', (num_samples, NUM_COLORS), np.uint32)
+    }
+
+    for chunk_index, start in enumerate(range(0, num_samples, chunk_size)):
+        stop = min(start + chunk_size, num_samples)
+        rng = np.random.default_rng(np.random.SeedSequence([seed, chunk_index]))
+        X, y, characteristics, colors = generate_chunk(codes[start:stop], rng)
+        arrays['X'][start:stop] = X
+        arrays['y'][start:stop] = y
+        arrays['category_codes'][start:stop] = codes[start:stop]
+        arrays['characteristics'][start:stop] = characteristics
+        arrays['colors'][start:stop] = colors
+
+    for array in arrays.values():
+        array.flush()
+    del arrays
+
+    with open(os.path.join(tmp_dir, 'info.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'format_version': CACHE_FORMAT_VERSION,
+            'source': 'generate_diverse_data.py',
+            'arrays': ['X', 'y', 'category_codes', 'characteristics', 'colors'],
+            'categories': CATEGORIES,
+            'characteristic_names': CHARACTERISTIC_NAMES,
+            'num_samples': int(num_samples),
+            'seed': int(seed),
+            'chunk_size': int(chunk_size),
+            'shuffled': bool(shuffle)
+        }, f, ensure_ascii=False, indent=2)
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+    return output_dir
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    default_output = os.path.normpath(
+        os.path.join(script_dir, "..", "public", "data", "diverse-face-color", "generated")
+    )
+
+    parser = argparse.ArgumentParser(description="다양한 얼굴-색상 학습 데이터 생성 (NumPy 벡터화)")
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--output', default=default_output, help="바이너리 데이터셋 디렉토리")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=262144)
+    parser.add_argument('--ordered', action='store_true',
+                        help="TS 생성기와 같이 카테고리 순서대로 배치 (기본: 섞음)")
+    args = parser.parse_args()
+
+    print(f"🎨 {args.samples:,}개의 다양한 얼굴-색상 데이터 생성 시작...")
+    start = time.perf_counter()
+    output_dir = generate_diverse_face_color_dataset(
+        args.samples, args.output, args.seed, args.chunk_size, shuffle=not args.ordered
+    )
+    elapsed = time.perf_counter() - start
+
+    print("📈 색상 카테고리 분포:")
+    for category, count in zip(CATEGORIES, category_counts(args.samples)):
+        print(f"  {category}: {count:,}개 ({count / max(args.samples, 1) * 100:.1f}%)")
+    size_mb = sum(
+        os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir)
+    ) / 2**20
+    print(f"💾 바이너리 데이터셋 저장 완료: {output_dir} ({size_mb:,.0f}MB)")
+    print(f"⏱️ {elapsed:.1f}초 ({args.samples / max(elapsed, 1e-9):,.0f} 샘플/초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+추론 그래프 최적화
+BatchNormalization과 StandardScaler를 인접한 Dense 가중치에 접어 넣고
+Dropout을 제거해, 수치적으로 동등한 Dense 전용 모델을 만듭니다.
+"""
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+keras = lazy_import('keras')
+
+
+def _batch_norm_affine(layer):
+    """추론 시 BatchNormalization을 원소별 affine(y = a * x + c)으로 변환"""
+    params = dict(zip([w.name.split('/')[-1] for w in layer.weights], layer.get_weights()))
+    units = params['moving_mean'].shape[0]
+    gamma = params.get('gamma', np.ones(units)).astype(np.float64)
+    beta = params.get('beta', np.zeros(units)).astype(np.float64)
+    mean = params['moving_mean'].astype(np.float64)
+    variance = params['moving_variance'].astype(np.float64)
+
+    a = gamma / np.sqrt(variance + layer.epsilon)
+    c = beta - mean * a
+    return a, c
+
+
+def fold_inference_graph(model, scaler=None):
+    """Sequential 모델을 Dense 레이어만 남긴 동등한 추론 모델로 변환
+
+    - scaler(StandardScaler 호환: mean_, scale_)는 첫 Dense에 접어 넣어
+      클라이언트가 입력을 정규화할 필요가 없게 합니다.
+    - Dense(활성화) 뒤의 BatchNormalization은 활성화 이후의 원소별 affine이므로
+      다음 Dense의 커널 행과 편향에 접어 넣습니다: W' = diag(a) W, b' = b + c W
+    - Dropout은 추론 시 항등 연산이므로 제거합니다.
+    """
+    # 다음 Dense 입력에 적용될 대기 중인 affine (a, c)
+    pending = None
+    if scaler is not None:
+        scale = np.asarray(scaler.scale_, dtype=np.float64)
+        mean = np.asarray(scaler.mean_, dtype=np.float64)
+        pending = (1.0 / scale, -mean / scale)
+
+    dense_specs = []
+    for layer in model.layers:
+        if isinstance(layer, keras.layers.Dropout):
+            continue
+        elif isinstance(layer, keras.layers.BatchNormalization):
+            a, c = _batch_norm_affine(layer)
+            if pending is not None:
+                # 연속된 affine은 하나로 합성
+                a, c = pending[0] * a, pending[1] * a + c
+            pending = (a, c)
+        elif isinstance(layer, keras.layers.Dense):
+            weights = layer.get_weights()
+            kernel = weights[0].astype(np.float64)
+            bias = (weights[1].astype(np.float64) if layer.use_bias
+                    else np.zeros(kernel.shape[1]))
+            if pending is not None:
+                a, c = pending
+                bias = bias + c @ kernel
+                kernel = a[:, None] * kernel
+                pending = None
+            dense_specs.append((kernel, bias, keras.activations.serialize(layer.activation)))
+        else:
+            raise ValueError(f"지원하지 않는 레이어입니다: {layer.__class__.__name__}")
+
+    if pending is not None:
+        # 마지막 BatchNormalization은 선형 Dense 뒤에 있을 때만 뒤쪽으로 접을 수 있음
+        kernel, bias, activation = dense_specs[-1]
+        if activation != 'linear':
+            raise ValueError("출력 직전 BatchNormalization은 선형 Dense 뒤에서만 접을 수 있습니다.")
+        a, c = pending
+        dense_specs[-1] = (kernel * a[None, :], bias * a + c, activation)
+
+    input_dim = dense_specs[0][0].shape[0]
+    folded = keras.Sequential(
+        [keras.Input(shape=(input_dim,))] +
+        [keras.layers.Dense(kernel.shape[1], activation=activation)
+         for kernel, _, activation in dense_specs]
+    )
+    folded.set_weights([
+        array.astype(np.float32)
+        for kernel, bias, _ in dense_specs
+        for array in (kernel, bias)
+    ])
+    return folded
+
+
+def verify_folded_model(model, folded, reference_inputs=None, scaler=None, atol=1e-4):
+    """원본(+정규화)과 최적화 모델의 출력을 비교해 최대 절대 오차 반환
+
+    reference_inputs는 정규화 전 원본 입력(보통 학습에서 남긴 검증 행)입니다.
+    주어지지 않으면 입력 분포(정규화 통계)에 맞는 임의 입력을 생성합니다.
+    """
+    source = '검증 입력'
+    if reference_inputs is None:
+        source = '임의 입력'
+        rng = np.random.default_rng(0)
+        input_dim = folded.input_shape[-1]
+        reference_inputs = rng.standard_normal((256, input_dim)).astype(np.float32)
+        if scaler is not None:
+            reference_inputs = (reference_inputs * scaler.scale_ + scaler.mean_).astype(np.float32)
+
+    reference_inputs = np.asarray(reference_inputs, dtype=np.float32)
+    scaled_inputs = reference_inputs
+    if scaler is not None:
+        scaled_inputs = ((reference_inputs - scaler.mean_) / scaler.scale_).astype(np.float32)
+
+    expected = model.predict(scaled_inputs, batch_size=1024, verbose=0)
+    actual = folded.predict(reference_inputs, batch_size=1024, verbose=0)
+    max_error = float(np.max(np.abs(expected - actual)))
+
+    print(f"   🔍 최적화 모델 검증 ({source} {len(reference_inputs)}개): "
+          f"최대 출력 오차 {max_error:.2e} (허용 {atol:.0e})")
+    if max_error > atol:
+        raise ValueError(f"최적화 모델의 출력 오차({max_error:.2e})가 허용 범위를 넘었습니다.")
+    return max_error
@@ -0,0 +1,478 @@
+"""
+얼굴-색상 모델 하이퍼파라미터 탐색 (Successive Halving / Hyperband)
+레이어 너비, 드롭아웃, 학습률, 배치 크기, 손실 가중치 조합을 프로세스 풀에서
+동시에 학습하고, 짧은 에포크 예산에서 성능이 낮은 조합을 먼저 중단한 뒤
+남은 조합만 이어서(가중치·옵티마이저 상태 유지) 더 긴 예산으로 학습합니다.
+
+데이터는 부모 프로세스에서 한 번만 바이너리 캐시(.npcache)로 변환하고, 워커는
+같은 .npy 파일을 메모리 매핑해 운영체제 페이지 캐시를 공유합니다. 모든 조합은
+손실 함수와 관계없이 같은 검증 샘플의 색상 MSE로 비교하며, 시도마다 학습 시간과
+내보낸 TensorFlow.js 모델 크기(BatchNormalization·Dropout 접기 후)를 함께 기록합니다.
+
+사용법:
+    python hyperparameter_search.py --trials 27 --min-epochs 2 --max-epochs 18
+    python hyperparameter_search.py --hyperband --max-epochs 27 --workers 4
+    python hyperparameter_search.py --target diverse --max-samples 200000
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lazy_imports import lazy_import
+import diversity_losses
+from dataset_cache import load_face_color_arrays, cache_dir_for
+from streaming_data import split_mask, fit_streaming_scaler, make_streaming_dataset, gather_rows
+from color_evaluation import evaluate_color_model
+from graph_optimizer import fold_inference_graph
+from tfjs_export import write_tfjs_model
+
+tf = lazy_import('tensorflow')
+keras = lazy_import('tensorflow.keras')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "public", "data", "diverse-face-color", "training-data.json")
+)
+SEARCH_CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache", "search")
+DEFAULT_OUTPUT = 'search_results.json'
+
+# 시도 간 비교 기준 (손실 함수가 달라도 같은 의미를 갖는 검증 색상 MSE)
+RANK_METRIC = 'mse'
+
+# 현재 학습 스크립트의 설정 (train_face_to_color.py / train_diverse_face_to_color.py)
+# dropout은 첫 은닉층 비율이며 이후 층마다 0.1씩 줄어듭니다 (0.4, 0.3, 0.2, 0.1)
+BASELINE_CONFIGS = {
+    'face': {
+        'widths': [256, 128, 64, 32], 'dropout': 0.4, 'learning_rate': 0.0008, 'batch_size': 32,
+        'loss': 'improved', 'extreme_weight': 0.5, 'diversity_weight': 0.15, 'contrast_weight': 0.1,
+        'standardize': False
+    },
+    'diverse': {
+        'widths': [256, 128, 64, 32], 'dropout': 0.4, 'learning_rate': 0.001, 'batch_size': 64,
+        'loss': 'mse', 'standardize': True
+    }
+}
+
+# 탐색 공간 (대상 모델의 손실이 'improved'일 때만 손실 가중치를 탐색)
+SEARCH_SPACE = {
+    'widths': [
+        [256, 128, 64, 32], [256, 128, 64], [192, 96, 48, 24], [128, 64, 32, 16],
+        [128, 64, 32], [96, 48, 24], [64, 32, 16], [64, 32]
+    ],
+    'dropout': [0.0, 0.1, 0.2, 0.3, 0.4],
+    'learning_rate': [0.0003, 0.0005, 0.0008, 0.001, 0.002, 0.003],
+    'batch_size': [32, 64, 128, 256],
+    'diversity_weight': [0.0, 0.05, 0.1, 0.15, 0.25],
+    'contrast_weight': [0.0, 0.05, 0.1, 0.2]
+}
+LOSS_WEIGHT_KEYS = ('diversity_weight', 'contrast_weight')
+
+# 워커 프로세스별로 한 번만 여는 데이터 (메모리 매핑 배열과 분할 마스크)
+_WORKER_DATA = {}
+
+
+def sample_configs(target, num_trials, rng, include_baseline=True):
+    """탐색 공간에서 서로 다른 설정 num_trials개를 무작위로 추출
+
+    include_baseline=True이면 첫 번째 설정은 현재 학습 스크립트의 설정입니다.
+    """
+    baseline = BASELINE_CONFIGS[target]
+    keys = [key for key in SEARCH_SPACE
+            if key not in LOSS_WEIGHT_KEYS or baseline['loss'] == 'improved']
+    configs = [dict(baseline)] if include_baseline else []
+    seen = {json.dumps(config, sort_keys=True) for config in configs}
+
+    max_attempts = num_trials * 100
+    while len(configs) < num_trials and max_attempts > 0:
+        max_attempts -= 1
+        config = dict(baseline)
+        for key in keys:
+            choices = SEARCH_SPACE[key]
+            config[key] = choices[rng.integers(len(choices))]
+        signature = json.dumps(config, sort_keys=True)
+        if signature not in seen:
+            seen.add(signature)
+            configs.append(config)
+    return configs
+
+
+def layer_dropouts(config):
+    """은닉층별 드롭아웃 비율 (첫 층 config['dropout']에서 층마다 0.1씩 감소)"""
+    return [round(max(config['dropout'] - 0.1 * i, 0.0), 2) for i in range(len(config['widths']))]
+
+
+def build_search_model(config, input_dim=148, output_dim=15):
+    """설정에 맞는 얼굴-색상 모델 생성 및 컴파일
+
+    기본 설정은 create_enhanced_diverse_model과 같은 구조입니다: 마지막 은닉층을
+    제외한 Dense 뒤에 BatchNormalization, 모든 은닉층 뒤에 Dropout.
+    """
+    layers = [keras.Input(shape=(input_dim,))]
+    widths = config['widths']
+    for i, (width, rate) in enumerate(zip(widths, layer_dropouts(config))):
+        layers.append(keras.layers.Dense(width, activation='relu'))
+        if i < len(widths) - 1:
+            layers.append(keras.layers.BatchNormalization())
+        if rate > 0:
+            layers.append(keras.layers.Dropout(rate))
+    layers.append(keras.layers.Dense(output_dim, activation='sigmoid'))
+    model = keras.Sequential(layers)
+
+    if config['loss'] == 'improved':
+        loss = diversity_losses.create_improved_diversity_loss(
+            extreme_weight=config['extreme_weight'],
+            diversity_weight=config['diversity_weight'],
+            contrast_weight=config['contrast_weight']
+        )
+    else:
+        loss = 'mse'
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=config['learning_rate']),
+        loss=loss,
+        metrics=['mae']
+    )
+    return model
+
+
+def _save_trial_state(path, model):
+    """가중치와 옵티마이저 변수(Adam 모멘트, 반복 횟수)를 npz로 저장"""
+    arrays = {f"w{i}": weight for i, weight in enumerate(model.get_weights())}
+    arrays.update({
+        f"o{i}": np.asarray(variable.numpy())
+        for i, variable in enumerate(model.optimizer.variables)
+    })
+    np.savez(path, **arrays)
+
+
+def _load_trial_state(path, model):
+    """_save_trial_state로 저장한 상태를 같은 설정의 모델에 복원"""
+    state = np.load(path)
+    model.set_weights([state[f"w{i}"] for i in range(len(model.get_weights()))])
+    model.optimizer.build(model.trainable_variables)
+    for i, variable in enumerate(model.optimizer.variables):
+        variable.assign(state[f"o{i}"])
+
+
+def exported_model_bytes(model, scaler=None):
+    """추론 그래프를 접은 TensorFlow.js 모델(model.json + 가중치 샤드)의 바이트 수"""
+    folded = fold_inference_graph(model, scaler)
+    export_dir = tempfile.mkdtemp(prefix='search-export-')
+    try:
+        write_tfjs_model(folded, export_dir)
+        return sum(
+            os.path.getsize(os.path.join(export_dir, name)) for name in os.listdir(export_dir)
+        )
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def _init_search_worker(threads_per_worker, dataset_dir, max_samples, eval_samples, scaler_stats):
+    """워커 프로세스의 스레드 수를 제한하고 공유 데이터셋을 한 번만 메모리 매핑"""
+    for name in ['OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS']:
+        os.environ[name] = str(threads_per_worker)
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    tf.get_logger().setLevel('ERROR')
+
+    X, y, _ = load_face_color_arrays(dataset_dir)
+    if max_samples:
+        X, y = X[:max_samples], y[:max_samples]
+    val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+
+    scaler = None
+    if scaler_stats is not None:
+        from streaming_data import StreamingStandardScaler
+        scaler = StreamingStandardScaler.from_stats(*scaler_stats)
+
+    X_eval = gather_rows(X, val_mask, limit=eval_samples)
+    _WORKER_DATA.update({
+        'X': X, 'y': y, 'val_mask': val_mask, 'scaler': scaler,
+        'X_eval': scaler.transform(X_eval) if scaler is not None else X_eval,
+        'y_eval': gather_rows(y, val_mask, limit=eval_samples)
+    })
+
+
+def _run_trial(trial_id, config, epochs_done, epochs_target, state_path, seed):
+    """워커에서 시도 하나를 epochs_done → epochs_target 에포크까지 학습하고 평가"""
+    data = _WORKER_DATA
+    scaler = data['scaler'] if config['standardize'] else None
+    if epochs_done == 0:
+        keras.utils.set_random_seed(seed + trial_id)
+    model = build_search_model(config, data['X'].shape[1], data['y'].shape[1])
+    if epochs_done > 0:
+        _load_trial_state(state_path, model)
+
+    train_data = make_streaming_dataset(
+        data['X'], data['y'], ~data['val_mask'], batch_size=config['batch_size'],
+        shuffle=True, scaler=scaler, seed=seed + trial_id * 1000 + epochs_done
+    )
+    start_time = time.perf_counter()
+    history = model.fit(train_data, initial_epoch=epochs_done, epochs=epochs_target, verbose=0)
+    train_seconds = time.perf_counter() - start_time
+    _save_trial_state(state_path, model)
+
+    results = evaluate_color_model(model, data['X_eval'], data['y_eval'])
+    return {
+        'epochs': epochs_target,
+        'train_seconds': train_seconds,
+        'train_loss': float(history.history['loss'][-1]),
+        'mse': results['mse'],
+        'mae': results['mae'],
+        'extreme_accuracy': results['extreme_accuracy'],
+        'diversity_score': results['diversity_score'],
+        'params': int(model.count_params()),
+        'export_bytes': exported_model_bytes(model, scaler)
+    }
+
+
+def rung_epochs(min_epochs, max_epochs, eta=3):
+    """Successive Halving 단계별 누적 에포크 (min_epochs × eta^i, 마지막은 max_epochs)"""
+    epochs = [min_epochs]
+    while epochs[-1] < max_epochs:
+        epochs.append(min(epochs[-1] * eta, max_epochs))
+    return epochs
+
+
+def hyperband_brackets(min_epochs, max_epochs, eta=3):
+    """Hyperband 브래킷 목록 [(시도 수, 첫 단계 에포크), ...]
+
+    공격적으로 중단하는 브래킷(많은 시도, 짧은 첫 예산)부터 중단 없이 max_epochs까지
+    학습하는 브래킷까지, 브래킷마다 전체 에포크 예산이 비슷하도록 나눕니다.
+    """
+    s_max = int(math.floor(math.log(max_epochs / min_epochs, eta) + 1e-9))
+    return [
+        (int(math.ceil((s_max + 1) / (s + 1) * eta ** s)),
+         max(min_epochs, int(round(max_epochs / eta ** s))))
+        for s in range(s_max, -1, -1)
+    ]
+
+
+def successive_halving(executor, trials, min_epochs, max_epochs, eta, state_dir, seed):
+    """trials를 단계별로 학습하며 상위 1/eta만 다음 단계로 승급
+
+    reference=True인 시도(현재 설정)는 비교 기준이므로 순위와 관계없이 끝까지 학습하며
+    승급 자리를 차지하지 않습니다.
+    """
+    alive = list(trials)
+    budgets = rung_epochs(min_epochs, max_epochs, eta)
+    for rung, epochs_target in enumerate(budgets):
+        print(f"\n🪜 단계 {rung + 1}/{len(budgets)}: 시도 {len(alive)}개 × {epochs_target} 에포크")
+        futures = {
+            trial['trial']: executor.submit(
+                _run_trial, trial['trial'], trial['config'], trial['epochs'], epochs_target,
+                os.path.join(state_dir, f"trial-{trial['trial']:03d}.npz"), seed
+            )
+            for trial in alive
+        }
+        for trial in alive:
+            result = futures[trial['trial']].result()
+            trial['rungs'].append(result)
+            trial['epochs'] = result['epochs']
+            trial['train_seconds'] += result['train_seconds']
+            trial.update({key: result[key] for key in (
+                RANK_METRIC, 'mae', 'extreme_accuracy', 'diversity_score', 'params', 'export_bytes'
+            )})
+            print(f"   #{trial['trial']:03d} {_describe(trial['config'])}: "
+                  f"MSE {result['mse']:.5f}, {result['train_seconds']:.1f}초"
+                  f"{' (현재 설정)' if trial['reference'] else ''}")
+
+        if rung == len(budgets) - 1:
+            for trial in alive:
+                trial['status'] = 'completed'
+            break
+
+        candidates = sorted(
+            (trial for trial in alive if not trial['reference']), key=lambda t: t[RANK_METRIC]
+        )
+        keep = max(1, len(candidates) // eta)
+        for trial in candidates[keep:]:
+            trial['status'] = 'pruned'
+        alive = [trial for trial in alive if trial['reference']] + candidates[:keep]
+    return trials
+
+
+def _describe(config):
+    widths = '-'.join(str(width) for width in config['widths'])
+    description = (f"{widths} drop {config['dropout']} lr {config['learning_rate']} "
+                   f"batch {config['batch_size']}")
+    if config['loss'] == 'improved':
+        description += f" w {config['diversity_weight']}/{config['contrast_weight']}"
+    return description
+
+
+def _new_trial(trial_id, config, bracket, reference=False):
+    return {
+        'trial': trial_id, 'bracket': bracket, 'config': config, 'reference': reference,
+        'status': 'running', 'epochs': 0, 'train_seconds': 0.0, 'rungs': []
+    }
+
+
+def recommend(trials, tolerance=0.02):
+    """현재 설정의 MSE × (1 + tolerance) 이내인 완료 시도 중 내보낸 모델이 가장 작은 시도"""
+    completed = [trial for trial in trials if trial['status'] == 'completed']
+    reference = next((trial for trial in completed if trial['reference']), None)
+    if reference is None:
+        return None, None
+    limit = reference[RANK_METRIC] * (1 + tolerance)
+    eligible = [trial for trial in completed if trial[RANK_METRIC] <= limit]
+    best = min(eligible, key=lambda t: (t['export_bytes'], t['train_seconds'], t[RANK_METRIC]))
+    return reference, best
+
+
+def print_search_report(trials, max_epochs, tolerance=0.02, top=10):
+    """완료된 시도 순위, 탐색 비용, 추천 설정 출력"""
+    completed = sorted(
+        (trial for trial in trials if trial['status'] == 'completed'), key=lambda t: t[RANK_METRIC]
+    )
+    print(f"\n🏆 완료된 시도 ({len(completed)}개, {max_epochs} 에포크, 검증 MSE 순):")
+    for trial in completed[:top]:
+        print(f"   #{trial['trial']:03d} MSE {trial['mse']:.5f} | 극값 {trial['extreme_accuracy']:.3f} | "
+              f"다양성 {trial['diversity_score']:.1f}% | {trial['export_bytes'] / 1024:,.0f}KB | "
+              f"{trial['train_seconds']:.0f}초 | {_describe(trial['config'])}"
+              f"{' (현재 설정)' if trial['reference'] else ''}")
+
+    spent = sum(trial['train_seconds'] for trial in trials)
+    full = sum(
+        trial['train_seconds'] / max(trial['epochs'], 1) * max_epochs for trial in trials
+    )
+    print(f"\n⏱️ 탐색 비용: 학습 {spent:.0f}초 (모든 시도를 {max_epochs} 에포크까지 학습 시 약 {full:.0f}초, "
+          f"{(1 - spent / max(full, 1e-9)) * 100:.0f}% 절약)")
+
+    reference, best = recommend(trials, tolerance)
+    if best is not None:
+        print(f"\n💡 현재 설정 MSE {reference['mse']:.5f}의 {tolerance * 100:.0f}% 이내에서 가장 작은 모델: "
+              f"#{best['trial']:03d} {_describe(best['config'])}")
+        print(f"   크기 {reference['export_bytes'] / 1024:,.0f}KB → {best['export_bytes'] / 1024:,.0f}KB, "
+              f"에포크당 학습 {reference['train_seconds'] / reference['epochs']:.1f}초 → "
+              f"{best['train_seconds'] / best['epochs']:.1f}초")
+    return best
+
+
+def run_search(data_path=DEFAULT_DATA_PATH, target='face', num_trials=27, min_epochs=2,
+               max_epochs=18, eta=3, hyperband=False, max_workers=None, threads_per_worker=None,
+               max_samples=None, eval_samples=20000, seed=0, tolerance=0.02,
+               output=DEFAULT_OUTPUT, state_dir=SEARCH_CACHE_DIR):
+    """하이퍼파라미터 탐색 실행 후 모든 시도 기록을 output(JSON)에 저장
+
+    hyperband=False이면 num_trials개 설정으로 Successive Halving 한 번,
+    True이면 hyperband_brackets의 브래킷마다 새 설정을 뽑아 차례로 실행합니다.
+    현재 설정은 첫 브래킷에 포함되어 끝까지 학습되는 비교 기준이 됩니다.
+    """
+    print(f"🔎 하이퍼파라미터 탐색 ({target}): {'Hyperband' if hyperband else 'Successive Halving'}, "
+          f"eta={eta}, 에포크 {min_epochs}~{max_epochs}")
+
+    # 데이터는 부모에서 한 번만 캐시로 변환하고 워커는 같은 파일을 메모리 매핑
+    X, y, _ = load_face_color_arrays(data_path)
+    dataset_dir = data_path if os.path.isdir(data_path) else cache_dir_for(data_path)
+    if max_samples:
+        X, y = X[:max_samples], y[:max_samples]
+    val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+    print(f"   훈련 데이터: {int(np.count_nonzero(~val_mask))}개, "
+          f"평가 샘플: {min(eval_samples, int(np.count_nonzero(val_mask)))}개")
+
+    scaler_stats = None
+    if BASELINE_CONFIGS[target]['standardize']:
+        scaler = fit_streaming_scaler(X, ~val_mask)
+        scaler_stats = (scaler.mean_, scaler.scale_, scaler.n_samples_seen_)
+
+    rng = np.random.default_rng(seed)
+    if hyperband:
+        brackets = hyperband_brackets(min_epochs, max_epochs, eta)
+    else:
+        brackets = [(num_trials, min_epochs)]
+    print(f"   브래킷 (시도 수, 첫 단계 에포크): {brackets}")
+
+    cpu_count = os.cpu_count() or 1
+    max_workers = max_workers or min(brackets[0][0], cpu_count)
+    threads_per_worker = threads_per_worker or max(1, cpu_count // max_workers)
+    print(f"⚡ 병렬 탐색: 워커 {max_workers}개 × 스레드 {threads_per_worker}개")
+
+    if os.path.exists(state_dir):
+        shutil.rmtree(state_dir)
+    os.makedirs(state_dir)
+
+    trials = []
+    total_start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_search_worker,
+        initargs=(threads_per_worker, dataset_dir, max_samples, eval_samples, scaler_stats)
+    ) as executor:
+        for bracket, (bracket_trials, bracket_epochs) in enumerate(brackets):
+            configs = sample_configs(target, bracket_trials, rng, include_baseline=bracket == 0)
+            bracket_list = [
+                _new_trial(len(trials) + i, config, bracket, reference=bracket == 0 and i == 0)
+                for i, config in enumerate(configs)
+            ]
+            trials.extend(bracket_list)
+            if hyperband:
+                print(f"\n🧺 브래킷 {bracket + 1}/{len(brackets)}: 시도 {len(bracket_list)}개")
+            successive_halving(executor, bracket_list, bracket_epochs, max_epochs, eta, state_dir, seed)
+
+    elapsed = time.perf_counter() - total_start
+    best = print_search_report(trials, max_epochs, tolerance)
+    print(f"   전체 경과 시간: {elapsed:.0f}초, 시도 상태: {state_dir}")
+
+    report = {
+        'target': target,
+        'settings': {
+            'data_path': data_path, 'num_samples': len(X), 'eval_samples': eval_samples,
+            'min_epochs': min_epochs, 'max_epochs': max_epochs, 'eta': eta,
+            'hyperband': hyperband, 'brackets': brackets, 'seed': seed,
+            'workers': max_workers, 'threads_per_worker': threads_per_worker,
+            'rank_metric': RANK_METRIC, 'tolerance': tolerance
+        },
+        'elapsed_seconds': elapsed,
+        'recommended_trial': best['trial'] if best is not None else None,
+        'trials': trials
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📝 탐색 결과 저장: {output}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="얼굴-색상 모델 하이퍼파라미터 탐색 (Successive Halving / Hyperband)")
+    parser.add_argument('--target', choices=list(BASELINE_CONFIGS), default='face',
+                        help="기준 설정과 손실 함수 (face: 다양성 손실, diverse: MSE + 정규화)")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="학습 데이터 JSON 또는 generate_diverse_data.py로 만든 바이너리 데이터셋 디렉토리")
+    parser.add_argument('--trials', type=int, default=27, help="Successive Halving 시도 수")
+    parser.add_argument('--min-epochs', type=int, default=2, help="첫 단계 에포크 예산")
+    parser.add_argument('--max-epochs', type=int, default=18, help="마지막 단계 에포크 예산")
+    parser.add_argument('--eta', type=int, default=3, help="단계마다 남기는 비율의 역수")
+    parser.add_argument('--hyperband', action='store_true', help="여러 브래킷으로 Hyperband 실행")
+    parser.add_argument('--workers', type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--threads-per-worker', type=int, default=None)
+    parser.add_argument('--max-samples', type=int, default=None, help="앞에서부터 사용할 최대 샘플 수")
+    parser.add_argument('--eval-samples', type=int, default=20000, help="시도 비교에 쓰는 검증 샘플 수")
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="추천 기준: 현재 설정 MSE 대비 허용 비율")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="탐색 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    run_search(
+        data_path=args.data, target=args.target, num_trials=args.trials,
+        min_epochs=args.min_epochs, max_epochs=args.max_epochs, eta=args.eta,
+        hyperband=args.hyperband, max_workers=args.workers,
+        threads_per_worker=args.threads_per_worker, max_samples=args.max_samples,
+        eval_samples=args.eval_samples, seed=args.seed, tolerance=args.tolerance,
+        output=args.output
+    )
+
+
+if __name__ == "__main__":
+    main()
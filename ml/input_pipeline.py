@@ -0,0 +1,130 @@
+"""
+tf.data 기반 인메모리 입력 파이프라인
+X, y는 한 번만 텐서로 올리고 훈련/검증은 인덱스로만 나눕니다. 인덱스를
+제한된 버퍼로 섞어 배치로 묶은 뒤, 병렬 map 안에서 행 수집(gather),
+노이즈 증강, 정규화를 배치 단위로 수행하고 prefetch(AUTOTUNE)로 학습과 겹칩니다.
+RAM보다 큰 데이터셋은 streaming_data.make_streaming_dataset을 사용합니다.
+"""
+
+import time
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+keras = lazy_import('tensorflow.keras')
+
+DEFAULT_SHUFFLE_BUFFER = 10000
+
+
+def index_split(num_samples, validation_split=0.2):
+    """Keras validation_split과 같은 기준(마지막 비율)의 훈련/검증 인덱스"""
+    split = int(num_samples * (1 - validation_split))
+    return np.arange(split), np.arange(split, num_samples)
+
+
+def kfold_splits(num_samples, k=5, group_size=1, seed=42):
+    """k-fold 교차 검증용 [(훈련 인덱스, 검증 인덱스), ...] 목록
+
+    연속된 group_size개 행(원본 + 즉시 증강본)은 같은 폴드에 배정해 같은
+    팔레트의 증강본이 훈련과 검증에 나뉘어 들어가지 않게 합니다.
+    k는 2 이상, 그룹(팔레트) 수 이하여야 모든 폴드에 검증 행이 생깁니다.
+    """
+    num_groups = -(-num_samples // group_size)
+    if not 2 <= k <= num_groups:
+        raise ValueError(f"폴드 수는 2 이상, 팔레트 그룹 수({num_groups}) 이하여야 합니다: {k}")
+    fold_of_group = np.empty(num_groups, dtype=np.int64)
+    fold_of_group[np.random.default_rng(seed).permutation(num_groups)] = np.arange(num_groups) % k
+    fold = fold_of_group[np.arange(num_samples) // group_size]
+    return [(np.flatnonzero(fold != i), np.flatnonzero(fold == i)) for i in range(k)]
+
+
+def _to_tensors(arrays):
+    """배열 또는 배열 목록(다중 출력)을 텐서(목록은 튜플)로 변환"""
+    if isinstance(arrays, (list, tuple)):
+        return tuple(tf.constant(np.asarray(array)) for array in arrays)
+    return tf.constant(np.asarray(arrays))
+
+
+def _gather(tensors, rows):
+    if isinstance(tensors, tuple):
+        return tuple(tf.gather(tensor, rows) for tensor in tensors)
+    return tf.gather(tensors, rows)
+
+
+def make_array_dataset(X, y, indices, batch_size=32, shuffle=True,
+                       shuffle_buffer=DEFAULT_SHUFFLE_BUFFER, scaler=None, sample_weight=None,
+                       copies=1, noise_factor=0.0, seed=None):
+    """X, y에서 indices 행만 배치로 반환하는 tf.data 데이터셋
+
+    y와 sample_weight는 배열 또는 배열 목록(다중 출력 모델)입니다. 같은 X, y로
+    만든 훈련/검증 데이터셋은 인덱스만 다르므로 분할 시 데이터를 복사하지 않습니다.
+    copies > 1이면 한 에포크에 각 행이 copies번(원본 1 + 증강 copies - 1) 나오며,
+    증강본에는 매번 새로운 가우시안 노이즈(표준편차 noise_factor)를 더해 [0, 1]로
+    자릅니다 (palette_augmentation.iter_augmented_batches와 같은 규칙).
+    scaler가 있으면 map 안에서 (x - mean_) / scale_로 정규화합니다.
+    """
+    X_tensor = tf.constant(np.asarray(X, dtype=np.float32))
+    y_tensors = _to_tensors(y)
+    w_tensors = None if sample_weight is None else _to_tensors(sample_weight)
+    if scaler is not None:
+        mean = tf.constant(np.asarray(scaler.mean_, dtype=np.float32))
+        scale = tf.constant(np.asarray(scaler.scale_, dtype=np.float32))
+
+    # 가상 인덱스 v: 원본 행은 v // copies, v % copies != 0 이면 증강본
+    indices = np.asarray(indices, dtype=np.int64)
+    virtual = (indices[:, None] * copies + np.arange(copies, dtype=np.int64)).ravel()
+
+    dataset = tf.data.Dataset.from_tensor_slices(virtual)
+    if shuffle:
+        dataset = dataset.shuffle(
+            max(1, min(shuffle_buffer, len(virtual))), seed=seed, reshuffle_each_iteration=True
+        )
+    dataset = dataset.batch(batch_size)
+
+    def load_batch(virtual_batch):
+        rows = virtual_batch // copies
+        x = tf.gather(X_tensor, rows)
+        if copies > 1 and noise_factor > 0:
+            augmented = tf.not_equal(virtual_batch % copies, 0)[:, None]
+            noisy = tf.clip_by_value(x + tf.random.normal(tf.shape(x), stddev=noise_factor), 0.0, 1.0)
+            x = tf.where(augmented, noisy, x)
+        if scaler is not None:
+            x = (x - mean) / scale
+        if w_tensors is None:
+            return x, _gather(y_tensors, rows)
+        return x, _gather(y_tensors, rows), _gather(w_tensors, rows)
+
+    dataset = dataset.map(load_batch, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def throughput_callback(samples_per_epoch, label):
+    """에포크별 학습 처리량(샘플/초)을 기록하고 학습 종료 시 출력하는 콜백
+
+    첫 에포크는 그래프 트레이싱이 포함되므로 평균에서 제외합니다.
+    에포크 시간에는 검증 시간도 포함됩니다.
+    """
+
+    class ThroughputCallback(keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.samples_per_second = []
+            self._epoch_start = None
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._epoch_start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            seconds = time.perf_counter() - self._epoch_start
+            self.samples_per_second.append(samples_per_epoch / max(seconds, 1e-9))
+
+        def on_train_end(self, logs=None):
+            if not self.samples_per_second:
+                return
+            steady = self.samples_per_second[1:] or self.samples_per_second
+            print(f"\n⚡ 학습 처리량 ({label}): 평균 {np.mean(steady):,.0f} 샘플/초, "
+                  f"최고 {max(steady):,.0f} 샘플/초 (첫 에포크 제외)")
+
+    return ThroughputCallback()
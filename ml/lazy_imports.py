@@ -0,0 +1,42 @@
+"""
+무거운 모듈의 지연 임포트
+TensorFlow / Keras / scikit-learn은 임포트에만 수 초가 걸리므로, 모듈 속성에
+처음 접근할 때 실제로 임포트해 데이터 분석·내보내기 명령이 빠르게 시작되도록 합니다.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """첫 속성 접근 시 name 모듈을 임포트하는 대리 객체
+
+    'tensorflow.keras'처럼 하위 모듈이 아닌 속성으로만 노출되는 경로도
+    상위 모듈에서 getattr로 찾아 해석합니다.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ModuleNotFoundError:
+                parent, _, attr = self._name.rpartition('.')
+                if not parent:
+                    raise
+                self._module = getattr(importlib.import_module(parent), attr)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """지연 임포트 대리 객체 생성 (예: tf = lazy_import('tensorflow'))"""
+    return LazyModule(name)
@@ -0,0 +1,249 @@
+"""
+NumPy 전용 TensorFlow.js 모델 추론 엔진
+public/models/* 의 model.json과 가중치 파일을 TensorFlow 없이 읽어
+Dense / BatchNormalization / Dropout / Activation 레이어로 배치 추론합니다.
+
+사용법:
+    python numpy_runtime.py ../public/models/diverse-face-to-color --batch-size 1024
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from tfjs_export import read_weight_shards
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    # 큰 음수에서 overflow가 나지 않도록 안정적인 형태 사용
+    out = np.empty_like(x)
+    positive = x >= 0
+    out[positive] = 1.0 / (1.0 + np.exp(-x[positive]))
+    exp_x = np.exp(x[~positive])
+    out[~positive] = exp_x / (1.0 + exp_x)
+    return out
+
+
+def _softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': _relu,
+    'sigmoid': _sigmoid,
+    'softmax': _softmax,
+    'tanh': np.tanh
+}
+
+
+def _activation_name(activation):
+    """Keras 2/3 형식의 activation 설정을 이름으로 변환"""
+    if isinstance(activation, dict):
+        activation = activation.get('config', {}).get('name', activation.get('class_name'))
+    activation = activation or 'linear'
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"지원하지 않는 활성화 함수입니다: {activation}")
+    return activation
+
+
+class NumpyLayer:
+    """model.json의 레이어 하나를 NumPy 연산으로 실행"""
+
+    def __init__(self, layer_config, weights):
+        self.class_name = layer_config['class_name']
+        config = layer_config.get('config', {})
+        self.name = config.get('name', layer_config.get('name'))
+
+        if self.class_name == 'Dense':
+            self.kernel = weights[f"{self.name}/kernel"]
+            self.bias = weights.get(f"{self.name}/bias")
+            self.activation = _activation_name(config.get('activation'))
+        elif self.class_name == 'BatchNormalization':
+            # 추론 시 affine 변환으로 미리 계산: y = x * a + c
+            mean = weights[f"{self.name}/moving_mean"]
+            variance = weights[f"{self.name}/moving_variance"]
+            gamma = weights.get(f"{self.name}/gamma", np.ones_like(mean))
+            beta = weights.get(f"{self.name}/beta", np.zeros_like(mean))
+            self.a = (gamma / np.sqrt(variance + config.get('epsilon', 1e-3))).astype(np.float32)
+            self.c = (beta - mean * self.a).astype(np.float32)
+        elif self.class_name == 'Activation':
+            self.activation = _activation_name(config.get('activation'))
+        elif self.class_name not in ('InputLayer', 'Dropout'):
+            raise ValueError(f"지원하지 않는 레이어입니다: {self.class_name}")
+
+    def __call__(self, x):
+        if self.class_name == 'Dense':
+            out = x @ self.kernel
+            if self.bias is not None:
+                out += self.bias
+            return ACTIVATIONS[self.activation](out)
+        if self.class_name == 'BatchNormalization':
+            return x * self.a + self.c
+        if self.class_name == 'Activation':
+            return ACTIVATIONS[self.activation](x.copy())
+        # InputLayer, Dropout: 추론 시 항등 연산
+        return x
+
+
+class NumpyModel:
+    """TensorFlow.js Layers 모델(Sequential 또는 Functional)의 NumPy 추론기"""
+
+    def __init__(self, model_json, weights):
+        topology = model_json['modelTopology']
+        topology = topology.get('model_config', topology)
+        config = topology['config']
+        layer_configs = config['layers'] if isinstance(config, dict) else config
+
+        self.layers = [NumpyLayer(layer, weights) for layer in layer_configs]
+        self.is_functional = topology['class_name'] in ('Functional', 'Model')
+        self.layer_timings = {}
+
+        if self.is_functional:
+            # 레이어는 위상 정렬 순서로 저장되어 있으므로 입력 이름만 기록
+            self.inbound = {}
+            for layer, layer_config in zip(self.layers, layer_configs):
+                nodes = layer_config.get('inbound_nodes') or []
+                if nodes and isinstance(nodes[0], dict):
+                    names = [arg['config']['keras_history'][0] for arg in nodes[0]['args']]
+                else:
+                    names = [inbound[0] for inbound in nodes[0]] if nodes else []
+                self.inbound[layer.name] = names
+            outputs = config['output_layers']
+            self.output_names = [outputs[0]] if isinstance(outputs[0], str) \
+                else [output[0] for output in outputs]
+
+    @classmethod
+    def load(cls, model_dir):
+        """model_dir의 model.json과 가중치 파일 로드"""
+        with open(os.path.join(model_dir, 'model.json'), 'r', encoding='utf-8') as f:
+            model_json = json.load(f)
+        weights = read_weight_shards(model_dir, model_json['weightsManifest'])
+        weights = {name: np.ascontiguousarray(value, dtype=np.float32)
+                   for name, value in weights.items()}
+        return cls(model_json, weights)
+
+    def _forward(self, x, timings=None):
+        def run(layer, value):
+            if timings is None:
+                return layer(value)
+            start = time.perf_counter()
+            out = layer(value)
+            timings[layer.name] = timings.get(layer.name, 0.0) + time.perf_counter() - start
+            return out
+
+        if not self.is_functional:
+            for layer in self.layers:
+                x = run(layer, x)
+            return x
+
+        values = {}
+        for layer in self.layers:
+            names = self.inbound[layer.name]
+            value = x if not names else values[names[0]]
+            values[layer.name] = run(layer, value)
+        outputs = [values[name] for name in self.output_names]
+        return outputs[0] if len(outputs) == 1 else outputs
+
+    def predict(self, X, batch_size=None, verbose=0):
+        """배치 추론 (batch_size가 없으면 한 번에 계산)
+
+        Keras model.predict와 같은 형식으로 호출할 수 있도록 verbose를 받지만 무시합니다.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if batch_size is None or batch_size >= len(X):
+            return self._forward(X)
+
+        results = [self._forward(X[i:i + batch_size]) for i in range(0, len(X), batch_size)]
+        if isinstance(results[0], list):
+            return [np.concatenate(parts) for parts in zip(*results)]
+        return np.concatenate(results)
+
+    def profile(self, X, batch_size=None, repeats=10):
+        """레이어별 평균 실행 시간(초)과 전체 처리량 측정"""
+        X = np.asarray(X, dtype=np.float32)
+        batch_size = batch_size or len(X)
+        timings = {}
+
+        self.predict(X[:batch_size])  # 워밍업
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for i in range(0, len(X), batch_size):
+                self._forward(X[i:i + batch_size], timings)
+        elapsed = time.perf_counter() - start
+
+        self.layer_timings = {name: seconds / repeats for name, seconds in timings.items()}
+        return {
+            'layer_seconds': self.layer_timings,
+            'total_seconds': elapsed / repeats,
+            'samples_per_second': len(X) * repeats / elapsed
+        }
+
+
+# 내보낸 모델과 Keras 모델의 허용 출력 오차 (양자화 내보내기는 가중치 복원 오차만큼 넓힘)
+EXPORT_PARITY_ATOL = {None: 1e-4, 'float16': 1e-2, 'uint16': 1e-2, 'uint8': 5e-2}
+
+
+def verify_export_parity(model, model_dir, reference_inputs=None, quantization=None, atol=None):
+    """Keras 모델과 내보낸 model.json의 NumPy 추론 결과를 비교해 최대 오차 반환
+
+    reference_inputs는 내보낸 모델에 그대로 넣는 입력이며, 주어지지 않으면 표준정규 분포의
+    임의 입력을 생성합니다. atol을 지정하지 않으면 quantization에 맞는 EXPORT_PARITY_ATOL을 사용합니다.
+    """
+    if atol is None:
+        atol = EXPORT_PARITY_ATOL[quantization]
+    if reference_inputs is None:
+        input_dim = model.input_shape[-1]
+        reference_inputs = np.random.default_rng(0).standard_normal((256, input_dim))
+    reference_inputs = np.asarray(reference_inputs, dtype=np.float32)
+    exported = NumpyModel.load(model_dir)
+    expected = model.predict(reference_inputs, batch_size=1024, verbose=0)
+    actual = exported.predict(reference_inputs, batch_size=1024)
+    if isinstance(expected, dict):
+        expected = [expected[name] for name in exported.output_names]
+    if not isinstance(expected, list):
+        expected, actual = [expected], [actual]
+
+    max_error = max(float(np.max(np.abs(e - a))) for e, a in zip(expected, actual))
+    print(f"   🔍 NumPy 추론 검증: 최대 출력 오차 {max_error:.2e} (허용 {atol:.0e})")
+    if max_error > atol:
+        raise ValueError(f"내보낸 모델의 출력 오차({max_error:.2e})가 허용 범위를 넘었습니다.")
+    return max_error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy 전용 TensorFlow.js 모델 추론 벤치마크")
+    parser.add_argument('model_dir', help="model.json이 있는 디렉토리")
+    parser.add_argument('--samples', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    model = NumpyModel.load(args.model_dir)
+    print(f"📦 모델 로드: {args.model_dir} ({time.perf_counter() - load_start:.3f}초)")
+
+    input_dim = next(layer.kernel.shape[0] for layer in model.layers if layer.class_name == 'Dense')
+    X = np.random.default_rng(0).random((args.samples, input_dim), dtype=np.float32)
+    result = model.profile(X, batch_size=args.batch_size, repeats=args.repeats)
+
+    print(f"⏱️ 레이어별 시간 ({args.samples}개 샘플, 배치 {args.batch_size}):")
+    for name, seconds in result['layer_seconds'].items():
+        share = seconds / result['total_seconds'] * 100
+        print(f"   {name}: {seconds * 1000:.3f}ms ({share:.1f}%)")
+    print(f"   전체: {result['total_seconds'] * 1000:.3f}ms, "
+          f"{result['samples_per_second']:.0f} 샘플/초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+색상 팔레트 배치 증강 엔진
+지표 데이터셋 전체에 대한 노이즈를 한 번의 NumPy 연산으로 생성합니다.
+"""
+
+import numpy as np
+
+PALETTE_DIM = 15  # 5개 색상 × RGB
+
+
+def hex_palettes_to_array(palettes):
+    """16진수 팔레트 목록을 (N, 15) float32 배열로 일괄 변환"""
+    if len(palettes) == 0:
+        return np.empty((0, PALETTE_DIM), dtype=np.float32)
+
+    # '#RRGGBB' 문자열을 모두 이어 붙인 뒤 한 번에 바이트로 해석
+    joined = ''.join(color.lstrip('#') for palette in palettes for color in palette)
+    rgb = np.frombuffer(bytes.fromhex(joined), dtype=np.uint8)
+
+    return (rgb.reshape(len(palettes), -1).astype(np.float32) / 255.0)
+
+
+def augment_palettes_batch(X, augmentation_count=5, noise_factor=0.05, rng=None):
+    """팔레트 배열 전체에 대해 증강 복사본을 한 번에 생성
+
+    반환 배열은 원본 뒤에 증강본이 이어지는 샘플 단위 순서
+    (원본, 증강 1, ..., 증강 k, 다음 원본, ...)를 유지합니다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    X = np.asarray(X, dtype=np.float32)
+
+    # (N, 1 + k, D) 버퍼를 한 번만 할당하고 노이즈를 제자리에서 더함
+    out = np.empty((X.shape[0], augmentation_count + 1, X.shape[1]), dtype=np.float32)
+    out[:] = X[:, None, :]
+    noise = rng.standard_normal(size=out[:, 1:].shape, dtype=np.float32)
+    noise *= noise_factor
+    out[:, 1:] += noise
+    np.clip(out[:, 1:], 0, 1, out=out[:, 1:])
+
+    return out.reshape(-1, X.shape[1])
+
+
+def repeat_labels(y, augmentation_count=5):
+    """augment_palettes_batch 순서에 맞게 라벨 반복"""
+    return np.repeat(np.asarray(y), augmentation_count + 1)
+
+
+def augmented_steps_per_epoch(num_samples, augmentation_count=5, batch_size=32):
+    """지연 증강 생성기의 에포크당 스텝 수"""
+    total = num_samples * (augmentation_count + 1)
+    return max(1, -(-total // batch_size))
+
+
+def iter_augmented_batches(X, y, augmentation_count=5, batch_size=32,
+                           noise_factor=0.05, shuffle=True, rng=None):
+    """매 에포크 새로운 노이즈를 뽑는 지연(lazy) 증강 배치 생성기
+
+    한 에포크는 즉시 증강과 같은 N × (1 + k)개 샘플(원본 1 + 증강 k)로
+    구성되지만, 증강본을 저장하지 않고 배치마다 노이즈를 생성하므로
+    메모리 사용량은 원본 크기에 비례합니다. model.fit에는
+    steps_per_epoch=augmented_steps_per_epoch(...)와 함께 전달합니다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    copies = augmentation_count + 1
+    total = len(X) * copies
+
+    while True:
+        # 가상 인덱스: v // copies = 원본 샘플, v % copies != 0 이면 증강본
+        order = rng.permutation(total) if shuffle else np.arange(total)
+        for start in range(0, total, batch_size):
+            virtual = order[start:start + batch_size]
+            idx = virtual // copies
+            batch = X[idx]
+            noise = rng.standard_normal(size=batch.shape, dtype=np.float32)
+            noise *= noise_factor
+            noise[virtual % copies == 0] = 0
+            batch += noise
+            np.clip(batch, 0, 1, out=batch)
+            yield batch, y[idx]
@@ -0,0 +1,360 @@
+"""
+MBTI 학습 팔레트 최근접 이웃 인덱스 (IVF)
+train_model.py가 학습에 사용하는 지표별 팔레트(15차원 정규화 RGB)와 라벨로
+k-means 역색인(IVF) 인덱스를 만들어 "비슷한 팔레트" 조회와 예측 설명에 사용합니다.
+팔레트는 원래 '#RRGGBB' 값이므로 uint8 코드로 손실 없이 저장하고(팔레트당 15바이트),
+같은 클러스터의 팔레트를 연속으로 배치해 질의 시 가까운 nprobe개 클러스터만 탐색합니다.
+인덱스는 JSON 헤더와 배열 구간으로 이루어진 단일 바이너리 파일로 내보냅니다.
+
+사용법:
+    python palette_index.py                     # 지표 학습 데이터로 인덱스 생성 → public/models/mbti-palette-index
+    python palette_index.py --query "#ff0000" "#00ff00" "#0000ff" "#ffffff" "#000000" --k 5
+    python benchmark.py --stages palette_index --scales 10000 100000 1000000  # brute force 대비 지연 시간
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+PALETTE_DIM = 15
+MAGIC = b'MBTIPIDX'
+FORMAT_VERSION = 1
+ALIGNMENT = 16
+INDEX_MODEL_NAME = 'mbti-palette-index'
+INDEX_FILE_NAME = 'palette_index.bin'
+
+
+def default_index_dir():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.normpath(os.path.join(script_dir, "..", "public", "models", INDEX_MODEL_NAME))
+
+
+def squared_distances(queries, vectors, vector_norms=None):
+    """(Q, D) × (M, D) 제곱 L2 거리 행렬 (||q||² - 2 q·v + ||v||², 0 미만은 0으로)"""
+    if vector_norms is None:
+        vector_norms = np.einsum('ij,ij->i', vectors, vectors)
+    query_norms = np.einsum('ij,ij->i', queries, queries)
+    distances = query_norms[:, None] - 2 * (queries @ vectors.T) + vector_norms[None, :]
+    return np.maximum(distances, 0, out=distances)
+
+
+def _top_k(distances, positions, k):
+    """행별로 거리가 가장 작은 k개 (정렬되지 않음)"""
+    if distances.shape[1] <= k:
+        return distances, positions
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(distances, top, axis=1), np.take_along_axis(positions, top, axis=1)
+
+
+def _sort_rows(distances, positions):
+    order = np.argsort(distances, axis=1, kind='stable')
+    return np.take_along_axis(distances, order, axis=1), np.take_along_axis(positions, order, axis=1)
+
+
+def brute_force_knn(vectors, queries, k=10, chunk_size=65536):
+    """정확한 k-NN 기준 구현: vectors 전체를 chunk_size 행씩 비교해 (거리, 행 번호) 반환"""
+    queries = np.asarray(queries, dtype=np.float32).reshape(-1, vectors.shape[1])
+    best_d = np.full((len(queries), k), np.inf, dtype=np.float32)
+    best_i = np.full((len(queries), k), -1, dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        distances = squared_distances(queries, chunk)
+        positions = np.broadcast_to(np.arange(start, start + len(chunk)), distances.shape)
+        best_d, best_i = _top_k(
+            np.concatenate([best_d, distances], axis=1), np.concatenate([best_i, positions], axis=1), k
+        )
+    return _sort_rows(best_d, best_i)
+
+
+def fit_kmeans(vectors, num_clusters, iterations=20, max_points_per_centroid=64, seed=0,
+               chunk_size=65536):
+    """Lloyd k-means로 클러스터 중심 (num_clusters, D) 학습
+
+    중심당 최대 max_points_per_centroid개의 표본으로 학습하고(대규모 데이터에서도
+    학습 시간이 클러스터 수에만 비례), 빈 클러스터는 임의 표본으로 다시 시작합니다.
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), num_clusters * max_points_per_centroid)
+    sample_rows = np.sort(rng.choice(len(vectors), sample_size, replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), num_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = assign_clusters(sample, centroids, chunk_size)
+        counts = np.bincount(assignment, minlength=num_clusters)
+        sums = np.zeros_like(centroids, dtype=np.float64)
+        np.add.at(sums, assignment, sample)
+        empty = counts == 0
+        centroids[~empty] = (sums[~empty] / counts[~empty, None]).astype(np.float32)
+        if empty.any():
+            centroids[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+    return centroids
+
+
+def assign_clusters(vectors, centroids, chunk_size=65536):
+    """각 벡터에 가장 가까운 중심 번호"""
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        assignment[start:start + len(chunk)] = np.argmin(
+            squared_distances(chunk, centroids, centroid_norms), axis=1
+        )
+    return assignment
+
+
+def default_num_lists(num_vectors):
+    """역색인 클러스터 수: √N (최소 1)"""
+    return max(1, min(num_vectors, int(round(np.sqrt(num_vectors)))))
+
+
+class PaletteIndex:
+    """uint8 팔레트 코드의 IVF(역색인) k-NN 인덱스
+
+    codes, label_codes, ids는 클러스터 순서로 정렬되어 있고, list_offsets[c]:list_offsets[c + 1]
+    구간이 클러스터 c의 팔레트입니다. ids는 원래 행 번호(지표 순서로 이어 붙인 학습 데이터 기준)입니다.
+    """
+
+    def __init__(self, centroids, list_offsets, codes, label_codes, ids, classes, sources=None):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.label_codes = np.asarray(label_codes, dtype=np.uint8)
+        self.ids = np.asarray(ids, dtype=np.uint32)
+        self.classes = list(classes)
+        self.sources = sources or []
+        self._vectors = None
+        self._norms = None
+        self._positions = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def num_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, codes, label_codes, classes, num_lists=None, iterations=20, seed=0, sources=None):
+        """uint8 팔레트 코드 (N, 15)와 라벨 코드로 인덱스 생성"""
+        codes = np.asarray(codes, dtype=np.uint8)
+        vectors = codes.astype(np.float32) / 255.0
+        num_lists = num_lists or default_num_lists(len(codes))
+        centroids = fit_kmeans(vectors, num_lists, iterations=iterations, seed=seed)
+        assignment = assign_clusters(vectors, centroids)
+
+        order = np.argsort(assignment, kind='stable')
+        list_offsets = np.zeros(num_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=num_lists), out=list_offsets[1:])
+        index = cls(centroids, list_offsets, codes[order], np.asarray(label_codes)[order],
+                    order.astype(np.uint32), classes, sources)
+        index._vectors = vectors[order]
+        return index
+
+    @property
+    def vectors(self):
+        """클러스터 순서의 정규화 RGB 벡터 (처음 사용할 때 코드에서 한 번 복원)"""
+        if self._vectors is None:
+            self._vectors = self.codes.astype(np.float32) / 255.0
+        if self._norms is None:
+            self._norms = np.einsum('ij,ij->i', self._vectors, self._vectors)
+        return self._vectors
+
+    def _position_of(self, ids):
+        if self._positions is None:
+            self._positions = np.empty(len(self.ids), dtype=np.int64)
+            self._positions[self.ids] = np.arange(len(self.ids))
+        return self._positions[ids]
+
+    def search(self, queries, k=10, nprobe=8):
+        """배치 k-NN: (Q, 15) 질의마다 가까운 nprobe개 클러스터에서 k개를 찾아
+        (제곱 L2 거리 (Q, k), 원래 행 번호 (Q, k)) 반환. 후보가 k개보다 적으면 -1로 채움
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, PALETTE_DIM)
+        num_queries = len(queries)
+        nprobe = min(nprobe, self.num_lists)
+        vectors = self.vectors
+
+        centroid_distances = squared_distances(queries, self.centroids)
+        if nprobe < self.num_lists:
+            probes = np.argpartition(centroid_distances, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.broadcast_to(np.arange(self.num_lists), (num_queries, self.num_lists))
+
+        # (질의, 클러스터) 쌍을 클러스터별로 묶어 같은 클러스터를 탐색하는 질의를 한 번에 비교
+        pair_queries = np.repeat(np.arange(num_queries), nprobe)
+        pair_lists = probes.ravel()
+        order = np.argsort(pair_lists, kind='stable')
+        pair_queries, pair_lists = pair_queries[order], pair_lists[order]
+        bounds = np.flatnonzero(np.diff(pair_lists)) + 1
+
+        best_d = np.full((num_queries, k), np.inf, dtype=np.float32)
+        best_p = np.full((num_queries, k), -1, dtype=np.int64)
+        for rows, cluster in zip(np.split(pair_queries, bounds), pair_lists[np.r_[0, bounds]]):
+            start, end = self.list_offsets[cluster], self.list_offsets[cluster + 1]
+            if start == end:
+                continue
+            distances = squared_distances(queries[rows], vectors[start:end], self._norms[start:end])
+            positions = np.broadcast_to(np.arange(start, end), distances.shape)
+            best_d[rows], best_p[rows] = _top_k(
+                np.concatenate([best_d[rows], distances], axis=1),
+                np.concatenate([best_p[rows], positions], axis=1), k
+            )
+
+        best_d, best_p = _sort_rows(best_d, best_p)
+        ids = np.where(best_p >= 0, self.ids[np.maximum(best_p, 0)].astype(np.int64), -1)
+        return best_d, ids
+
+    def search_hex(self, palettes, k=10, nprobe=8):
+        """'#RRGGBB' 5색 팔레트 목록으로 검색해 질의별 [{'id', 'distance', 'label', 'palette'}, ...] 반환"""
+        from palette_augmentation import hex_palettes_to_array
+
+        distances, ids = self.search(hex_palettes_to_array(palettes), k=k, nprobe=nprobe)
+        return [
+            [{'id': int(i), 'distance': float(d), 'label': label, 'palette': palette}
+             for i, d, label, palette in zip(row_ids, row_d, self.labels_of(row_ids), self.palettes_of(row_ids))
+             if i >= 0]
+            for row_ids, row_d in zip(ids, distances)
+        ]
+
+    def labels_of(self, ids):
+        """원래 행 번호의 라벨 문자열"""
+        ids = np.asarray(ids)
+        return [self.classes[code] if i >= 0 else None
+                for i, code in zip(ids.tolist(), self.label_codes[self._position_of(np.maximum(ids, 0))].tolist())]
+
+    def palettes_of(self, ids):
+        """원래 행 번호의 '#RRGGBB' 5색 팔레트"""
+        ids = np.asarray(ids)
+        codes = self.codes[self._position_of(np.maximum(ids, 0))].reshape(len(ids), 5, 3)
+        return [[f"#{r:02x}{g:02x}{b:02x}" for r, g, b in row] if i >= 0 else None
+                for i, row in zip(ids.tolist(), codes.tolist())]
+
+    def save(self, path):
+        """단일 바이너리 파일로 저장: MAGIC + uint32 헤더 길이 + JSON 헤더 + 16바이트 정렬 배열 구간"""
+        arrays = {
+            'centroids': self.centroids.astype('<f4'),
+            'list_offsets': self.list_offsets.astype('<u4'),
+            'codes': self.codes,
+            'label_codes': self.label_codes,
+            'ids': self.ids.astype('<u4')
+        }
+        header = {
+            'format_version': FORMAT_VERSION,
+            'dim': PALETTE_DIM,
+            'count': len(self),
+            'num_lists': self.num_lists,
+            'classes': self.classes,
+            'sources': self.sources,
+            'distance': 'squared_l2',
+            'arrays': []
+        }
+        offset = 0
+        for name, array in arrays.items():
+            header['arrays'].append({
+                'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset
+            })
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        data_start = -(-(len(MAGIC) + 4 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(np.uint32(len(header_bytes)).astype('<u4').tobytes())
+            f.write(header_bytes)
+            f.write(b'\0' * (data_start - f.tell()))
+            for array in arrays.values():
+                f.write(array.tobytes())
+                f.write(b'\0' * (-array.nbytes % ALIGNMENT))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """save로 기록한 파일을 메모리 매핑으로 로드"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"팔레트 인덱스 파일이 아닙니다: {path}")
+            header_length = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+            header = json.loads(f.read(header_length).decode('utf-8'))
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 팔레트 인덱스 형식입니다: {header.get('format_version')}")
+
+        data_start = -(-(len(MAGIC) + 4 + header_length) // ALIGNMENT) * ALIGNMENT
+        arrays = {
+            spec['name']: np.memmap(path, dtype=np.dtype(spec['dtype']), mode='r',
+                                    offset=data_start + spec['offset'], shape=tuple(spec['shape']))
+            for spec in header['arrays']
+        }
+        return cls(arrays['centroids'], arrays['list_offsets'], arrays['codes'],
+                   arrays['label_codes'], arrays['ids'], header['classes'], header.get('sources'))
+
+
+def palettes_from_datasets(datasets):
+    """load_training_data() 결과에서 (uint8 코드 (N, 15), 라벨 코드, 라벨 목록, 지표별 구간) 추출
+
+    바이너리 캐시 형태({'X', 'labels'})와 JSON 목록 형태를 모두 받습니다.
+    행 번호는 지표 순서대로 이어 붙인 순서이며 sources에 지표별 시작 행과 개수를 기록합니다.
+    """
+    from palette_augmentation import hex_palettes_to_array
+
+    blocks, labels, sources = [], [], []
+    for indicator, data in datasets.items():
+        if isinstance(data, dict):
+            X, y = np.asarray(data['X'], dtype=np.float32), np.asarray(data['labels'])
+        else:
+            X = hex_palettes_to_array([item['palette'] for item in data])
+            y = np.array([item['label'] for item in data])
+        sources.append({'indicator': indicator, 'start': sum(len(b) for b in blocks), 'count': len(X)})
+        blocks.append(np.clip(np.rint(X * 255), 0, 255).astype(np.uint8))
+        labels.append(y)
+
+    classes, label_codes = np.unique(np.concatenate(labels), return_inverse=True)
+    return np.concatenate(blocks), label_codes.astype(np.uint8), classes.tolist(), sources
+
+
+def build_palette_index(datasets, num_lists=None, model_dir=None):
+    """지표 학습 팔레트로 인덱스를 만들어 model_dir(기본: public/models/mbti-palette-index)에 저장"""
+    codes, label_codes, classes, sources = palettes_from_datasets(datasets)
+    print(f"🔎 팔레트 인덱스 생성: 팔레트 {len(codes):,}개, 라벨 {classes}")
+
+    start_time = time.perf_counter()
+    index = PaletteIndex.build(codes, label_codes, classes, num_lists=num_lists, sources=sources)
+    build_seconds = time.perf_counter() - start_time
+
+    model_dir = model_dir or default_index_dir()
+    os.makedirs(model_dir, exist_ok=True)
+    path = index.save(os.path.join(model_dir, INDEX_FILE_NAME))
+    sizes = np.diff(index.list_offsets)
+    print(f"   클러스터 {index.num_lists}개 (평균 {sizes.mean():.0f}개, 최대 {sizes.max()}개), "
+          f"생성 {build_seconds:.2f}초")
+    print(f"   💾 {path} ({os.path.getsize(path):,}B)")
+    return index, path
+
+
+def main(argv=None):
+    from train_model import load_training_data
+
+    parser = argparse.ArgumentParser(description="MBTI 학습 팔레트 최근접 이웃 인덱스 생성·조회")
+    parser.add_argument('--model-dir', default=default_index_dir())
+    parser.add_argument('--num-lists', type=int, default=None, help="역색인 클러스터 수 (기본: √N)")
+    parser.add_argument('--query', nargs=5, metavar='HEX', help="인덱스를 만들지 않고 이 팔레트로 조회")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nprobe', type=int, default=8, help="질의마다 탐색할 클러스터 수")
+    args = parser.parse_args(argv)
+
+    if args.query:
+        index = PaletteIndex.load(os.path.join(args.model_dir, INDEX_FILE_NAME))
+        print(f"🔎 비슷한 팔레트 (상위 {args.k}개, nprobe={args.nprobe}):")
+        for match in index.search_hex([args.query], k=args.k, nprobe=args.nprobe)[0]:
+            print(f"   #{match['id']:<8} {match['label']}  {' '.join(match['palette'])}  "
+                  f"거리 {match['distance']:.4f}")
+        return
+
+    build_palette_index(load_training_data(), num_lists=args.num_lists, model_dir=args.model_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""
+단계별 캐시 학습 파이프라인
+load → preprocess → train → evaluate → export 단계마다 입력 데이터, 설정,
+상위 단계, 소스 코드의 내용 해시로 키를 만들고 결과를 ml/.cache/pipeline에
+저장합니다. 다시 실행하면 바뀐 단계와 그 하위 단계만 실행합니다.
+
+사용법:
+    python pipeline.py diverse                       # 변경된 단계만 실행
+    python pipeline.py diverse --quantization uint8  # 내보내기 단계만 다시 실행
+    python pipeline.py indicators --force train      # 지정 단계부터 강제 재실행
+    python pipeline.py indicators --parallel         # 지표별 모델 병렬 학습
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+
+from dataset_cache import file_content_hash
+from lazy_imports import lazy_import
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+PIPELINE_CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache", "pipeline")
+# 단계별로 보관할 최근 결과 수 (설정을 되돌렸을 때 재사용)
+KEEP_ENTRIES_PER_STAGE = 3
+
+keras = lazy_import('tensorflow.keras')
+
+
+class PipelineStage:
+    """파이프라인 단계 하나
+
+    run(upstream_output, config)은 상위 단계 결과를 받아 이 단계의 결과를 반환합니다.
+    store=False인 단계(바이너리 캐시로 이미 빠른 데이터 로드)는 결과를 저장하지 않고
+    하위 단계가 실행될 때만 다시 계산합니다. outputs가 있는 단계(내보내기)는 결과
+    대신 완료 표시만 저장하며, 출력 경로가 사라지면 다시 실행합니다.
+    """
+
+    def __init__(self, name, run, config=None, sources=(), inputs=(), store=True, outputs=()):
+        self.name = name
+        self.run = run
+        self.config = config or {}
+        self.sources = list(sources)
+        self.inputs = list(inputs)
+        self.store = store
+        self.outputs = list(outputs)
+
+
+class CachedHistory:
+    """캐시에서 복원한 keras History 대체 객체 (history 속성만 보관)"""
+
+    def __init__(self, history):
+        self.history = history
+
+
+def _stage_key(stage, upstream_key):
+    """설정, 상위 단계 키, 소스 파일, 입력 데이터 파일의 내용 해시로 단계 키 계산"""
+    fingerprint = {
+        'stage': stage.name,
+        'config': stage.config,
+        'upstream': upstream_key,
+        'sources': {
+            name: file_content_hash(os.path.join(SCRIPT_DIR, name)) for name in stage.sources
+        },
+        'inputs': {
+            os.path.relpath(path, PROJECT_DIR): file_content_hash(path) for path in stage.inputs
+        }
+    }
+    payload = json.dumps(fingerprint, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _pack_models(value, model_paths):
+    """결과 안의 Keras 모델과 History를 피클 가능한 참조로 치환"""
+    if hasattr(value, 'get_weights') and hasattr(value, 'to_json'):
+        model_paths.append(value)
+        return ('__keras_model__', len(model_paths) - 1)
+    if hasattr(value, 'history') and hasattr(value, 'model'):
+        return CachedHistory(value.history)
+    if isinstance(value, dict):
+        return {key: _pack_models(item, model_paths) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_pack_models(item, model_paths) for item in value)
+    return value
+
+
+def _unpack_models(value, entry_dir):
+    if isinstance(value, tuple) and len(value) == 2 and value[0] == '__keras_model__':
+        # 커스텀 손실 함수는 추론·내보내기에 필요 없으므로 컴파일하지 않고 로드
+        return keras.models.load_model(
+            os.path.join(entry_dir, f"model_{value[1]}.keras"), compile=False
+        )
+    if isinstance(value, dict):
+        return {key: _unpack_models(item, entry_dir) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unpack_models(item, entry_dir) for item in value)
+    return value
+
+
+def _save_entry(entry_dir, stage, output, elapsed):
+    """임시 디렉토리에 결과를 기록한 뒤 원자적으로 교체"""
+    tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    if not stage.outputs:
+        models = []
+        packed = _pack_models(output, models)
+        for i, model in enumerate(models):
+            model.save(os.path.join(tmp_dir, f"model_{i}.keras"))
+        with open(os.path.join(tmp_dir, 'output.pkl'), 'wb') as f:
+            pickle.dump(packed, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    with open(os.path.join(tmp_dir, 'done.json'), 'w', encoding='utf-8') as f:
+        json.dump({'stage': stage.name, 'config': stage.config, 'elapsed': elapsed,
+                   'outputs': _output_hashes(stage), 'created': time.time()},
+                  f, ensure_ascii=False, indent=2, default=str)
+
+    if os.path.exists(entry_dir):
+        shutil.rmtree(entry_dir)
+    os.replace(tmp_dir, entry_dir)
+
+    # 같은 단계의 오래된 결과 정리
+    parent = os.path.dirname(entry_dir)
+    prefix = f"{stage.name}-"
+    entries = sorted(
+        (os.path.join(parent, name) for name in os.listdir(parent)
+         if name.startswith(prefix) and '.tmp-' not in name),
+        key=os.path.getmtime, reverse=True
+    )
+    for old in entries[KEEP_ENTRIES_PER_STAGE:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _output_hashes(stage):
+    return {path: file_content_hash(path) for path in stage.outputs if os.path.exists(path)}
+
+
+def _is_cached(stage, entry_dir):
+    """저장된 결과가 있고, 출력 파일이 그때 기록한 내용 그대로인지 확인
+
+    다른 파이프라인이 같은 디렉토리로 내보낸 경우에도 다시 실행되도록
+    출력 파일의 내용 해시를 비교합니다.
+    """
+    done_path = os.path.join(entry_dir, 'done.json')
+    if not os.path.exists(done_path):
+        return False
+    if not stage.outputs:
+        return True
+    with open(done_path, 'r', encoding='utf-8') as f:
+        recorded = json.load(f).get('outputs', {})
+    return (all(os.path.exists(path) for path in stage.outputs)
+            and recorded == _output_hashes(stage))
+
+
+def _load_entry(entry_dir):
+    with open(os.path.join(entry_dir, 'output.pkl'), 'rb') as f:
+        return _unpack_models(pickle.load(f), entry_dir)
+
+
+def run_pipeline(name, stages, force=None, cache_dir=PIPELINE_CACHE_DIR):
+    """캐시되지 않은 단계만 실행하고 마지막 단계 결과(또는 None) 반환
+
+    force로 단계 이름을 주면 그 단계와 하위 단계를 모두 다시 실행합니다.
+    """
+    pipeline_dir = os.path.join(cache_dir, name)
+    os.makedirs(pipeline_dir, exist_ok=True)
+    force_index = next((i for i, stage in enumerate(stages) if stage.name == force), len(stages))
+    if force and force_index == len(stages):
+        raise ValueError(f"알 수 없는 단계입니다: {force}")
+
+    # 1. 상위 단계에서 하위 단계로 키를 전파 (결과를 계산하지 않고 해시만 사용)
+    keys, entry_dirs, hits = [], [], []
+    upstream_key = None
+    for i, stage in enumerate(stages):
+        upstream_key = _stage_key(stage, upstream_key)
+        entry_dir = os.path.join(pipeline_dir, f"{stage.name}-{upstream_key}")
+        hit = stage.store and i < force_index and _is_cached(stage, entry_dir)
+        keys.append(upstream_key)
+        entry_dirs.append(entry_dir)
+        hits.append(hit)
+
+    print(f"🧱 파이프라인 '{name}':")
+    for stage, key, hit in zip(stages, keys, hits):
+        state = "캐시 사용" if hit else ("필요 시 계산" if not stage.store else "실행")
+        print(f"   {stage.name}: {key} ({state})")
+
+    # 2. 필요한 단계만 실행: 실행할 단계의 입력은 상위 캐시에서 읽거나 다시 계산
+    outputs = {}
+    timings = {}
+
+    def output_of(i):
+        if i < 0:
+            return None
+        if i not in outputs:
+            stage = stages[i]
+            if hits[i]:
+                outputs[i] = None if stage.outputs else _load_entry(entry_dirs[i])
+            else:
+                upstream = output_of(i - 1)
+                print(f"\n▶️ {stage.name} 단계 실행")
+                start_time = time.perf_counter()
+                outputs[i] = stage.run(upstream, stage.config)
+                timings[stage.name] = time.perf_counter() - start_time
+                if stage.store:
+                    _save_entry(entry_dirs[i], stage, outputs[i], timings[stage.name])
+        return outputs[i]
+
+    for i, stage in enumerate(stages):
+        if stage.store and not hits[i]:
+            output_of(i)
+
+    print(f"\n⏱️ 파이프라인 '{name}' 단계별 시간:")
+    for stage, hit in zip(stages, hits):
+        if stage.name in timings:
+            print(f"   {stage.name}: {timings[stage.name]:.1f}초")
+        elif hit:
+            print(f"   {stage.name}: 건너뜀 (캐시)")
+    return outputs.get(len(stages) - 1)
+
+
+def _data_path(*parts):
+    return os.path.join(PROJECT_DIR, "public", "data", *parts)
+
+
+def _model_path(*parts):
+    return os.path.join(PROJECT_DIR, "public", "models", *parts, "model.json")
+
+
+def indicator_stages(multihead=False, export_config=None, parallel=False):
+    """MBTI 지표 모델 파이프라인 (train_model.py)
+
+    parallel=True이면 지표별 모델을 별도 워커 프로세스에서 병렬로 학습합니다.
+    """
+    import train_model
+
+    indicators = ['e-i', 's-n', 't-f', 'j-p']
+    export_config = export_config or {}
+    # 단계 키에 포함할 소스: 각 단계가 호출하는 함수의 모듈과 그 모듈이 가져오는 로컬 모듈
+    common = ['train_model.py', 'palette_augmentation.py']
+
+    def train(models_data, config):
+        # 내보내기 단계의 float32 대비 오차 검증용 검증 행 입력을 학습 결과와 함께 보관
+        reference_inputs = train_model.validation_inputs(models_data)
+        if config['multihead']:
+            trained = train_model.train_multihead_model(models_data)
+            trained['reference_inputs'] = np.concatenate(list(reference_inputs.values()))
+            return trained
+        trained = train_model.train_models(models_data, parallel=config['parallel'])
+        for indicator, model_data in trained.items():
+            model_data['reference_inputs'] = reference_inputs[indicator]
+        return trained
+
+    def export(trained, config):
+        if multihead:
+            return train_model.save_multihead_model_as_tfjs(
+                trained, reference_inputs=trained.get('reference_inputs'), **config
+            )
+        reference_inputs = {
+            indicator: model_data['reference_inputs']
+            for indicator, model_data in trained.items() if 'reference_inputs' in model_data
+        }
+        return train_model.save_models_as_tfjs(trained, reference_inputs=reference_inputs, **config)
+
+    outputs = ([_model_path(train_model.MULTIHEAD_MODEL_NAME)] if multihead
+               else [_model_path(indicator) for indicator in indicators])
+    outputs.append(os.path.join(PROJECT_DIR, "public", "models", train_model.MODEL_MANIFEST_NAME))
+    return [
+        PipelineStage(
+            'load', lambda _, config: train_model.load_training_data(),
+            sources=['dataset_cache.py'],
+            inputs=[_data_path("training-data", f"{indicator}.json") for indicator in indicators],
+            store=False
+        ),
+        PipelineStage(
+            'preprocess', lambda datasets, config: train_model.prepare_data_for_training(datasets, **config),
+            config={'use_augmentation': True, 'augmentation_count': 5, 'noise_factor': 0.05, 'seed': 0},
+            sources=common
+        ),
+        PipelineStage('train', train, config={'multihead': multihead, 'parallel': parallel},
+                      sources=common + ['input_pipeline.py']),
+        PipelineStage('export', export, config=export_config,
+                      sources=['train_model.py', 'tfjs_export.py', 'graph_optimizer.py', 'numpy_runtime.py'],
+                      outputs=outputs)
+    ]
+
+
+def face_color_stages(script_name, train_config=None, export_config=None):
+    """얼굴-색상 모델 파이프라인 (train_face_to_color.py / train_diverse_face_to_color.py)
+
+    두 스크립트 모두 전처리(improved_data_preprocessing, 정규화)를 학습 함수
+    안에서 분할과 함께 수행하므로 별도 단계 없이 train 단계에 포함됩니다.
+    """
+    import importlib
+    from distillation import FACE_COLOR_MANIFEST_PATH
+    from warm_start import held_out_inputs
+
+    script = importlib.import_module(script_name)
+    script_file = f"{script_name}.py"
+    train_config = train_config or {}
+    export_config = export_config or {}
+    has_evaluation = hasattr(script, 'evaluate_model_performance')
+
+    def train(data, config):
+        X, y, metadata = data
+        result = script.train_diverse_face_to_color_model(X, y, metadata, **config)
+        # 내보내기 단계의 float32 대비 오차 검증용 검증 행 원본 입력 (정규화·투영 전)
+        reference_inputs = held_out_inputs(X, script.CHECKPOINT_PATH)
+        if has_evaluation:
+            model, history, X_val, y_val = result
+            return {'model': model, 'scaler': None, 'X_val': X_val, 'y_val': y_val,
+                    'reference_inputs': reference_inputs}
+        model, scaler = result
+        return {'model': model, 'scaler': scaler, 'reference_inputs': reference_inputs}
+
+    def evaluate(trained, config):
+        performance = script.evaluate_model_performance(
+            trained['model'], trained['X_val'], trained['y_val'], None
+        )
+        return {
+            'model': trained['model'],
+            'scaler': trained['scaler'],
+            'reference_inputs': trained.get('reference_inputs'),
+            'performance': {key: float(value) for key, value in performance.items()}
+        }
+
+    def export(trained, config):
+        return script.save_diverse_model_as_tfjs(
+            trained['model'], trained['scaler'], reference_inputs=trained.get('reference_inputs'),
+            **config
+        )
+
+    stages = [
+        PipelineStage(
+            'load', lambda _, config: script.load_diverse_face_color_data(),
+            sources=['dataset_cache.py'],
+            inputs=[_data_path("diverse-face-color", "training-data.json")],
+            store=False
+        ),
+        # 단계 키에 포함할 소스: 각 단계가 호출하는 함수의 모듈과 그 모듈이 가져오는 로컬 모듈
+        PipelineStage('train', train, config=train_config,
+                      sources=[script_file, 'streaming_data.py', 'diversity_losses.py', 'input_pipeline.py',
+                               'warm_start.py', 'pruning.py', 'descriptor_projection.py',
+                               'dataset_cache.py', 'color_evaluation.py'])
+    ]
+    if has_evaluation:
+        stages.append(PipelineStage('evaluate', evaluate, sources=[script_file, 'color_evaluation.py']))
+    stages.append(PipelineStage(
+        'export', export, config=export_config,
+        sources=[script_file, 'tfjs_export.py', 'graph_optimizer.py', 'pruning.py',
+                 'descriptor_projection.py', 'numpy_runtime.py', 'distillation.py'],
+        outputs=[_model_path("diverse-face-to-color"), FACE_COLOR_MANIFEST_PATH]
+    ))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단계별 캐시 학습 파이프라인")
+    parser.add_argument('target', choices=['indicators', 'face', 'diverse'])
+    parser.add_argument('--multihead', action='store_true', help="MBTI 다중 헤드 모델 (indicators)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="지표별 모델을 워커 프로세스에서 병렬 학습 (indicators, --multihead 제외)")
+    parser.add_argument('--streaming', action='store_true', help="디스크 스트리밍 학습 (face, diverse)")
+    parser.add_argument('--num-shards', type=int, default=None)
+    parser.add_argument('--quantization', choices=['float16', 'uint8', 'uint16'], default=None)
+    parser.add_argument('--optimize', action='store_true', help="BatchNormalization·정규화 접기, Dropout 제거")
+    parser.add_argument('--force', help="이 단계부터 캐시를 무시하고 다시 실행")
+    args = parser.parse_args()
+
+    export_config = {
+        'num_shards': args.num_shards,
+        'quantization': args.quantization,
+        'optimize': args.optimize
+    }
+    if args.target == 'indicators':
+        if args.multihead:
+            # 다중 헤드 저장은 그래프 최적화를 지원하지 않음
+            export_config.pop('optimize')
+        stages = indicator_stages(args.multihead, export_config, parallel=args.parallel)
+        name = 'indicators-multihead' if args.multihead else 'indicators'
+    else:
+        script_name = 'train_face_to_color' if args.target == 'face' else 'train_diverse_face_to_color'
+        stages = face_color_stages(script_name, {'streaming': args.streaming}, export_config)
+        name = args.target
+
+    start_time = time.perf_counter()
+    run_pipeline(name, stages, force=args.force)
+    print(f"🎉 파이프라인 완료: {time.perf_counter() - start_time:.1f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+구조적(유닛 단위) 가지치기
+은닉 Dense 레이어에서 입력 가중치 크기(L2 노름)가 작은 유닛을 다항식 스케줄로
+점진적으로 0으로 만들어 목표 희소도에 도달한 뒤 마스크를 고정한 채 미세 조정합니다.
+내보낼 때는 추론 그래프를 접은 Dense 전용 모델에서 0이 된 유닛을 실제로 제거해
+레이어 자체가 좁아지므로, 다운로드 크기와 브라우저 추론 연산량이 함께 줄어듭니다.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from color_evaluation import evaluate_color_model
+
+tf = lazy_import('tensorflow')
+keras = lazy_import('tensorflow.keras')
+
+PRUNING_REPORT_SUFFIX = '.pruning.json'
+PRUNED_CHECKPOINT_SUFFIX = '.pruned.h5'
+PRUNING_FILE_NAME = 'pruning_report.json'
+
+
+def pruning_report_path(checkpoint_path):
+    """학습 중 기록할 가지치기 보고서 경로 (체크포인트 이름 기준)"""
+    return os.path.splitext(checkpoint_path)[0] + PRUNING_REPORT_SUFFIX
+
+
+def pruned_checkpoint_path(checkpoint_path):
+    """가지치기 후 미세 조정한 가중치의 체크포인트 경로
+
+    원래 체크포인트는 증분 학습의 시작점으로 가지치기 전 가중치를 유지하므로,
+    다시 내보낼 때 좁은 모델을 만들 수 있도록 가지치기한 가중치를 따로 저장합니다.
+    """
+    return os.path.splitext(checkpoint_path)[0] + PRUNED_CHECKPOINT_SUFFIX
+
+
+def save_pruned_checkpoint(model, checkpoint_path):
+    """가지치기한 모델을 pruned_checkpoint_path(체크포인트)에 저장"""
+    path = pruned_checkpoint_path(checkpoint_path)
+    model.save(path)
+    print(f"   ✂️ 가지치기한 체크포인트: {path}")
+    return path
+
+
+def discard_pruned_checkpoint(checkpoint_path):
+    """가지치기 없이 다시 학습했을 때 이전 가지치기 체크포인트 삭제 (내보내기에 섞이지 않게)"""
+    path = pruned_checkpoint_path(checkpoint_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def polynomial_sparsity(epoch, target_sparsity, begin_epoch, end_epoch, power=3):
+    """에포크별 희소도: 처음에 빠르게, 목표에 가까워질수록 천천히 증가 (Zhu & Gupta, 2017)"""
+    if epoch < begin_epoch:
+        return 0.0
+    if epoch >= end_epoch:
+        return target_sparsity
+    progress = (epoch + 1 - begin_epoch) / (end_epoch + 1 - begin_epoch)
+    return target_sparsity * (1 - (1 - progress) ** power)
+
+
+def prunable_layers(model):
+    """가지치기 대상: 출력층을 제외한 Dense 레이어"""
+    dense = [layer for layer in model.layers if isinstance(layer, keras.layers.Dense)]
+    return dense[:-1]
+
+
+def unit_pruning_callback(target_sparsity, begin_epoch=0, end_epoch=9):
+    """은닉 Dense 유닛을 에포크마다 스케줄만큼 가지치기하고 배치마다 마스크를 다시 적용하는 콜백
+
+    유닛 j를 가지치기하면 커널 열과 편향을 모두 0으로 두므로 ReLU 출력이 항상 0이고,
+    다음 BatchNormalization의 상수 출력은 접힌 그래프에서 다음 Dense 편향에 흡수됩니다.
+    이미 0이 된 유닛은 노름이 가장 작으므로 한 번 제거된 유닛은 계속 제거된 상태로 남습니다.
+    """
+
+    class UnitPruningCallback(keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.masks = {}
+            self.sparsity = 0.0
+
+        def on_train_begin(self, logs=None):
+            for layer in prunable_layers(self.model):
+                self.masks[layer.name] = np.ones(layer.units, dtype=np.float32)
+
+        def on_epoch_begin(self, epoch, logs=None):
+            sparsity = polynomial_sparsity(epoch, target_sparsity, begin_epoch, end_epoch)
+            if sparsity <= self.sparsity:
+                return
+            self.sparsity = sparsity
+            for layer in prunable_layers(self.model):
+                kernel, bias = layer.get_weights()[:2]
+                norms = np.sqrt(np.square(kernel).sum(axis=0) + np.square(bias))
+                mask = np.ones(layer.units, dtype=np.float32)
+                mask[np.argsort(norms, kind='stable')[:int(round(layer.units * sparsity))]] = 0.0
+                self.masks[layer.name] = mask
+            self._apply_masks()
+
+        def on_train_batch_end(self, batch, logs=None):
+            if self.sparsity > 0:
+                self._apply_masks()
+
+        def on_epoch_end(self, epoch, logs=None):
+            if logs is not None:
+                logs['sparsity'] = self.sparsity
+
+        def _apply_masks(self):
+            for layer in prunable_layers(self.model):
+                mask = tf.constant(self.masks[layer.name])
+                layer.kernel.assign(layer.kernel * mask[None, :])
+                if layer.use_bias:
+                    layer.bias.assign(layer.bias * mask)
+
+    return UnitPruningCallback()
+
+
+def active_units(model):
+    """은닉 Dense 레이어별 (전체 유닛 수, 0이 아닌 유닛 수)"""
+    counts = {}
+    for layer in prunable_layers(model):
+        kernel, bias = layer.get_weights()[:2]
+        alive = np.any(kernel != 0, axis=0) | (bias != 0)
+        counts[layer.name] = (int(layer.units), int(np.count_nonzero(alive)))
+    return counts
+
+
+def prune_units(model, fit_kwargs, target_sparsity, X_eval, y_eval, pruning_epochs=10,
+                fine_tune_epochs=10, learning_rate=0.0002, report_path=None):
+    """학습된 모델을 제자리에서 구조적으로 가지치기하고 미세 조정한 뒤 보고서 반환
+
+    fit_kwargs는 model.fit에 그대로 전달할 학습 데이터 인자(x, y, validation_data,
+    batch_size)입니다. 처음 pruning_epochs 에포크 동안 희소도를 목표까지 늘리고, 이후
+    fine_tune_epochs 에포크는 마스크를 고정한 채 학습합니다. 조기 종료는 미세 조정
+    구간에서만 동작하므로 복원되는 가중치도 항상 목표 희소도를 만족합니다.
+    X_eval, y_eval(정규화된 검증 데이터)로 가지치기 전후 품질을 비교합니다.
+    """
+    print(f"\n✂️ 구조적 가지치기: 목표 희소도 {target_sparsity:.0%} "
+          f"({pruning_epochs} 에포크 점진 적용 + {fine_tune_epochs} 에포크 미세 조정)")
+    before = evaluate_color_model(model, X_eval, y_eval)
+
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        loss=model.loss,
+        metrics=['mae']
+    )
+    callbacks = [
+        unit_pruning_callback(target_sparsity, 0, pruning_epochs - 1),
+        keras.callbacks.EarlyStopping(
+            monitor='val_loss', patience=5, restore_best_weights=True,
+            start_from_epoch=pruning_epochs, verbose=1
+        )
+    ]
+    history = model.fit(
+        epochs=pruning_epochs + fine_tune_epochs, callbacks=callbacks, verbose=2, **fit_kwargs
+    )
+
+    after = evaluate_color_model(model, X_eval, y_eval)
+    units = active_units(model)
+    report = {
+        'target_sparsity': target_sparsity,
+        'pruning_epochs': pruning_epochs,
+        'fine_tune_epochs': len(history.history['loss']) - pruning_epochs,
+        'units': {name: {'total': total, 'active': alive} for name, (total, alive) in units.items()},
+        'before': before,
+        'after': after
+    }
+    print_pruning_report(report)
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def print_pruning_report(report):
+    """가지치기 전후 유닛 수와 품질 지표 출력"""
+    units = ', '.join(f"{info['total']}→{info['active']}" for info in report['units'].values())
+    before, after = report['before'], report['after']
+    print(f"\n✂️ 가지치기 결과: 은닉 유닛 {units}")
+    print(f"   MSE {before['mse']:.6f} → {after['mse']:.6f} "
+          f"({(after['mse'] / max(before['mse'], 1e-12) - 1) * 100:+.1f}%)")
+    print(f"   극값 정확도 {before['extreme_accuracy']:.3f} → {after['extreme_accuracy']:.3f}, "
+          f"다양성 점수 {before['diversity_score']:.1f}% → {after['diversity_score']:.1f}%")
+
+
+def remove_pruned_units(folded):
+    """접힌 Dense 전용 모델에서 커널 열과 편향이 모두 0인 은닉 유닛을 제거
+
+    ReLU(0) = 0이므로 해당 유닛의 출력은 항상 0이고, 다음 Dense의 대응 행을 함께
+    지우면 출력이 정확히 같습니다. 제거할 유닛이 없으면 입력 모델을 그대로 반환합니다.
+    반환값: (좁아진 모델, [(레이어별 원래 유닛 수, 남은 유닛 수), ...])
+    """
+    specs = [
+        (layer.get_weights()[0], layer.get_weights()[1], keras.activations.serialize(layer.activation))
+        for layer in folded.layers
+    ]
+    widths = []
+    for i in range(len(specs) - 1):
+        kernel, bias, activation = specs[i]
+        keep = np.any(kernel != 0, axis=0) | (bias != 0)
+        if activation != 'relu':
+            keep[:] = True
+        if not keep.any():
+            keep[np.argmax(np.abs(kernel).sum(axis=0))] = True
+        widths.append((kernel.shape[1], int(np.count_nonzero(keep))))
+        next_kernel, next_bias, next_activation = specs[i + 1]
+        specs[i] = (kernel[:, keep], bias[keep], activation)
+        specs[i + 1] = (next_kernel[keep], next_bias, next_activation)
+
+    if all(total == kept for total, kept in widths):
+        return folded, widths
+
+    narrow = keras.Sequential(
+        [keras.Input(shape=(specs[0][0].shape[0],))] +
+        [keras.layers.Dense(kernel.shape[1], activation=activation) for kernel, _, activation in specs]
+    )
+    narrow.set_weights([array for kernel, bias, _ in specs for array in (kernel, bias)])
+    return narrow, widths
+
+
+def publish_pruning_report(report_path, model_dir):
+    """학습 중 기록한 가지치기 보고서를 내보낸 모델 디렉토리로 이동"""
+    if not report_path or not os.path.exists(report_path):
+        return None
+    target = os.path.join(model_dir, PRUNING_FILE_NAME)
+    shutil.move(report_path, target)
+    print(f"   ✂️ 가지치기 보고서: {target}")
+    return target
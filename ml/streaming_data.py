@@ -0,0 +1,174 @@
+"""
+디스크 기반 스트리밍 학습 데이터 파이프라인
+메모리 매핑된 X, y에서 고정 크기 청크를 순서대로 읽어 배치를 만들고,
+정규화 통계는 한 번의 스트리밍 패스로 계산합니다.
+"""
+
+import numpy as np
+
+
+def split_mask(num_samples, test_size=0.2, random_state=42):
+    """인덱스 기준 훈련/검증 분할 마스크 (True = 검증)
+
+    데이터를 복사하지 않고 샘플당 1바이트 마스크만 사용합니다.
+    """
+    rng = np.random.default_rng(random_state)
+    val_mask = np.zeros(num_samples, dtype=bool)
+    val_mask[rng.permutation(num_samples)[:int(round(num_samples * test_size))]] = True
+    return val_mask
+
+
+class StreamingStandardScaler:
+    """청크 단위로 평균/분산을 누적하는 StandardScaler 호환 정규화기
+
+    mean_, scale_, var_, n_features_in_ 속성을 sklearn StandardScaler와
+    동일하게 제공하므로 save_diverse_model_as_tfjs에 그대로 전달할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.n_samples_seen_ = 0
+        self.mean_ = None
+        self.var_ = None
+        self.scale_ = None
+        self.n_features_in_ = None
+        self._m2 = None
+
+    @classmethod
+    def from_stats(cls, mean, scale, n_samples_seen=0):
+        """저장된 평균/스케일(scaler_info.json 등)로 정규화기 복원"""
+        scaler = cls()
+        scaler.mean_ = np.asarray(mean, dtype=np.float64)
+        scaler.scale_ = np.asarray(scale, dtype=np.float64)
+        scaler.var_ = scaler.scale_ ** 2
+        scaler.n_features_in_ = len(scaler.mean_)
+        scaler.n_samples_seen_ = n_samples_seen
+        return scaler
+
+    def partial_fit(self, X_chunk):
+        """청크 통계를 병렬 분산 공식(Chan et al.)으로 병합"""
+        X_chunk = np.asarray(X_chunk, dtype=np.float64)
+        n_b = len(X_chunk)
+        if n_b == 0:
+            return self
+
+        mean_b = X_chunk.mean(axis=0)
+        m2_b = ((X_chunk - mean_b) ** 2).sum(axis=0)
+
+        if self.n_samples_seen_ == 0:
+            self.mean_, self._m2 = mean_b, m2_b
+            self.n_features_in_ = X_chunk.shape[1]
+        else:
+            n_a = self.n_samples_seen_
+            delta = mean_b - self.mean_
+            total = n_a + n_b
+            self.mean_ = self.mean_ + delta * (n_b / total)
+            self._m2 = self._m2 + m2_b + delta ** 2 * (n_a * n_b / total)
+
+        self.n_samples_seen_ += n_b
+        self.var_ = self._m2 / self.n_samples_seen_
+        scale = np.sqrt(self.var_)
+        scale[scale == 0.0] = 1.0  # sklearn과 동일하게 분산 0인 특성은 스케일 1
+        self.scale_ = scale
+        return self
+
+    def transform(self, X):
+        return ((np.asarray(X, dtype=np.float32) - self.mean_.astype(np.float32))
+                / self.scale_.astype(np.float32))
+
+
+def fit_streaming_scaler(X, row_mask=None, chunk_size=65536):
+    """X를 한 번 순회하며 (row_mask가 True인 행만) 정규화 통계 계산"""
+    scaler = StreamingStandardScaler()
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        if row_mask is not None:
+            chunk = chunk[row_mask[start:start + chunk_size]]
+        scaler.partial_fit(chunk)
+    return scaler
+
+
+def count_batches(num_rows, batch_size):
+    """청크 경계를 넘어 배치를 이어 붙일 때의 배치 수"""
+    return -(-num_rows // batch_size)
+
+
+def iter_streaming_batches(X, y, row_mask, chunk_size=65536, batch_size=32,
+                           shuffle=True, scaler=None, rng=None):
+    """row_mask가 True인 행을 청크 단위로 읽어 배치로 반환하는 생성기
+
+    한 번에 하나의 청크만 메모리에 올립니다. shuffle=True이면 청크 순서와
+    청크 내부 행 순서를 섞습니다. 청크 사이의 남은 행은 다음 청크와 이어
+    붙여 마지막 배치를 제외하고는 항상 batch_size 크기를 유지합니다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    starts = np.arange(0, len(X), chunk_size)
+    if shuffle:
+        starts = rng.permutation(starts)
+
+    carry_X, carry_y = None, None
+    for start in starts:
+        rows = np.flatnonzero(row_mask[start:start + chunk_size]) + start
+        if len(rows) == 0:
+            continue
+        if shuffle:
+            rows = rng.permutation(rows)
+
+        # 청크 범위 안의 인덱싱이므로 디스크 읽기는 연속 구간으로 제한됨
+        X_chunk = np.asarray(X[rows], dtype=np.float32)
+        y_chunk = np.asarray(y[rows], dtype=np.float32)
+        if scaler is not None:
+            X_chunk = scaler.transform(X_chunk)
+        if carry_X is not None:
+            X_chunk = np.concatenate([carry_X, X_chunk])
+            y_chunk = np.concatenate([carry_y, y_chunk])
+
+        full = len(X_chunk) - len(X_chunk) % batch_size
+        for i in range(0, full, batch_size):
+            yield X_chunk[i:i + batch_size], y_chunk[i:i + batch_size]
+        carry_X, carry_y = X_chunk[full:], y_chunk[full:]
+
+    if carry_X is not None and len(carry_X) > 0:
+        yield carry_X, carry_y
+
+
+def make_streaming_dataset(X, y, row_mask, chunk_size=65536, batch_size=32,
+                           shuffle=True, scaler=None, seed=None):
+    """iter_streaming_batches를 감싼 tf.data 데이터셋
+
+    반복할 때마다 생성기를 다시 호출하므로 에포크마다 새로 섞입니다.
+    """
+    import tensorflow as tf
+
+    rng = np.random.default_rng(seed)
+
+    def generator():
+        return iter_streaming_batches(
+            X, y, row_mask, chunk_size, batch_size, shuffle, scaler, rng
+        )
+
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(None, X.shape[1]), dtype=tf.float32),
+            tf.TensorSpec(shape=(None, y.shape[1]), dtype=tf.float32)
+        )
+    )
+    steps = count_batches(int(np.count_nonzero(row_mask)), batch_size)
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(steps))
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def gather_rows(X, row_mask, limit=None, chunk_size=65536):
+    """row_mask가 True인 행을 청크 단위로 모아 배열로 반환 (최대 limit개)"""
+    parts = []
+    remaining = int(np.count_nonzero(row_mask)) if limit is None else limit
+    for start in range(0, len(X), chunk_size):
+        if remaining <= 0:
+            break
+        rows = np.flatnonzero(row_mask[start:start + chunk_size])[:remaining] + start
+        if len(rows):
+            parts.append(np.asarray(X[rows], dtype=np.float32))
+            remaining -= len(rows)
+    if not parts:
+        return np.empty((0,) + X.shape[1:], dtype=np.float32)
+    return np.concatenate(parts)
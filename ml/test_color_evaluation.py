@@ -0,0 +1,85 @@
+"""
+벡터화된 색상 예측 평가 테스트 (python -m pytest ml/test_color_evaluation.py)
+
+evaluate_color_model이 기존 evaluate_model_performance·test_color_diversity의
+샘플별 루프(rgb_to_hex 문자열 집합, 쌍마다 np.linalg.norm)와 같은 지표를 내는지,
+청크 크기와 관계없이 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from color_evaluation import evaluate_color_model, pack_rgb24
+
+
+class _FixedModel:
+    """입력의 첫 열(행 번호)로 미리 정한 예측을 돌려주는 모델"""
+
+    def __init__(self, predictions):
+        self.predictions = predictions
+
+    def predict(self, X, batch_size=None, verbose=0):
+        return self.predictions[X[:, 0].astype(int)]
+
+
+def _rgb_to_hex(r, g, b):
+    """기존 train_diverse_face_to_color.rgb_to_hex"""
+    def to_hex(n):
+        hex_val = hex(int(n * 255))[2:]
+        return hex_val if len(hex_val) == 2 else f"0{hex_val}"
+
+    return f"#{to_hex(r)}{to_hex(g)}{to_hex(b)}"
+
+
+def _loop_color_diversity(predictions):
+    """기존 test_color_diversity의 고유 색상 수와 평균 색상 간 거리"""
+    unique_colors = set()
+    color_distances = []
+    for pred in predictions:
+        colors = pred.reshape(5, 3)
+        for color in colors:
+            unique_colors.add(_rgb_to_hex(color[0], color[1], color[2]))
+        for i in range(5):
+            for j in range(i + 1, 5):
+                color_distances.append(np.linalg.norm(colors[i] - colors[j]))
+    return len(unique_colors), np.mean(color_distances)
+
+
+def _data(num_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([np.arange(num_samples), rng.random((num_samples, 4))]).astype(np.float32)
+    # 중복 색상이 생기도록 일부 예측은 적은 단계로 양자화
+    predictions = rng.random((num_samples, 15)).astype(np.float32)
+    predictions[::3] = np.round(predictions[::3] * 4) / 4
+    y = rng.random((num_samples, 15)).astype(np.float32)
+    y[rng.random(y.shape) < 0.15] = 0.0
+    y[rng.random(y.shape) < 0.15] = 1.0
+    return X, y, predictions
+
+
+def test_pack_rgb24_matches_rgb_to_hex():
+    colors = np.random.default_rng(1).random((500, 3)).astype(np.float32)
+    colors[:3] = [[0, 0, 0], [1, 1, 1], [0.5, 0.25, 1 / 255]]
+    packed = pack_rgb24(colors)
+    assert [f"#{value:06x}" for value in packed.tolist()] == [_rgb_to_hex(*color) for color in colors]
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 1000])
+def test_evaluate_color_model_matches_loops(chunk_size):
+    """전체 검증 데이터의 지표가 기존 루프 구현과 같아야 함"""
+    X, y, predictions = _data(300)
+
+    results = evaluate_color_model(_FixedModel(predictions), X, y, batch_size=16, chunk_size=chunk_size)
+
+    unique_colors, avg_distance = _loop_color_diversity(predictions)
+    extreme_mask = (np.abs(y - 0.0) < 0.01) | (np.abs(y - 1.0) < 0.01)
+    assert results['num_samples'] == 300
+    assert results['mse'] == pytest.approx(np.mean((y - predictions) ** 2), rel=1e-5)
+    assert results['mae'] == pytest.approx(np.mean(np.abs(y - predictions)), rel=1e-5)
+    assert results['extreme_accuracy'] == pytest.approx(
+        np.mean(np.abs(y[extreme_mask] - predictions[extreme_mask]) < 0.1)
+    )
+    assert results['unique_colors'] == unique_colors
+    assert results['avg_distance'] == pytest.approx(avg_distance, rel=1e-5)
+    assert results['diversity_score'] == pytest.approx(unique_colors / 300 * 100)
+
@@ -0,0 +1,110 @@
+"""
+학습 데이터 바이너리 캐시 테스트 (python -m pytest ml/test_dataset_cache.py)
+
+캐시를 만들 때와 다시 읽을 때 모두 JSON을 직접 파싱한 결과와 같은 배열·메타데이터가
+나와야 하며, 원본 내용이 바뀌면 새 해시의 캐시를 사용해야 합니다.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from dataset_cache import (
+    CHARACTERISTIC_NAMES, cache_dir_for, load_face_color_arrays, load_face_color_metadata,
+    load_indicator_arrays
+)
+
+
+def _write_face_color_json(path, num_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    metadata = [
+        {
+            'colors': [f"#{value:06x}" for value in rng.integers(0, 1 << 24, 5).tolist()],
+            'colorCharacteristics': dict(zip(CHARACTERISTIC_NAMES, rng.random(5).round(4).tolist())),
+            'colorCategory': ['warm', 'cool', 'neutral'][int(rng.integers(0, 3))]
+        }
+        for _ in range(num_samples)
+    ]
+    data = {
+        'X': rng.standard_normal((num_samples, 148)).round(5).tolist(),
+        'y': rng.random((num_samples, 15)).round(5).tolist(),
+        'metadata': metadata
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return data
+
+
+def _assert_metadata_equal(columns, records):
+    assert len(columns) == len(records)
+    for restored, item in zip(columns, records):
+        assert restored['colors'] == item['colors']
+        assert restored['colorCategory'] == item['colorCategory']
+        np.testing.assert_allclose(
+            [restored['colorCharacteristics'][name] for name in CHARACTERISTIC_NAMES],
+            [item['colorCharacteristics'][name] for name in CHARACTERISTIC_NAMES], rtol=1e-6
+        )
+
+
+def test_face_color_cache_round_trip(tmp_path):
+    """캐시 생성 시와 재사용 시 모두 JSON 파싱 결과와 같아야 함"""
+    path = str(tmp_path / 'training-data.json')
+    data = _write_face_color_json(path, 50)
+    expected_X, expected_y, _ = load_face_color_arrays(path, use_cache=False)
+
+    for _ in range(2):
+        X, y, metadata = load_face_color_arrays(path)
+        assert isinstance(X, np.memmap) and X.dtype == np.float32
+        np.testing.assert_array_equal(X, expected_X)
+        np.testing.assert_array_equal(y, expected_y)
+        _assert_metadata_equal(metadata, data['metadata'])
+    _assert_metadata_equal(load_face_color_metadata(path), data['metadata'])
+
+
+def test_cache_key_follows_content(tmp_path):
+    """원본 내용이 바뀌면 새 캐시를 만들고 이전 해시의 캐시는 지워야 함"""
+    path = str(tmp_path / 'training-data.json')
+    _write_face_color_json(path, 20, seed=0)
+    load_face_color_arrays(path)
+    old_cache = cache_dir_for(path)
+
+    _write_face_color_json(path, 30, seed=1)
+    X, _, _ = load_face_color_arrays(path)
+
+    assert len(X) == 30
+    assert cache_dir_for(path) != old_cache
+    assert not os.path.exists(old_cache)
+
+
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_indicator_arrays(tmp_path, use_cache):
+    path = str(tmp_path / 'e-i.json')
+    records = [{'palette': ['#ff0000', '#00ff00', '#0000ff', '#ffffff', '#000000'], 'label': 'E'},
+               {'palette': ['#808080'] * 5, 'label': 'I'}]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+
+    arrays = load_indicator_arrays(path, use_cache=use_cache)
+
+    assert arrays['labels'].tolist() == ['E', 'I']
+    np.testing.assert_allclose(arrays['X'][0], [1, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0])
+    np.testing.assert_allclose(arrays['X'][1], np.full(15, 128 / 255), rtol=1e-6)
+
+
+def test_prune_keeps_caches_of_other_sources(tmp_path):
+    """training-data.json의 캐시를 갱신해도 training-data-v2.json의 캐시는 남아야 함"""
+    path, other = str(tmp_path / 'training-data.json'), str(tmp_path / 'training-data-v2.json')
+    _write_face_color_json(other, 10, seed=2)
+    load_face_color_arrays(other)
+    _write_face_color_json(path, 10, seed=0)
+    load_face_color_arrays(path)
+
+    _write_face_color_json(path, 12, seed=1)
+    load_face_color_arrays(path)
+
+    assert os.path.isdir(cache_dir_for(other))
+    assert sorted(os.listdir(os.path.dirname(cache_dir_for(path)))) == sorted(
+        os.path.basename(cache_dir_for(source)) for source in (path, other)
+    )
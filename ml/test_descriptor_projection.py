@@ -0,0 +1,100 @@
+"""
+descriptor 저차원 투영 테스트 (python -m pytest ml/test_descriptor_projection.py)
+
+청크 단위로 누적한 PCA가 sklearn PCA와 같은 주성분을 찾는지, 투영을 첫 Dense에
+합성한 148차원 입력 모델이 folded(투영(x))와 같은 출력을 내는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+from sklearn.decomposition import PCA
+from sklearn.model_selection import train_test_split
+
+from descriptor_projection import (
+    DESCRIPTOR_DIM, DescriptorProjection, fuse_descriptor_projection, training_rows, validation_rows,
+    verify_fused_projection
+)
+from lazy_imports import lazy_import
+
+keras = lazy_import('tensorflow.keras')
+
+
+def _dense_model(widths, input_dim, output_dim, seed=0):
+    keras.utils.set_random_seed(seed)
+    return keras.Sequential(
+        [keras.Input(shape=(input_dim,))] +
+        [keras.layers.Dense(width, activation='relu') for width in widths] +
+        [keras.layers.Dense(output_dim, activation='sigmoid')]
+    )
+
+
+def _inputs(num_samples, seed=0):
+    """주성분이 뚜렷하도록 descriptor 축마다 분산을 다르게 둔 148차원 입력"""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((num_samples, 148))
+    X[:, :DESCRIPTOR_DIM] *= 0.1
+    X[:, :8] *= np.arange(80, 0, -10)
+    return X.astype(np.float32)
+
+
+def test_projection_matches_sklearn_pca(tmp_path):
+    """청크 단위 공분산 누적의 주성분·설명 분산·변환이 sklearn PCA와 같아야 함 (부호 제외)"""
+    X = _inputs(1000)
+    rows = np.arange(800)
+    projection = DescriptorProjection(8).fit(X, rows=rows, chunk_size=97)
+    reference = PCA(n_components=8).fit(X[rows, :DESCRIPTOR_DIM].astype(np.float64))
+
+    signs = np.sign(np.sum(projection.components_ * reference.components_, axis=1))
+    np.testing.assert_allclose(projection.components_ * signs[:, None], reference.components_, atol=1e-6)
+    np.testing.assert_allclose(projection.explained_variance_ratio_, reference.explained_variance_ratio_,
+                               rtol=1e-6)
+    transformed = projection.transform(X)
+    assert transformed.shape == (1000, projection.output_dim) == (1000, 8 + 20)
+    np.testing.assert_allclose(transformed[:, :8] * signs, reference.transform(X[:, :DESCRIPTOR_DIM]),
+                               atol=1e-4)
+    np.testing.assert_array_equal(transformed[:, 8:], X[:, DESCRIPTOR_DIM:])
+
+    # affine()으로 표현한 Dense 가중치와 저장·복원한 투영도 같은 변환이어야 함
+    kernel, bias = projection.affine()
+    np.testing.assert_allclose(X @ kernel + bias, transformed, atol=1e-4)
+    restored = DescriptorProjection.load(projection.save(str(tmp_path / 'projection.npz')))
+    np.testing.assert_array_equal(restored.transform(X), transformed)
+
+
+@pytest.mark.parametrize('index_split', [False, True])
+def test_training_and_validation_rows_partition(index_split):
+    train = training_rows(103, index_split)
+    train = np.flatnonzero(train) if train.dtype == bool else np.sort(train)
+    val = validation_rows(103, index_split)
+    assert len(val) == 21
+    np.testing.assert_array_equal(np.sort(np.concatenate([train, val])), np.arange(103))
+    if not index_split:
+        np.testing.assert_array_equal(val, np.sort(train_test_split(np.arange(103), test_size=0.2,
+                                                                    random_state=42)[1]))
+
+
+@pytest.mark.parametrize('mode', ['fused', 'factorized'])
+def test_fuse_descriptor_projection_parity(mode):
+    """투영을 합성한 148차원 입력 모델이 folded(투영(x))와 같아야 함"""
+    rng = np.random.default_rng(3)
+    X = rng.standard_normal((400, 148)).astype(np.float32)
+    projection = DescriptorProjection(16).fit(X, rows=np.arange(300))
+    folded = _dense_model([32, 16], projection.output_dim, 15)
+
+    fused, fused_mode = fuse_descriptor_projection(folded, projection, mode=mode)
+
+    assert fused_mode == mode
+    assert fused.input_shape[-1] == 148
+    assert len(fused.layers) == len(folded.layers) + (mode == 'factorized')
+    assert verify_fused_projection(folded, fused, projection, reference_inputs=X[300:]) < 1e-4
+
+
+def test_fuse_descriptor_projection_auto_picks_smaller():
+    projection = DescriptorProjection(8).fit(np.random.default_rng(4).standard_normal((200, 148)))
+    folded = _dense_model([256, 32], projection.output_dim, 15)
+    candidates = {
+        mode: fuse_descriptor_projection(folded, projection, mode=mode)[0].count_params()
+        for mode in ('fused', 'factorized')
+    }
+    _, mode = fuse_descriptor_projection(folded, projection)
+    assert candidates[mode] == min(candidates.values())
@@ -0,0 +1,62 @@
+"""
+색상 다양성 손실 함수 테스트 (python -m pytest ml/test_diversity_losses.py)
+
+쌍 거리 행렬로 벡터화한 손실이 기존 이중 루프 구현(benchmark_diversity_loss)과
+같은 손실 값과 그래디언트를 내는지, XLA 컴파일 여부와 관계없이 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from benchmark_diversity_loss import LOSS_VARIANTS
+from diversity_losses import pair_difference_matrix
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+
+
+def _batch(batch_size, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.random((batch_size, 15)).astype(np.float32)
+    # 극값 가중치가 적용되도록 일부 목표값을 0, 1 근처로 설정
+    y_true[rng.random(y_true.shape) < 0.2] = 0.0
+    y_true[rng.random(y_true.shape) < 0.2] = 1.0 - 0.005
+    y_pred = rng.random((batch_size, 15)).astype(np.float32)
+    return tf.constant(y_true), tf.constant(y_pred)
+
+
+def _loss_and_gradient(loss_fn, y_true, y_pred, jit_compile):
+    @tf.function(jit_compile=jit_compile)
+    def step(y_true, y_pred):
+        with tf.GradientTape() as tape:
+            tape.watch(y_pred)
+            loss = tf.reduce_mean(loss_fn(y_true, y_pred))
+        return loss, tape.gradient(loss, y_pred)
+
+    loss, gradient = step(y_true, y_pred)
+    return float(loss), gradient.numpy()
+
+
+def test_pair_difference_matrix_follows_loop_order():
+    matrix = pair_difference_matrix(5)
+    pairs = [(i, j) for i in range(5) for j in range(i + 1, 5)]
+    assert matrix.shape == (10, 5)
+    for row, (i, j) in zip(matrix, pairs):
+        expected = np.zeros(5, dtype=np.float32)
+        expected[i], expected[j] = 1.0, -1.0
+        np.testing.assert_array_equal(row, expected)
+
+
+@pytest.mark.parametrize('variant', sorted(LOSS_VARIANTS))
+@pytest.mark.parametrize('jit_compile', [False, True])
+@pytest.mark.parametrize('batch_size', [1, 37, 256])
+def test_vectorized_loss_matches_loop(variant, jit_compile, batch_size):
+    """기존 루프 구현과 손실·그래디언트가 float32 반올림 오차 안에서 같아야 함"""
+    create_loop, create_vectorized = LOSS_VARIANTS[variant]
+    y_true, y_pred = _batch(batch_size)
+
+    expected_loss, expected_gradient = _loss_and_gradient(create_loop(), y_true, y_pred, False)
+    loss, gradient = _loss_and_gradient(create_vectorized(), y_true, y_pred, jit_compile)
+
+    assert loss == pytest.approx(expected_loss, rel=1e-5, abs=1e-7)
+    np.testing.assert_allclose(gradient, expected_gradient, rtol=1e-4, atol=1e-7)
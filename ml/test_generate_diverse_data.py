@@ -0,0 +1,74 @@
+"""
+다양한 얼굴-색상 데이터 생성기 테스트 (python -m pytest ml/test_generate_diverse_data.py)
+
+TS 생성기(scripts/generateDiverseFaceColorData.ts)와 같은 카테고리 샘플 수와
+입력 구성(descriptor 128 + 물리적 특징 15 + 시드 5)을 만드는지, 기록한 바이너리
+데이터셋이 load_face_color_arrays로 그대로 읽히는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from dataset_cache import load_face_color_arrays
+from generate_diverse_data import (
+    CATEGORIES, CATEGORY_SPECS, DESCRIPTOR_DIM, INPUT_DIM, PHYSICAL_DIM, SEED_DIM,
+    category_counts, generate_diverse_face_color_dataset, hsl_to_rgb_bytes
+)
+
+
+@pytest.mark.parametrize('num_samples', [1000, 1003, 7])
+def test_category_counts_follow_ts_generator(num_samples):
+    """카테고리별 Math.floor(비율 × 샘플 수), 남는 샘플은 random 카테고리"""
+    counts = dict(zip(CATEGORIES, category_counts(num_samples).tolist()))
+    for name, spec in CATEGORY_SPECS.items():
+        if name != 'random':
+            assert counts[name] == int(num_samples * spec['fraction'])
+    assert sum(counts.values()) == num_samples
+
+
+def test_hsl_to_rgb_bytes_matches_ts_rounding():
+    hue = np.array([0.0, 120.0, 240.0, 0.0, -30.0])
+    saturation = np.array([1.0, 1.0, 1.0, 0.0, 1.0])
+    lightness = np.array([0.5, 0.5, 0.5, 0.5, 0.5])
+    # 회색은 Math.round(127.5) = 128, 음수 hue는 TS와 같이 색상 성분 없이 m만 남음
+    expected = [[255, 0, 0], [0, 255, 0], [0, 0, 255], [128, 128, 128], [0, 0, 0]]
+    np.testing.assert_array_equal(hsl_to_rgb_bytes(hue, saturation, lightness), expected)
+
+
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_dataset_layout(tmp_path, shuffle):
+    """카테고리 수, 입력 구간별 범위, 시드 규칙, y와 압축 색상의 일치 확인"""
+    num_samples = 2003
+    output_dir = generate_diverse_face_color_dataset(
+        num_samples, str(tmp_path / 'generated'), seed=3, chunk_size=500, shuffle=shuffle
+    )
+
+    X, y, metadata = load_face_color_arrays(output_dir)
+
+    assert X.shape == (num_samples, INPUT_DIM) and y.shape == (num_samples, 15)
+    assert metadata.category_counts() == dict(zip(CATEGORIES, category_counts(num_samples).tolist()))
+    if not shuffle:
+        # TS 생성기와 같은 카테고리 순서의 블록
+        assert np.all(np.diff(np.asarray(metadata.category_codes).astype(int)) >= 0)
+
+    descriptor = X[:, :DESCRIPTOR_DIM]
+    physical = X[:, DESCRIPTOR_DIM:DESCRIPTOR_DIM + PHYSICAL_DIM]
+    seeds = X[:, DESCRIPTOR_DIM + PHYSICAL_DIM:]
+    assert np.all(np.abs(descriptor) <= 0.35 + 1e-6)
+    assert np.all((physical >= 0) & (physical <= 1))
+    assert 0.05 < np.mean((physical == 0) | (physical == 1)) < 0.15
+    np.testing.assert_allclose(
+        seeds, np.fmod(np.abs(descriptor[:, :SEED_DIM] + descriptor[:, SEED_DIM:2 * SEED_DIM]), 1),
+        atol=1e-6
+    )
+
+    colors = np.asarray(metadata.colors)
+    rgb = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=-1)
+    np.testing.assert_allclose(y, rgb.reshape(num_samples, 15) / 255.0, atol=1e-6)
+
+
+def test_dataset_is_deterministic(tmp_path):
+    first = generate_diverse_face_color_dataset(300, str(tmp_path / 'a'), seed=5, chunk_size=128)
+    second = generate_diverse_face_color_dataset(300, str(tmp_path / 'b'), seed=5, chunk_size=128)
+    for a, b in zip(load_face_color_arrays(first)[:2], load_face_color_arrays(second)[:2]):
+        np.testing.assert_array_equal(a, b)
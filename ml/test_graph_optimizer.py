@@ -0,0 +1,82 @@
+"""
+추론 그래프 접기 테스트 (python -m pytest ml/test_graph_optimizer.py)
+
+StandardScaler·BatchNormalization·Dropout을 Dense 가중치에 접은 모델이 원래
+모델(+정규화)과 같은 출력을 내는지, 검증이 오차와 지원하지 않는 레이어를 잡아내는지 확인합니다.
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from graph_optimizer import fold_inference_graph, verify_folded_model
+from lazy_imports import lazy_import
+
+keras = lazy_import('tensorflow.keras')
+
+
+def _batch_norm_model(input_dim=12, seed=0):
+    """Dense → BatchNormalization → Dropout 구성의 Sequential (BatchNormalization은 임의의 통계)"""
+    keras.utils.set_random_seed(seed)
+    model = keras.Sequential([
+        keras.Input(shape=(input_dim,)),
+        keras.layers.Dense(16, activation='relu'),
+        keras.layers.BatchNormalization(),
+        keras.layers.Dropout(0.3),
+        keras.layers.Dense(8, activation='relu'),
+        keras.layers.BatchNormalization(),
+        keras.layers.Dense(3, activation='sigmoid')
+    ])
+    rng = np.random.default_rng(seed)
+    # 기본값(평균 0, 분산 1)이면 접기가 항등이 되므로 임의의 통계로 바꿈
+    for layer in model.layers:
+        if isinstance(layer, keras.layers.BatchNormalization):
+            units = layer.gamma.shape[0]
+            layer.set_weights([
+                rng.uniform(0.5, 2.0, units), rng.normal(0, 0.5, units),
+                rng.normal(0, 0.5, units), rng.uniform(0.5, 2.0, units)
+            ])
+    return model
+
+
+def _scaler(input_dim=12, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    return types.SimpleNamespace(mean_=rng.normal(0, 3, input_dim), scale_=rng.uniform(0.5, 4, input_dim))
+
+
+def test_fold_inference_graph_matches_original():
+    """정규화·BatchNormalization·Dropout을 접은 모델이 원래 출력과 같아야 함"""
+    model, scaler = _batch_norm_model(), _scaler()
+
+    folded = fold_inference_graph(model, scaler)
+
+    assert all(isinstance(layer, keras.layers.Dense) for layer in folded.layers)
+    assert len(folded.layers) == 3
+    rng = np.random.default_rng(2)
+    reference = (rng.standard_normal((128, 12)) * scaler.scale_ + scaler.mean_).astype(np.float32)
+    assert verify_folded_model(model, folded, reference, scaler) < 1e-4
+    # 검증 입력이 없으면 정규화 통계에 맞춘 임의 입력으로 비교
+    assert verify_folded_model(model, folded, scaler=scaler) < 1e-4
+
+
+def test_verify_folded_model_detects_mismatch():
+    """정규화를 빠뜨리고 접은 모델은 허용 오차를 넘어 ValueError"""
+    model, scaler = _batch_norm_model(), _scaler()
+    folded = fold_inference_graph(model)
+
+    with pytest.raises(ValueError):
+        verify_folded_model(model, folded, scaler=scaler)
+
+
+def test_fold_rejects_unsupported_layers():
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(12,)),
+        keras.layers.Dense(8, activation='relu'),
+        keras.layers.LayerNormalization(),
+        keras.layers.Dense(3, activation='sigmoid')
+    ])
+
+    with pytest.raises(ValueError):
+        fold_inference_graph(model)
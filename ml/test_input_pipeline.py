@@ -0,0 +1,34 @@
+"""
+입력 파이프라인 테스트 (python -m pytest ml/test_input_pipeline.py)
+
+교차 검증 폴드가 원본과 증강본 그룹을 나누지 않고 모든 샘플을 정확히 한 번씩
+검증에 사용하는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from input_pipeline import kfold_splits
+
+
+def test_kfold_splits_keep_groups_disjoint():
+    """같은 그룹(원본 + 증강본)은 한 폴드의 검증에만 들어가야 함"""
+    num_samples, group_size, k = 103, 4, 5
+    splits = kfold_splits(num_samples, k=k, group_size=group_size, seed=7)
+
+    assert len(splits) == k
+    validation_counts = np.zeros(num_samples, dtype=int)
+    for train_rows, val_rows in splits:
+        assert len(val_rows) > 0
+        assert np.intersect1d(train_rows, val_rows).size == 0
+        assert len(train_rows) + len(val_rows) == num_samples
+        assert np.intersect1d(train_rows // group_size, val_rows // group_size).size == 0
+        validation_counts[val_rows] += 1
+    assert np.all(validation_counts == 1)
+
+
+@pytest.mark.parametrize('k', [0, 1, 27])
+def test_kfold_splits_rejects_invalid_fold_count(k):
+    # 103행, 그룹 크기 4 → 26개 그룹
+    with pytest.raises(ValueError):
+        kfold_splits(103, k=k, group_size=4)
@@ -0,0 +1,74 @@
+"""
+NumPy 추론 엔진 테스트 (python -m pytest ml/test_numpy_runtime.py)
+
+write_tfjs_model로 내보낸 model.json을 NumpyModel로 읽어 Keras 추론과 같은 출력을
+내는지, Sequential(BatchNormalization·Dropout 포함)과 다중 헤드 Functional 모델로 확인합니다.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from lazy_imports import lazy_import
+from numpy_runtime import NumpyModel, verify_export_parity
+from tfjs_export import write_tfjs_model
+from train_model import create_improved_model, create_multihead_model
+
+keras = lazy_import('tensorflow.keras')
+
+
+def _randomize_batch_norm(model, seed=0):
+    """기본값(평균 0, 분산 1)이면 BatchNormalization이 거의 항등이므로 임의의 통계로 바꿈"""
+    rng = np.random.default_rng(seed)
+    for layer in model.layers:
+        if isinstance(layer, keras.layers.BatchNormalization):
+            units = layer.gamma.shape[0]
+            layer.set_weights([
+                rng.uniform(0.5, 2.0, units), rng.normal(0, 0.5, units),
+                rng.normal(0, 0.5, units), rng.uniform(0.5, 2.0, units)
+            ])
+
+
+def test_sequential_matches_keras(tmp_path):
+    keras.utils.set_random_seed(0)
+    model = create_improved_model(15, 2, 'e-i')
+    _randomize_batch_norm(model)
+    write_tfjs_model(model, str(tmp_path))
+    inputs = np.random.default_rng(1).random((200, 15), dtype=np.float32)
+
+    assert verify_export_parity(model, str(tmp_path), inputs) < 1e-5
+    # batch_size로 나눠 추론해도 한 번에 계산한 결과와 같아야 함
+    exported = NumpyModel.load(str(tmp_path))
+    np.testing.assert_allclose(exported.predict(inputs, batch_size=64), exported.predict(inputs), atol=1e-6)
+
+
+def test_multihead_outputs_follow_output_layers(tmp_path):
+    """다중 헤드 모델은 output_layers 순서대로 헤드별 출력을 반환해야 함"""
+    keras.utils.set_random_seed(0)
+    model = create_multihead_model(15, {'e-i': 2, 's-n': 2, 't-f': 2, 'j-p': 2})
+    _randomize_batch_norm(model)
+    write_tfjs_model(model, str(tmp_path))
+    inputs = np.random.default_rng(2).random((100, 15), dtype=np.float32)
+
+    exported = NumpyModel.load(str(tmp_path))
+
+    assert exported.output_names == ['e_i', 's_n', 't_f', 'j_p']
+    for actual, expected in zip(exported.predict(inputs), model.predict(inputs, verbose=0)):
+        np.testing.assert_allclose(actual, expected, atol=1e-5)
+    assert verify_export_parity(model, str(tmp_path)) < 1e-5
+
+
+def test_verify_export_parity_detects_mismatch(tmp_path):
+    """내보낸 가중치가 Keras 모델과 다르면 ValueError, 양자화 내보내기는 넓은 허용 오차 사용"""
+    keras.utils.set_random_seed(0)
+    model = create_improved_model(15, 2, 's-n')
+    write_tfjs_model(model, str(tmp_path), quantization='uint8')
+    inputs = np.random.default_rng(3).random((100, 15), dtype=np.float32)
+
+    assert verify_export_parity(model, str(tmp_path), inputs, quantization='uint8') < 5e-2
+    with pytest.raises(ValueError):
+        verify_export_parity(model, str(tmp_path), inputs, atol=1e-9)
+
+    with open(tmp_path / 'model.json', encoding='utf-8') as f:
+        assert json.load(f)['weightsManifest'][0]['weights'][0]['quantization']['dtype'] == 'uint8'
@@ -0,0 +1,67 @@
+"""
+MBTI 팔레트 최근접 이웃 인덱스 테스트 (python -m pytest ml/test_palette_index.py)
+
+IVF 인덱스가 모든 클러스터를 탐색하면 brute force k-NN과 같은 결과를 내는지,
+바이너리 파일로 저장·메모리 매핑 로드한 뒤에도 같은 검색 결과가 나오는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from palette_index import PaletteIndex, brute_force_knn
+
+
+def _index(num_palettes, num_lists, seed=5):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, 256, (num_palettes, 15), dtype=np.uint8)
+    labels = rng.integers(0, 2, num_palettes)
+    return codes, labels, PaletteIndex.build(codes, labels, ['E', 'I'], num_lists=num_lists)
+
+
+def test_palette_index_full_probe_matches_brute_force():
+    """모든 클러스터를 탐색하면(nprobe=num_lists) 정확한 k-NN과 같아야 함"""
+    codes, labels, index = _index(600, 12)
+    queries = np.random.default_rng(6).random((40, 15), dtype=np.float32)
+
+    distances, ids = index.search(queries, k=7, nprobe=index.num_lists)
+    expected_distances, expected_ids = brute_force_knn(codes.astype(np.float32) / 255.0, queries, k=7)
+
+    np.testing.assert_array_equal(ids, expected_ids)
+    np.testing.assert_allclose(distances, expected_distances, rtol=1e-4, atol=1e-5)
+    assert index.labels_of(ids[0]) == [['E', 'I'][label] for label in labels[ids[0]]]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """저장한 파일을 메모리 매핑으로 읽어도 같은 검색 결과·라벨·팔레트를 반환해야 함"""
+    codes, _, index = _index(300, 6)
+    queries = np.random.default_rng(7).random((10, 15), dtype=np.float32)
+
+    restored = PaletteIndex.load(index.save(str(tmp_path / 'palette_index.bin')))
+
+    assert len(restored) == 300 and restored.num_lists == 6
+    for actual, expected in zip(restored.search(queries, k=5, nprobe=2), index.search(queries, k=5, nprobe=2)):
+        np.testing.assert_array_equal(actual, expected)
+    ids = index.search(queries[:1], k=5)[1][0]
+    assert restored.labels_of(ids) == index.labels_of(ids)
+    assert restored.palettes_of(ids) == [
+        [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in codes[i].reshape(5, 3).tolist()] for i in ids
+    ]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'not_an_index.bin'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        PaletteIndex.load(str(path))
+
+
+def test_search_pads_missing_candidates():
+    """후보가 k개보다 적으면 거리 inf, 행 번호 -1로 채우고 라벨·팔레트는 None"""
+    _, _, index = _index(4, 2)
+
+    distances, ids = index.search(np.zeros((1, 15), dtype=np.float32), k=6, nprobe=2)
+
+    assert sorted(ids[0, :4].tolist()) == [0, 1, 2, 3]
+    assert ids[0, 4:].tolist() == [-1, -1] and np.all(np.isinf(distances[0, 4:]))
+    assert index.labels_of(ids[0])[4:] == [None, None]
+    assert index.palettes_of(ids[0])[4:] == [None, None]
@@ -0,0 +1,74 @@
+"""
+구조적 가지치기 테스트 (python -m pytest ml/test_pruning.py)
+
+커널 열과 편향이 모두 0인 ReLU 유닛은 출력에 기여하지 않으므로, 내보내기 전에
+Dense 레이어에서 지워도 모델 출력이 그대로여야 합니다.
+"""
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from pruning import active_units, polynomial_sparsity, remove_pruned_units, unit_pruning_callback
+
+keras = lazy_import('tensorflow.keras')
+
+
+def _dense_model(widths, input_dim, output_dim, seed=0):
+    keras.utils.set_random_seed(seed)
+    return keras.Sequential(
+        [keras.Input(shape=(input_dim,))] +
+        [keras.layers.Dense(width, activation='relu') for width in widths] +
+        [keras.layers.Dense(output_dim, activation='sigmoid')]
+    )
+
+
+def test_remove_pruned_units_is_exact():
+    """커널 열과 편향이 0인 ReLU 유닛을 지워도 출력이 같아야 함"""
+    model = _dense_model([32, 16], 20, 15)
+    weights = model.get_weights()
+    dead_first, dead_second = [0, 3, 4, 10, 31], [1, 2, 15]
+    weights[0][:, dead_first] = 0.0
+    weights[1][dead_first] = 0.0
+    weights[2][:, dead_second] = 0.0
+    weights[3][dead_second] = 0.0
+    # 커널 열만 0이고 편향이 남은 유닛은 출력이 상수이므로 유지되어야 함
+    weights[0][:, 5] = 0.0
+    weights[1][5] = 0.25
+    model.set_weights(weights)
+
+    narrow, widths = remove_pruned_units(model)
+
+    assert widths == [(32, 32 - len(dead_first)), (16, 16 - len(dead_second))]
+    inputs = np.random.default_rng(2).standard_normal((128, 20)).astype(np.float32)
+    np.testing.assert_allclose(narrow.predict(inputs, verbose=0), model.predict(inputs, verbose=0),
+                               atol=1e-6)
+
+
+def test_remove_pruned_units_keeps_unpruned_model():
+    model = _dense_model([8], 4, 2)
+    narrow, widths = remove_pruned_units(model)
+    assert narrow is model
+    assert widths == [(8, 8)]
+
+
+def test_polynomial_sparsity_schedule():
+    schedule = [polynomial_sparsity(epoch, 0.5, 2, 6) for epoch in range(9)]
+    assert schedule[:2] == [0.0, 0.0]
+    assert all(a < b for a, b in zip(schedule[1:7], schedule[2:7]))
+    assert schedule[6:] == [0.5, 0.5, 0.5]
+
+
+def test_unit_pruning_callback_reaches_target_sparsity():
+    """학습이 끝나면 은닉 레이어마다 목표 비율의 유닛이 0이고, 제거 후 출력이 같아야 함"""
+    model = _dense_model([32, 16], 10, 4)
+    model.compile(optimizer='adam', loss='mse')
+    rng = np.random.default_rng(3)
+    X, y = rng.random((256, 10), dtype=np.float32), rng.random((256, 4), dtype=np.float32)
+
+    model.fit(X, y, epochs=4, batch_size=64, verbose=0,
+              callbacks=[unit_pruning_callback(0.5, begin_epoch=0, end_epoch=2)])
+
+    assert list(active_units(model).values()) == [(32, 16), (16, 8)]
+    narrow, widths = remove_pruned_units(model)
+    assert widths == [(32, 16), (16, 8)]
+    np.testing.assert_allclose(narrow.predict(X, verbose=0), model.predict(X, verbose=0), atol=1e-6)
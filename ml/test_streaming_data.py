@@ -0,0 +1,71 @@
+"""
+디스크 스트리밍 학습 데이터 테스트 (python -m pytest ml/test_streaming_data.py)
+
+청크 단위로 누적한 정규화 통계와 배치·행 수집이 메모리 전체를 쓰는 sklearn
+StandardScaler와 불리언 인덱싱과 같은 결과를 내는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from streaming_data import (
+    StreamingStandardScaler, count_batches, fit_streaming_scaler, gather_rows,
+    iter_streaming_batches, split_mask
+)
+
+
+def _data(num_samples=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = (rng.standard_normal((num_samples, 12)) * rng.uniform(0.1, 5, 12) + rng.normal(0, 3, 12))
+    X[:, 3] = 2.5  # 분산 0인 특성
+    y = rng.random((num_samples, 4))
+    return X.astype(np.float32), y.astype(np.float32)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 64, 333, 5000])
+def test_streaming_scaler_matches_sklearn(chunk_size):
+    """청크 크기와 관계없이 sklearn StandardScaler와 같은 통계와 변환 결과여야 함"""
+    X, _ = _data()
+    val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+
+    streaming = fit_streaming_scaler(X, ~val_mask, chunk_size=chunk_size)
+    reference = StandardScaler().fit(X[~val_mask])
+
+    assert streaming.n_samples_seen_ == reference.n_samples_seen_
+    assert streaming.n_features_in_ == reference.n_features_in_
+    np.testing.assert_allclose(streaming.mean_, reference.mean_, rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(streaming.var_, reference.var_, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(streaming.scale_, reference.scale_, rtol=1e-8)
+    np.testing.assert_allclose(streaming.transform(X), reference.transform(X), rtol=1e-5, atol=1e-5)
+
+
+def test_from_stats_restores_transform():
+    X, _ = _data()
+    scaler = fit_streaming_scaler(X)
+    restored = StreamingStandardScaler.from_stats(scaler.mean_.tolist(), scaler.scale_.tolist())
+    np.testing.assert_array_equal(restored.transform(X), scaler.transform(X))
+
+
+@pytest.mark.parametrize('chunk_size,batch_size', [(100, 32), (7, 32), (1000, 64)])
+def test_streaming_batches_cover_rows_once(chunk_size, batch_size):
+    """섞어도 검증 마스크의 행을 정확히 한 번씩, 마지막을 제외하면 batch_size로 반환해야 함"""
+    X, y = _data(num_samples=1000)
+    X[:, 0] = np.arange(len(X))
+    row_mask = ~split_mask(len(X), test_size=0.2, random_state=42)
+
+    batches = list(iter_streaming_batches(X, y, row_mask, chunk_size, batch_size,
+                                          shuffle=True, rng=np.random.default_rng(0)))
+
+    assert len(batches) == count_batches(int(np.count_nonzero(row_mask)), batch_size)
+    assert all(len(batch_X) == batch_size for batch_X, _ in batches[:-1])
+    rows = np.concatenate([batch_X[:, 0] for batch_X, _ in batches]).astype(int)
+    np.testing.assert_array_equal(np.sort(rows), np.flatnonzero(row_mask))
+    np.testing.assert_array_equal(np.concatenate([batch_y for _, batch_y in batches]), y[rows])
+
+
+def test_gather_rows_matches_boolean_indexing():
+    X, _ = _data()
+    val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+    np.testing.assert_array_equal(gather_rows(X, val_mask, chunk_size=77), X[val_mask])
+    np.testing.assert_array_equal(gather_rows(X, val_mask, limit=50, chunk_size=77), X[val_mask][:50])
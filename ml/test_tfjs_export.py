@@ -0,0 +1,63 @@
+"""
+TensorFlow.js 내보내기 테스트 (python -m pytest ml/test_tfjs_export.py)
+
+샤드로 나눠 기록한 가중치가 model.json의 weightsManifest 순서대로 다시 읽혀
+원래 모델(양자화한 경우 quantize_weight로 복원한 가중치)과 같은 출력을 내는지
+작은 Dense 모델로 확인합니다.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from lazy_imports import lazy_import
+from numpy_runtime import NumpyModel
+from tfjs_export import quantize_weight, read_weight_shards, write_tfjs_model
+
+keras = lazy_import('tensorflow.keras')
+
+
+def _dense_model(widths, input_dim, output_dim, seed=0):
+    keras.utils.set_random_seed(seed)
+    return keras.Sequential(
+        [keras.Input(shape=(input_dim,))] +
+        [keras.layers.Dense(width, activation='relu') for width in widths] +
+        [keras.layers.Dense(output_dim, activation='sigmoid')]
+    )
+
+
+@pytest.mark.parametrize('quantization', [None, 'float16', 'uint16', 'uint8'])
+def test_weight_shards_round_trip(tmp_path, quantization):
+    """샤드로 나눠 기록한 가중치가 quantize_weight의 복원 값 그대로 읽혀야 함"""
+    model = _dense_model([24, 12], 10, 6)
+
+    paths = write_tfjs_model(model, str(tmp_path), num_shards=3, quantization=quantization)
+
+    assert len(paths) == 3
+    assert all(path.startswith('group1-shard') for path in paths)
+    exported = NumpyModel.load(str(tmp_path))
+    inputs = np.random.default_rng(1).standard_normal((64, 10)).astype(np.float32)
+    # 양자화한 가중치를 Keras 모델에 넣으면 NumPy 추론과 같은 결과가 나와야 함
+    model.set_weights([
+        weight if quantization is None else quantize_weight(weight, quantization)[2]
+        for weight in model.get_weights()
+    ])
+    np.testing.assert_allclose(exported.predict(inputs), model.predict(inputs, verbose=0), atol=1e-5)
+
+
+def test_read_weight_shards_dequantizes_exactly(tmp_path):
+    """uint8 affine 양자화의 복원 값은 quantize_weight와 같고, 0은 격자 위에 있어 float32 오차만 남아야 함"""
+    model = _dense_model([16], 8, 4)
+    weights = model.get_weights()
+    weights[0][:, :3] = 0.0
+    model.set_weights(weights)
+
+    write_tfjs_model(model, str(tmp_path), quantization='uint8')
+
+    with open(tmp_path / 'model.json', encoding='utf-8') as f:
+        manifest = json.load(f)['weightsManifest']
+    restored = list(read_weight_shards(str(tmp_path), manifest).values())
+    for weight, array in zip(model.get_weights(), restored):
+        np.testing.assert_array_equal(array, quantize_weight(weight, 'uint8')[2])
+    assert np.all(np.abs(restored[0][:, :3]) < 1e-6)
@@ -0,0 +1,273 @@
+"""
+TensorFlow.js 모델 내보내기 공통 모듈
+모델 구조 변환과 가중치 샤드(group1-shardXofY.bin) 기록을 담당합니다.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# TensorFlow.js 변환기의 기본 샤드 크기 (4MB)
+DEFAULT_SHARD_SIZE_BYTES = 4 * 1024 * 1024
+SHARD_ALIGNMENT_BYTES = 4
+
+
+def convert_topology_for_tfjs(model_config):
+    """Keras 모델 구성을 TensorFlow.js가 읽을 수 있는 형식으로 변환"""
+    if 'config' not in model_config or 'layers' not in model_config['config']:
+        return model_config
+
+    config = model_config['config']
+    for layer in config['layers']:
+        # InputLayer의 batch_shape를 inputShape로 변환
+        if (layer.get('module') == 'keras.layers' and
+                layer.get('class_name') == 'InputLayer'):
+            layer_config = layer.get('config', {})
+            if 'batch_shape' in layer_config:
+                batch_shape = layer_config['batch_shape']
+                if batch_shape and len(batch_shape) > 1:
+                    # batch_shape [null, 15] -> inputShape [15]
+                    layer_config['inputShape'] = batch_shape[1:]
+                # batch_shape 제거
+                del layer_config['batch_shape']
+
+        # Functional 모델: Keras 3 inbound_nodes를 [[[이름, 노드, 텐서, {}]]] 형식으로 변환
+        nodes = layer.get('inbound_nodes')
+        if nodes and isinstance(nodes[0], dict):
+            layer['inbound_nodes'] = [
+                [arg['config']['keras_history'] + [{}] for arg in node['args']]
+                for node in nodes
+            ]
+
+    # 단일 입력/출력도 [[이름, 노드, 텐서]] 목록 형식으로 통일
+    for key in ['input_layers', 'output_layers']:
+        if key in config and config[key] and isinstance(config[key][0], str):
+            config[key] = [config[key]]
+
+    return model_config
+
+
+def weight_names_for(model):
+    """model.get_weights() 순서에 맞는 TensorFlow.js 가중치 이름 목록"""
+    weight_names = []
+    for layer in model.layers:
+        if hasattr(layer, 'kernel'):
+            weight_names.append(f"{layer.name}/kernel")
+            if layer.use_bias:
+                weight_names.append(f"{layer.name}/bias")
+        elif hasattr(layer, 'gamma'):
+            # BatchNormalization 레이어
+            weight_names.extend([
+                f"{layer.name}/gamma",
+                f"{layer.name}/beta",
+                f"{layer.name}/moving_mean",
+                f"{layer.name}/moving_variance"
+            ])
+    return weight_names
+
+
+QUANTIZATION_DTYPES = {
+    'float16': np.float16,
+    'uint8': np.uint8,
+    'uint16': np.uint16
+}
+
+
+def quantize_weight(weight, quantization):
+    """가중치를 float16 또는 uint8/uint16 affine 양자화
+
+    반환값은 (기록할 배열, manifest quantization 항목, 복원된 float32 배열)입니다.
+    affine 양자화는 TensorFlow.js 변환기와 같이 0이 정확히 표현되도록
+    범위를 조정하며, 복원 값은 q * scale + min 입니다.
+    """
+    weight = np.asarray(weight, dtype=np.float32)
+    if quantization == 'float16':
+        quantized = weight.astype('<f2')
+        return quantized, {"dtype": "float16"}, quantized.astype(np.float32)
+
+    dtype = QUANTIZATION_DTYPES[quantization]
+    quant_max = np.iinfo(dtype).max
+    min_val = min(float(weight.min()), 0.0) if weight.size else 0.0
+    max_val = max(float(weight.max()), 0.0) if weight.size else 0.0
+    if max_val == min_val:
+        scale = 1.0
+        min_val = 0.0
+    else:
+        scale = (max_val - min_val) / quant_max
+        # 0이 정수 격자 위에 오도록 min을 보정
+        min_val = -round(-min_val / scale) * scale
+
+    quantized = np.clip(np.round((weight - min_val) / scale), 0, quant_max).astype(dtype)
+    dequantized = quantized.astype(np.float32) * np.float32(scale) + np.float32(min_val)
+    return quantized, {"dtype": quantization, "scale": scale, "min": min_val}, dequantized
+
+
+def _resolve_shard_size(total_bytes, num_shards, shard_size_bytes):
+    """샤드 수 또는 샤드 크기 설정을 정렬된 샤드 크기(바이트)로 변환"""
+    if num_shards:
+        shard_size_bytes = -(-total_bytes // num_shards)
+    shard_size_bytes = shard_size_bytes or DEFAULT_SHARD_SIZE_BYTES
+    # 샤드 경계를 4바이트 단위로 맞춤
+    return max(SHARD_ALIGNMENT_BYTES,
+               -(-shard_size_bytes // SHARD_ALIGNMENT_BYTES) * SHARD_ALIGNMENT_BYTES)
+
+
+def write_weight_shards(weights, weight_names, model_dir, num_shards=None,
+                        shard_size_bytes=DEFAULT_SHARD_SIZE_BYTES, quantization=None):
+    """가중치를 하나의 그룹으로 이어 붙여 고정 크기 샤드 파일로 기록
+
+    TensorFlow.js는 그룹의 샤드를 순서대로 이어 붙인 버퍼에서 manifest의
+    weights 순서대로 각 텐서를 잘라 읽습니다. 따라서 각 가중치의 오프셋은
+    앞선 가중치들의 바이트 크기 합이며, 반환되는 offsets와 일치합니다.
+    num_shards를 지정하면 그 개수로, 아니면 shard_size_bytes 단위로 나눕니다.
+    quantization('float16', 'uint8', 'uint16')을 지정하면 각 텐서를 양자화해
+    기록하고 manifest에 TensorFlow.js quantization 항목을 추가합니다.
+    """
+    entries = []
+    buffers = []
+    offsets = []
+    offset = 0
+    for i, weight in enumerate(weights):
+        entry = {
+            "name": weight_names[i] if i < len(weight_names) else f"weight_{i}",
+            "shape": list(weight.shape),
+            "dtype": "float32"
+        }
+        if quantization:
+            quantized, entry["quantization"], _ = quantize_weight(weight, quantization)
+            data = np.ascontiguousarray(
+                quantized, dtype=quantized.dtype.newbyteorder('<')
+            ).tobytes()
+        else:
+            data = np.ascontiguousarray(weight, dtype='<f4').tobytes()
+        buffers.append(data)
+        offsets.append(offset)
+        offset += len(data)
+        entries.append(entry)
+
+    payload = b''.join(buffers)
+    shard_size = _resolve_shard_size(len(payload), num_shards, shard_size_bytes)
+    shard_count = max(1, -(-len(payload) // shard_size))
+
+    paths = []
+    for shard in range(shard_count):
+        path = f"group1-shard{shard + 1}of{shard_count}.bin"
+        with open(os.path.join(model_dir, path), 'wb') as f:
+            f.write(payload[shard * shard_size:(shard + 1) * shard_size])
+        paths.append(path)
+
+    weights_manifest = [{
+        "paths": paths,
+        "weights": entries
+    }]
+    return weights_manifest, offsets
+
+
+def write_tfjs_model(model, model_dir, num_shards=None,
+                     shard_size_bytes=DEFAULT_SHARD_SIZE_BYTES, quantization=None):
+    """모델 구조(model.json)와 가중치 샤드를 model_dir에 기록하고 샤드 파일 목록 반환"""
+    # 1. 모델 구조를 TensorFlow.js 형식으로 변환
+    model_config = convert_topology_for_tfjs(json.loads(model.to_json()))
+
+    # 2. 가중치를 샤드로 묶어 저장
+    weights_manifest, _ = write_weight_shards(
+        model.get_weights(), weight_names_for(model), model_dir,
+        num_shards=num_shards, shard_size_bytes=shard_size_bytes,
+        quantization=quantization
+    )
+
+    # 3. model.json 파일 생성 (TensorFlow.js 호환 형식)
+    model_json = {
+        "modelTopology": model_config,
+        "weightsManifest": weights_manifest
+    }
+
+    with open(os.path.join(model_dir, 'model.json'), 'w') as f:
+        json.dump(model_json, f, indent=2)
+
+    return weights_manifest[0]["paths"]
+
+
+def read_weight_shards(model_dir, weights_manifest):
+    """manifest에 따라 샤드를 이어 붙여 {이름: 배열} 형태로 복원"""
+    weights = {}
+    for group in weights_manifest:
+        chunks = []
+        for path in group["paths"]:
+            with open(os.path.join(model_dir, path), 'rb') as f:
+                chunks.append(f.read())
+        payload = b''.join(chunks)
+        offset = 0
+        for entry in group["weights"]:
+            count = int(np.prod(entry["shape"])) if entry["shape"] else 1
+            quantization = entry.get("quantization")
+            if quantization:
+                dtype = np.dtype(QUANTIZATION_DTYPES[quantization["dtype"]]).newbyteorder('<')
+            else:
+                dtype = np.dtype('<f4')
+            array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+            offset += count * dtype.itemsize
+
+            # 양자화된 가중치는 float32로 복원
+            if quantization and quantization["dtype"] == 'float16':
+                array = array.astype(np.float32)
+            elif quantization:
+                array = (array.astype(np.float32) * np.float32(quantization["scale"])
+                         + np.float32(quantization["min"]))
+            weights[entry["name"]] = array.reshape(entry["shape"])
+    return weights
+
+
+def report_quantization_error(model, quantization, reference_inputs=None):
+    """양자화에 따른 텐서별 오차와 float32 모델 대비 팔레트 출력 오차 출력
+
+    reference_inputs가 주어지면 복원된 가중치를 넣은 복제 모델의 예측을
+    원본 예측과 비교하며, 오차는 0~255 RGB 단위로도 함께 보고합니다.
+    """
+    weights = model.get_weights()
+    names = weight_names_for(model)
+    dequantized = []
+    original_bytes = 0
+    quantized_bytes = 0
+
+    print(f"\n📉 {quantization} 양자화 오차 (텐서별):")
+    for i, weight in enumerate(weights):
+        quantized, _, restored = quantize_weight(weight, quantization)
+        dequantized.append(restored)
+        original_bytes += weight.size * 4
+        quantized_bytes += quantized.nbytes
+
+        error = np.abs(restored - weight)
+        name = names[i] if i < len(names) else f"weight_{i}"
+        print(f"   {name}: 최대 {error.max():.2e}, RMSE {np.sqrt(np.mean(error ** 2)):.2e}")
+
+    report = {
+        'quantization': quantization,
+        'original_bytes': original_bytes,
+        'quantized_bytes': quantized_bytes
+    }
+    print(f"   가중치 크기: {original_bytes / 1024:.1f}KB → {quantized_bytes / 1024:.1f}KB "
+          f"({original_bytes / max(quantized_bytes, 1):.1f}배 감소)")
+
+    if reference_inputs is not None:
+        import keras
+
+        quantized_model = keras.models.clone_model(model)
+        quantized_model.set_weights(dequantized)
+        reference = model.predict(reference_inputs, batch_size=1024, verbose=0)
+        predicted = quantized_model.predict(reference_inputs, batch_size=1024, verbose=0)
+        if isinstance(reference, dict):
+            reference = np.concatenate([reference[key] for key in sorted(reference)], axis=1)
+            predicted = np.concatenate([predicted[key] for key in sorted(predicted)], axis=1)
+        elif isinstance(reference, list):
+            reference = np.concatenate(reference, axis=1)
+            predicted = np.concatenate(predicted, axis=1)
+
+        diff = np.abs(predicted - reference)
+        report['output_mae'] = float(diff.mean())
+        report['output_max_error'] = float(diff.max())
+        print(f"   출력 오차 (float32 대비): 평균 {diff.mean():.2e}, 최대 {diff.max():.2e} "
+              f"(RGB 기준 평균 {diff.mean() * 255:.2f}, 최대 {diff.max() * 255:.2f})")
+
+    return report
@@ -5,27 +5,54 @@
 
 import json
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
 import os
 import random
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
+import time
 
-def load_diverse_face_color_data():
-    """다양한 얼굴-색상 데이터 로드"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_path = os.path.join(script_dir, "..", "public", "data", "diverse-face-color", "training-data.json")
+from lazy_imports import lazy_import
+import diversity_losses
+from dataset_cache import load_face_color_arrays, as_columnar_metadata
+from streaming_data import split_mask, make_streaming_dataset, gather_rows
+from input_pipeline import make_array_dataset, throughput_callback
+from training_telemetry import telemetry_callback, telemetry_log_path, publish_telemetry
+from pruning import (
+    prune_units, pruning_report_path, remove_pruned_units, publish_pruning_report,
+    save_pruned_checkpoint, discard_pruned_checkpoint
+)
+from tfjs_export import write_tfjs_model, report_quantization_error, DEFAULT_SHARD_SIZE_BYTES
+from graph_optimizer import fold_inference_graph, verify_folded_model
+from numpy_runtime import verify_export_parity
+from descriptor_projection import (
+    project_descriptor_inputs, load_descriptor_projection, fuse_descriptor_projection,
+    verify_fused_projection
+)
+from color_evaluation import evaluate_color_model, print_diversity_report
+from warm_start import (
+    load_training_state, save_training_state, incremental_rows, report_warm_start_savings,
+    held_out_inputs
+)
+
+# TensorFlow/Keras는 실제로 사용하는 시점에 임포트 (분석·내보내기 명령의 시작 시간 단축)
+keras = lazy_import('tensorflow.keras')
+
+CHECKPOINT_PATH = 'best_diverse_face_to_color_model.h5'
+
+def load_diverse_face_color_data(use_cache=True, data_path=None):
+    """다양한 얼굴-색상 데이터 로드
+
+    use_cache=True이면 JSON을 한 번만 파싱해 바이너리 캐시(.npcache)를 만들고,
+    이후 실행에서는 X, y를 메모리 매핑으로, metadata를 컬럼 형태로 로드합니다.
+    data_path로 다른 JSON 파일이나 generate_diverse_data.py가 만든 바이너리
+    데이터셋 디렉토리를 지정할 수 있습니다.
+    """
+    if data_path is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        data_path = os.path.join(script_dir, "..", "public", "data", "diverse-face-color", "training-data.json")
     data_path = os.path.normpath(data_path)
     
     print(f"📊 데이터 로드 중: {data_path}")
     
-    with open(data_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    X = np.array(data['X'], dtype=np.float32)
-    y = np.array(data['y'], dtype=np.float32)
-    metadata = data['metadata']
+    X, y, metadata = load_face_color_arrays(data_path, use_cache=use_cache)
     
     print(f"   입력 차원: {X.shape[1]} (descriptor 128 + 특징 15 + 랜덤 5)")
     print(f"   출력 차원: {y.shape[1]}")
@@ -49,35 +76,28 @@ def load_diverse_face_color_data():
     return X, y, metadata
 
 def analyze_color_diversity(y, metadata):
-    """색상 다양성 분석"""
+    """색상 다양성 분석
+
+    metadata를 컬럼 형태(ColumnarMetadata)로 한 번 변환한 뒤 카테고리 분포,
+    특성 범위, 고유 색상 수를 벡터 연산으로 계산합니다.
+    """
     print("\n🌈 색상 다양성 분석:")
+    columns = as_columnar_metadata(metadata)
     
     # 색상 카테고리 분포
-    categories = {}
-    for item in metadata:
-        category = item['colorCategory']
-        categories[category] = categories.get(category, 0) + 1
-    
     print("   색상 카테고리 분포:")
-    for category, count in categories.items():
-        print(f"     {category}: {count}개 ({count/len(metadata)*100:.1f}%)")
+    for category, count in columns.category_counts().items():
+        if count:
+            print(f"     {category}: {count}개 ({count/len(columns)*100:.1f}%)")
     
     # 색상 특성 분석
-    brightness_values = [item['colorCharacteristics']['brightness'] for item in metadata]
-    saturation_values = [item['colorCharacteristics']['saturation'] for item in metadata]
-    temperature_values = [item['colorCharacteristics']['temperature'] for item in metadata]
-    
-    print(f"   밝기 범위: {min(brightness_values):.3f} ~ {max(brightness_values):.3f}")
-    print(f"   채도 범위: {min(saturation_values):.3f} ~ {max(saturation_values):.3f}")
-    print(f"   색온도 범위: {min(temperature_values):.3f} ~ {max(temperature_values):.3f}")
+    ranges = columns.characteristic_ranges()
+    print(f"   밝기 범위: {ranges['brightness'][0]:.3f} ~ {ranges['brightness'][1]:.3f}")
+    print(f"   채도 범위: {ranges['saturation'][0]:.3f} ~ {ranges['saturation'][1]:.3f}")
+    print(f"   색온도 범위: {ranges['temperature'][0]:.3f} ~ {ranges['temperature'][1]:.3f}")
     
     # 고유 색상 수 계산
-    unique_colors = set()
-    for item in metadata:
-        for color in item['colors']:
-            unique_colors.add(color)
-    
-    print(f"   고유 색상 수: {len(unique_colors)}개")
+    print(f"   고유 색상 수: {columns.unique_color_count()}개")
 
 def create_enhanced_diverse_model(input_dim=148, output_dim=15):
     """실제 데이터 특성을 반영한 향상된 모델"""
@@ -116,64 +136,38 @@ def create_enhanced_diverse_model(input_dim=148, output_dim=15):
     
     return model
 
-def create_improved_diversity_loss():
-    """실제 데이터 특성을 반영한 개선된 손실 함수"""
-    def improved_diversity_loss(y_true, y_pred):
-        # 기본 MSE 손실
-        mse_loss = tf.keras.losses.mse(y_true, y_pred)
-        
-        # 극값에 대한 가중치 조정 (실제 데이터 특성 반영)
-        # 물리적 특징의 극값(0, 1)에 더 높은 가중치 부여
-        extreme_value_mask = tf.cast(
-            (tf.abs(y_true - 0.0) < 0.01) | (tf.abs(y_true - 1.0) < 0.01), 
-            tf.float32
-        )
-        extreme_weight = 1.0 + 0.5 * extreme_value_mask  # 극값에 1.5배 가중치
-        weighted_mse = tf.reduce_mean(tf.square(y_true - y_pred) * extreme_weight)
-        
-        # 색상 다양성 손실 (색상 간 거리 최대화)
-        batch_size = tf.shape(y_pred)[0]
-        colors = tf.reshape(y_pred, (batch_size, 5, 3))
-        
-        # 색상 간 평균 거리 계산
-        color_distances = []
-        for i in range(5):
-            for j in range(i+1, 5):
-                dist = tf.norm(colors[:, i, :] - colors[:, j, :], axis=1)
-                color_distances.append(dist)
-        
-        if color_distances:
-            avg_distance = tf.reduce_mean(tf.stack(color_distances, axis=1), axis=1)
-            diversity_penalty = tf.exp(-avg_distance * 2)  # 더 강한 다양성 페널티
-        else:
-            diversity_penalty = 0
-        
-        # 색상 대비 손실 (색상 간 대비 최대화)
-        color_contrast = tf.reduce_mean(tf.math.reduce_std(colors, axis=1))  # 각 색상의 표준편차
-        contrast_penalty = tf.exp(-color_contrast * 3)  # 대비가 낮으면 페널티
-        
-        # 최종 손실 = 가중 MSE + 다양성 페널티 + 대비 페널티
-        return weighted_mse + 0.15 * tf.reduce_mean(diversity_penalty) + 0.1 * contrast_penalty
-    
-    return improved_diversity_loss
+def create_improved_diversity_loss(extreme_weight=0.5, diversity_weight=0.15, contrast_weight=0.1):
+    """실제 데이터 특성을 반영한 개선된 손실 함수
 
-def improved_data_preprocessing(X, y):
-    """실제 데이터 특성을 반영한 개선된 전처리"""
+    극값 가중 MSE + 다양성 페널티 + 대비 페널티를 쌍 거리 행렬 연산으로 계산합니다
+    (diversity_losses.create_improved_diversity_loss).
+    """
+    return diversity_losses.create_improved_diversity_loss(
+        extreme_weight=extreme_weight,
+        diversity_weight=diversity_weight,
+        contrast_weight=contrast_weight
+    )
+
+def improved_data_preprocessing(X, y, descriptor_dim=128):
+    """실제 데이터 특성을 반영한 개선된 전처리
+
+    descriptor_dim은 앞쪽 descriptor 블록의 폭입니다 (descriptor 투영 시 투영 차원).
+    """
     print("🔧 실제 데이터 특성을 반영한 전처리...")
     
     # 각 특성별로 다른 정규화 전략 적용
     X_processed = X.copy()
     
-    # 얼굴 descriptor (0-127): 이미 -0.35~0.35 범위로 정규화됨
-    descriptor_data = X_processed[:, :128]
+    # 얼굴 descriptor (0-127): 이미 -0.35~0.35 범위로 정규화됨 (투영 시 주성분 점수)
+    descriptor_data = X_processed[:, :descriptor_dim]
     print(f"   얼굴 descriptor: 범위 {descriptor_data.min():.3f} ~ {descriptor_data.max():.3f}")
     
     # 물리적 특징 (128-142): 0~1 범위, 극값 포함
-    physical_features = X_processed[:, 128:143]
+    physical_features = X_processed[:, descriptor_dim:descriptor_dim + 15]
     print(f"   물리적 특징: 범위 {physical_features.min():.3f} ~ {physical_features.max():.3f}")
     
     # 랜덤 시드 (143-147): 0~1 범위
-    random_seeds = X_processed[:, 143:148]
+    random_seeds = X_processed[:, descriptor_dim + 15:descriptor_dim + 20]
     print(f"   랜덤 시드: 범위 {random_seeds.min():.3f} ~ {random_seeds.max():.3f}")
     
     # 각 특성별로 다른 정규화 적용
@@ -182,36 +176,124 @@ def improved_data_preprocessing(X, y):
     
     return X_processed, y
 
-def train_diverse_face_to_color_model(X, y, metadata):
-    """실제 데이터 특성을 반영한 개선된 모델 학습"""
+def train_diverse_face_to_color_model(X, y, metadata, streaming=False, chunk_size=65536,
+                                     max_eval_samples=100000, incremental=False,
+                                     replay_ratio=1.0, fine_tune_epochs=30, use_tf_data=False,
+                                     telemetry_log=None, profile_steps=None, prune_sparsity=None,
+                                     descriptor_rank=None):
+    """실제 데이터 특성을 반영한 개선된 모델 학습
+
+    streaming=True이면 X, y(메모리 매핑 배열)를 chunk_size 행 단위로 디스크에서
+    읽어 학습하므로 RAM보다 큰 데이터셋도 학습할 수 있습니다. 이때 반환되는
+    검증 데이터는 평가용으로 최대 max_eval_samples개만 모은 것입니다.
+    incremental=True이면 이전 최고 체크포인트에서 시작해 새로 추가된 샘플과
+    이전 데이터의 재현 샘플(새 샘플 × replay_ratio)만으로 최대 fine_tune_epochs
+    에포크 미세 조정하고, 콜드 스타트 대비 절약한 에포크와 시간을 출력합니다.
+    새 샘플이 없으면 미세 조정 없이 체크포인트 모델을 반환합니다 (history는 None).
+    use_tf_data=True이면 인덱스 기준으로 분할한 X, y를 tf.data 파이프라인으로
+    학습하므로 분할 시 데이터를 복사하지 않습니다.
+    telemetry_log를 지정하면 에포크별 성능 지표를 JSONL로 기록하고, profile_steps=(시작, 끝)이면
+    해당 스텝 구간의 TensorBoard 프로파일러 트레이스를 수집합니다 (training_telemetry).
+    prune_sparsity(0~1)를 지정하면 학습 후 은닉 Dense 유닛을 그 비율만큼 점진적으로
+    가지치기하고 미세 조정하며, 전후 품질을 pruning_report_path(체크포인트)에 기록하고
+    가지치기한 가중치를 pruned_checkpoint_path(체크포인트)에 저장합니다.
+    descriptor_rank를 지정하면 128차원 descriptor를 훈련 행의 PCA 주성분 descriptor_rank개로
+    투영한 입력으로 학습하고, 투영은 projection_path(체크포인트)에 저장합니다.
+    """
     print("🧠 실제 데이터 특성을 반영한 모델 학습 시작...")
     
-    # 개선된 전처리 적용
-    X_processed, y_processed = improved_data_preprocessing(X, y)
+    state = load_training_state(CHECKPOINT_PATH) if incremental else None
+    if incremental and state is None:
+        print(f"   ⚠️ 이전 체크포인트({CHECKPOINT_PATH})나 학습 상태가 없어 처음부터 학습합니다.")
     
-    # 데이터 분할
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_processed, y_processed, test_size=0.2, random_state=42
+    # descriptor 저차원 투영 (증분 학습은 체크포인트와 함께 저장된 투영을 그대로 사용)
+    projection, X = project_descriptor_inputs(
+        X, CHECKPOINT_PATH, descriptor_rank, resume=state is not None,
+        index_split=streaming or use_tf_data, chunk_size=chunk_size
     )
     
-    print(f"   훈련 데이터: {len(X_train)}개")
-    print(f"   검증 데이터: {len(X_val)}개")
-    
-    # 실제 데이터 특성에 맞는 정규화 (각 특성별로 다르게)
-    # descriptor는 이미 정규화되어 있으므로 그대로 사용
-    # 물리적 특징과 랜덤 시드는 0~1 범위이므로 그대로 사용
-    X_train_scaled = X_train
-    X_val_scaled = X_val
-    
-    # 모델 생성 (개선된 손실 함수 사용)
-    model = create_enhanced_diverse_model()
+    if state is not None:
+        # 증분 학습: 새 샘플 + 이전 데이터 재현 샘플만 메모리로 로드
+        rows, new_count = incremental_rows(
+            state['n_samples'], len(X), replay_ratio, np.random.default_rng(42)
+        )
+        print(f"   ♻️ 증분 학습: 새 샘플 {new_count}개 + 재현 샘플 {len(rows) - new_count}개")
+        if new_count == 0:
+            # 새 데이터가 없으면 미세 조정 없이 체크포인트 모델을 그대로 사용 (평가는 검증 분할로)
+            print("   ✅ 새 샘플이 없어 미세 조정을 건너뛰고 체크포인트 모델을 그대로 사용합니다.")
+            val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+            return (keras.models.load_model(CHECKPOINT_PATH, compile=False), None,
+                    gather_rows(X, val_mask, limit=max_eval_samples, chunk_size=chunk_size),
+                    gather_rows(y, val_mask, limit=max_eval_samples, chunk_size=chunk_size))
+        
+        from sklearn.model_selection import train_test_split
+        X_train, X_val, y_train, y_val = train_test_split(
+            np.asarray(X[rows], dtype=np.float32), np.asarray(y[rows], dtype=np.float32),
+            test_size=0.2, random_state=42
+        )
+        
+        print(f"   훈련 데이터: {len(X_train)}개")
+        print(f"   검증 데이터: {len(X_val)}개")
+        X_train_scaled = X_train
+        X_val_scaled = X_val
+        streaming = use_tf_data = False
+    elif streaming:
+        # 인덱스 기준 분할: 데이터 복사 없이 청크 단위 스트리밍
+        val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+        train_data = make_streaming_dataset(X, y, ~val_mask, chunk_size, batch_size=32, shuffle=True)
+        val_data = make_streaming_dataset(X, y, val_mask, chunk_size, batch_size=32, shuffle=False)
+        
+        print(f"   훈련 데이터: {int(np.count_nonzero(~val_mask))}개 (스트리밍, 청크 {chunk_size}행)")
+        print(f"   검증 데이터: {int(np.count_nonzero(val_mask))}개")
+    elif use_tf_data:
+        # 인덱스 기준 분할: 훈련/검증 데이터셋이 같은 X, y를 공유
+        val_mask = split_mask(len(X), test_size=0.2, random_state=42)
+        train_rows, val_rows = np.flatnonzero(~val_mask), np.flatnonzero(val_mask)
+        train_data = make_array_dataset(X, y, train_rows, batch_size=32, shuffle=True)
+        val_data = make_array_dataset(X, y, val_rows, batch_size=32, shuffle=False)
+        
+        print(f"   훈련 데이터: {len(train_rows)}개 (tf.data)")
+        print(f"   검증 데이터: {len(val_rows)}개")
+    else:
+        # 개선된 전처리 적용
+        X_processed, y_processed = improved_data_preprocessing(
+            X, y, descriptor_dim=projection.rank if projection is not None else 128
+        )
+        
+        # 데이터 분할
+        from sklearn.model_selection import train_test_split
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_processed, y_processed, test_size=0.2, random_state=42
+        )
+        
+        print(f"   훈련 데이터: {len(X_train)}개")
+        print(f"   검증 데이터: {len(X_val)}개")
+        
+        # 실제 데이터 특성에 맞는 정규화 (각 특성별로 다르게)
+        # descriptor는 이미 정규화되어 있으므로 그대로 사용
+        # 물리적 특징과 랜덤 시드는 0~1 범위이므로 그대로 사용
+        X_train_scaled = X_train
+        X_val_scaled = X_val
+    
+    if state is not None:
+        # 이전 최고 가중치에서 시작해 낮은 학습률로 미세 조정
+        model = keras.models.load_model(CHECKPOINT_PATH, compile=False)
+        learning_rate, epochs, patience = 0.0002, fine_tune_epochs, 5
+    else:
+        # 모델 생성 (개선된 손실 함수 사용)
+        model = create_enhanced_diverse_model(input_dim=X.shape[1])
+        learning_rate, epochs, patience = 0.0008, 100, 15
     
     # 개선된 손실 함수로 모델 재컴파일
     model.compile(
-        optimizer=keras.optimizers.Adam(learning_rate=0.0008),
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
         loss=create_improved_diversity_loss(),
         metrics=['mae', 'cosine_similarity']
     )
+    if state is not None:
+        # 새 검증 분할에서의 체크포인트 손실보다 좋아질 때만 체크포인트를 덮어씀
+        checkpoint_val_loss = float(model.evaluate(X_val_scaled, y_val, batch_size=32, verbose=0)[0])
+        print(f"   📌 체크포인트 모델 검증 손실: {checkpoint_val_loss:.4f}")
     
     # 모델 구조 출력
     print(f"\n📋 모델 구조:")
@@ -222,7 +304,7 @@ def train_diverse_face_to_color_model(X, y, metadata):
         # 조기 종료 (극값이 많아서 더 많은 에포크 필요)
         keras.callbacks.EarlyStopping(
             monitor='val_loss',
-            patience=15,  # 더 많은 인내심
+            patience=patience,  # 극값이 많아 더 많은 인내심 (미세 조정 시 5)
             restore_best_weights=True,
             verbose=1
         ),
@@ -238,89 +320,112 @@ def train_diverse_face_to_color_model(X, y, metadata):
         
         # 모델 체크포인트
         keras.callbacks.ModelCheckpoint(
-            'best_diverse_face_to_color_model.h5',
+            CHECKPOINT_PATH,
             monitor='val_loss',
             save_best_only=True,
+            initial_value_threshold=checkpoint_val_loss if state is not None else None,
             verbose=1
         )
     ]
     
     print(f"\n🚀 학습 시작 (실제 데이터 특성 반영):")
     print(f"   배치 크기: 32")
-    print(f"   최대 에포크: 100")
-    print(f"   조기 종료: 15 에포크 인내심")
+    print(f"   최대 에포크: {epochs}")
+    print(f"   조기 종료: {patience} 에포크 인내심")
     print(f"   학습률 감소: 8 에포크 인내심")
     
+    num_train = len(X_train) if not (streaming or use_tf_data) else int(np.count_nonzero(~val_mask))
+    pipeline = '스트리밍' if streaming else ('tf.data' if use_tf_data else 'NumPy 배열')
+    callbacks.append(throughput_callback(num_train, pipeline))
+    if telemetry_log:
+        callbacks.append(telemetry_callback(num_train, telemetry_log, pipeline, profile_steps))
+    
     # 학습 실행
-    history = model.fit(
-        X_train_scaled, y_train,
-        validation_data=(X_val_scaled, y_val),
-        epochs=100,
-        batch_size=32,
-        callbacks=callbacks,
-        verbose=1
-    )
+    start_time = time.perf_counter()
+    if streaming or use_tf_data:
+        history = model.fit(
+            train_data,
+            validation_data=val_data,
+            epochs=epochs,
+            callbacks=callbacks,
+            verbose=1
+        )
+        
+        # 평가용 검증 샘플만 메모리로 수집 (tf.data는 검증 데이터 전체)
+        eval_limit = max_eval_samples if streaming else None
+        X_val_scaled = gather_rows(X, val_mask, limit=eval_limit, chunk_size=chunk_size)
+        y_val = gather_rows(y, val_mask, limit=eval_limit, chunk_size=chunk_size)
+    else:
+        history = model.fit(
+            X_train_scaled, y_train,
+            validation_data=(X_val_scaled, y_val),
+            epochs=epochs,
+            batch_size=32,
+            callbacks=callbacks,
+            verbose=1
+        )
+    
+    # 다음 증분 학습을 위한 학습 상태 기록
+    elapsed = time.perf_counter() - start_time
+    epochs_run = len(history.history['loss'])
+    if state is not None:
+        report_warm_start_savings(state, epochs_run, elapsed, len(X))
+        if min(history.history['val_loss']) >= checkpoint_val_loss:
+            # 미세 조정이 체크포인트보다 나아지지 않았으면 체크포인트 가중치를 그대로 사용
+            print("   ↩️ 미세 조정이 체크포인트 검증 손실보다 낫지 않아 체크포인트 가중치를 사용합니다.")
+            model.set_weights(keras.models.load_model(CHECKPOINT_PATH, compile=False).get_weights())
+    save_training_state(CHECKPOINT_PATH, len(X), epochs_run, elapsed, previous_state=state,
+                        index_split=streaming or use_tf_data)
+    
+    # 구조적 가지치기 + 미세 조정 (체크포인트는 증분 학습용으로 가지치기 전 모델을 유지하고,
+    # 가지치기한 가중치는 다시 내보낼 수 있도록 별도 체크포인트에 저장)
+    if prune_sparsity:
+        if streaming or use_tf_data:
+            fit_kwargs = {'x': train_data, 'validation_data': val_data}
+        else:
+            fit_kwargs = {'x': X_train_scaled, 'y': y_train,
+                          'validation_data': (X_val_scaled, y_val), 'batch_size': 32}
+        prune_units(model, fit_kwargs, prune_sparsity, X_val_scaled, y_val,
+                    report_path=pruning_report_path(CHECKPOINT_PATH))
+        save_pruned_checkpoint(model, CHECKPOINT_PATH)
+    else:
+        discard_pruned_checkpoint(CHECKPOINT_PATH)
     
     return model, history, X_val_scaled, y_val
 
 def evaluate_model_performance(model, X_val, y_val, metadata):
-    """실제 데이터 특성을 반영한 모델 성능 평가"""
+    """실제 데이터 특성을 반영한 모델 성능 평가
+
+    검증 데이터 전체를 한 번만 예측해 회귀 지표, 극값 예측 정확도,
+    색상 다양성 지표를 함께 계산합니다.
+    """
     print("\n📊 실제 데이터 특성을 반영한 모델 성능 평가:")
     
-    # 예측 수행
-    y_pred = model.predict(X_val, verbose=0)
-    
-    # 기본 메트릭
-    mse = np.mean((y_val - y_pred) ** 2)
-    mae = np.mean(np.abs(y_val - y_pred))
+    results = evaluate_color_model(model, X_val, y_val)
     
-    print(f"   MSE: {mse:.6f}")
-    print(f"   MAE: {mae:.6f}")
+    print(f"   MSE: {results['mse']:.6f}")
+    print(f"   MAE: {results['mae']:.6f}")
     
     # 극값 예측 정확도 (실제 데이터 특성 반영)
-    extreme_mask = (np.abs(y_val - 0.0) < 0.01) | (np.abs(y_val - 1.0) < 0.01)
-    extreme_accuracy = np.mean(np.abs(y_val[extreme_mask] - y_pred[extreme_mask]) < 0.1)
-    print(f"   극값 예측 정확도: {extreme_accuracy:.3f}")
+    print(f"   극값 예측 정확도: {results['extreme_accuracy']:.3f}")
     
-    # 색상 다양성 평가
-    test_color_diversity(model, X_val, y_val)
+    # 색상 다양성 평가 (같은 예측 결과 사용)
+    print("\n🎨 색상 다양성 테스트:")
+    print_diversity_report(results)
     
-    return {
-        'mse': mse,
-        'mae': mae,
-        'extreme_accuracy': extreme_accuracy
-    }
+    return results
 
 def test_color_diversity(model, X_val, y_val):
-    """실제 데이터 특성을 반영한 색상 다양성 테스트"""
+    """실제 데이터 특성을 반영한 색상 다양성 테스트
+
+    검증 데이터 전체를 배치로 한 번 예측하고 고유 색상 수와 색상 간 거리를
+    벡터 연산으로 계산합니다.
+    """
     print("\n🎨 색상 다양성 테스트:")
     
-    # 예측 수행
-    predictions = model.predict(X_val[:100])  # 100개 샘플 테스트
-    
-    # 색상 다양성 분석
-    unique_colors = set()
-    color_distances = []
-    
-    for pred in predictions:
-        # 5개 색상으로 재구성
-        colors = pred.reshape(5, 3)
-        
-        for color in colors:
-            # RGB를 HEX로 변환
-            hex_color = rgb_to_hex(color[0], color[1], color[2])
-            unique_colors.add(hex_color)
-        
-        # 색상 간 거리 계산
-        for i in range(5):
-            for j in range(i+1, 5):
-                dist = np.linalg.norm(colors[i] - colors[j])
-                color_distances.append(dist)
-    
-    avg_distance = np.mean(color_distances)
-    print(f"   예측된 고유 색상 수: {len(unique_colors)}개")
-    print(f"   평균 색상 간 거리: {avg_distance:.3f}")
-    print(f"   색상 다양성 점수: {len(unique_colors) / 100 * 100:.1f}%")
+    results = evaluate_color_model(model, X_val, y_val)
+    print_diversity_report(results)
+    return results
 
 def rgb_to_hex(r, g, b):
     """RGB 값을 HEX로 변환"""
@@ -330,8 +435,25 @@ def rgb_to_hex(r, g, b):
     
     return f"#{to_hex(r)}{to_hex(g)}{to_hex(b)}"
 
-def save_diverse_model_as_tfjs(model, scaler):
-    """다양한 모델을 TensorFlow.js 형식으로 저장"""
+def save_diverse_model_as_tfjs(model, scaler, num_shards=None,
+                               shard_size_bytes=DEFAULT_SHARD_SIZE_BYTES,
+                               quantization=None, reference_inputs=None, optimize=False,
+                               projection=None):
+    """다양한 모델을 TensorFlow.js 형식으로 저장
+
+    가중치는 텐서별 파일 대신 num_shards개(또는 shard_size_bytes 단위)의
+    group1-shardXofY.bin 파일로 묶어 HTTP 요청 수를 줄입니다.
+    quantization('float16', 'uint8')을 지정하면 가중치를 양자화해 저장하고,
+    reference_inputs(정규화 전 입력)에 대한 float32 대비 팔레트 오차를 출력합니다.
+    저장한 model.json은 NumPy 추론으로 다시 읽어 Keras 출력과 같은지 확인합니다.
+    optimize=True이면 BatchNormalization과 정규화(scaler)를 Dense 가중치에 접고
+    Dropout을 제거한 Dense 전용 모델을 저장하므로, 클라이언트는 입력을
+    정규화하지 않고 바로 predict를 호출하면 됩니다.
+    projection(descriptor 투영)으로 학습한 모델은 optimize=True로만 저장할 수 있으며,
+    투영을 Dense 가중치로 합성하므로 내보낸 모델은 148차원 원본 입력을 그대로 받습니다.
+    같은 디렉토리를 쓰는 train_diverse_face_to_color의 teacher로 증류한 student는
+    삭제합니다 (distillation.discard_student_model).
+    """
     # 모델 저장 디렉토리 생성
     script_dir = os.path.dirname(os.path.abspath(__file__))
     model_dir = os.path.join(script_dir, "..", "public", "models", "diverse-face-to-color")
@@ -343,75 +465,64 @@ def save_diverse_model_as_tfjs(model, scaler):
         shutil.rmtree(model_dir)
     os.makedirs(model_dir, exist_ok=True)
     
-    print(f"🔄 다양한 얼굴-색상 모델을 TensorFlow.js 형식으로 저장 중...")
+    # 이전 teacher로 증류한 student는 브라우저에서 새 모델을 가리므로 함께 삭제
+    from distillation import discard_student_model
+    discard_student_model()
     
-    # 1. 모델 구조를 TensorFlow.js 형식으로 저장
-    model_topology = model.to_json()
-    model_config = json.loads(model_topology)
-    
-    # InputLayer의 batch_shape를 inputShape로 변환
-    if 'config' in model_config and 'layers' in model_config['config']:
-        for layer in model_config['config']['layers']:
-            if (layer.get('module') == 'keras.layers' and 
-                layer.get('class_name') == 'InputLayer'):
-                layer_config = layer.get('config', {})
-                if 'batch_shape' in layer_config:
-                    batch_shape = layer_config['batch_shape']
-                    if batch_shape and len(batch_shape) > 1:
-                        layer_config['inputShape'] = batch_shape[1:]
-                    del layer_config['batch_shape']
-    
-    # 2. 가중치 추출 및 저장
-    weights = model.get_weights()
-    weight_files = []
-    
-    for i, weight in enumerate(weights):
-        weight_file = f"weights_{i}.bin"
-        weight_path = os.path.join(model_dir, weight_file)
-        weight.astype('float32').tofile(weight_path)
-        weight_files.append(weight_file)
-    
-    # 3. 가중치 매니페스트 생성
-    weights_manifest = [{
-        "paths": weight_files,
-        "weights": []
-    }]
-    
-    # 각 가중치에 대한 상세 정보 추가
-    weight_names = []
-    for layer in model.layers:
-        if hasattr(layer, 'kernel'):
-            weight_names.append(f"{layer.name}/kernel")
-            if layer.use_bias:
-                weight_names.append(f"{layer.name}/bias")
-        elif hasattr(layer, 'gamma'):
-            # BatchNormalization 레이어
-            weight_names.extend([
-                f"{layer.name}/gamma",
-                f"{layer.name}/beta", 
-                f"{layer.name}/moving_mean",
-                f"{layer.name}/moving_variance"
-            ])
-    
-    for i, weight in enumerate(weights):
-        weight_name = weight_names[i] if i < len(weight_names) else f"weight_{i}"
-        weights_manifest[0]["weights"].append({
-            "name": weight_name,
-            "shape": list(weight.shape),
-            "dtype": "float32"
-        })
-    
-    # 4. model.json 파일 생성
-    model_json = {
-        "modelTopology": model_config,
-        "weightsManifest": weights_manifest
-    }
+    print(f"🔄 다양한 얼굴-색상 모델을 TensorFlow.js 형식으로 저장 중...")
     
-    with open(os.path.join(model_dir, 'model.json'), 'w') as f:
-        json.dump(model_json, f, indent=2)
+    # 추론 그래프 최적화 (BatchNormalization·정규화 접기, Dropout 제거)
+    export_model = model
+    model_inputs = reference_inputs
+    if projection is not None and not optimize:
+        raise ValueError("descriptor 투영으로 학습한 모델은 optimize=True로만 저장할 수 있습니다.")
+    projected_inputs = reference_inputs
+    if projection is not None and reference_inputs is not None:
+        projected_inputs = projection.transform(reference_inputs)
+    if optimize:
+        print("   🧩 추론 그래프 최적화: BatchNormalization·정규화 접기, Dropout 제거")
+        export_model = fold_inference_graph(model, scaler)
+        verify_folded_model(model, export_model, projected_inputs, scaler)
+        
+        # 가지치기로 0이 된 유닛을 제거해 Dense 레이어 자체를 좁힘
+        params_before = export_model.count_params()
+        export_model, widths = remove_pruned_units(export_model)
+        if export_model.count_params() != params_before:
+            print(f"   ✂️ 가지치기된 유닛 제거: {', '.join(f'{total}→{kept}' for total, kept in widths)}, "
+                  f"파라미터 {params_before:,} → {export_model.count_params():,} "
+                  f"({export_model.count_params() / params_before:.0%})")
+            verify_folded_model(model, export_model, projected_inputs, scaler)
+        
+        # descriptor 투영을 Dense 가중치로 합성해 148차원 원본 입력을 받도록 함
+        if projection is not None:
+            folded = export_model
+            export_model, fusion = fuse_descriptor_projection(folded, projection)
+            print(f"   🗜️ descriptor 투영 합성({fusion}): 입력 {projection.n_features_in_}차원, "
+                  f"파라미터 {folded.count_params():,} → {export_model.count_params():,}")
+            verify_fused_projection(folded, export_model, projection, reference_inputs)
+    elif scaler is not None and reference_inputs is not None:
+        model_inputs = scaler.transform(reference_inputs)
+    
+    # 1~4. 모델 구조(model.json)와 가중치 샤드 저장
+    weight_files = write_tfjs_model(
+        export_model, model_dir, num_shards=num_shards, shard_size_bytes=shard_size_bytes,
+        quantization=quantization
+    )
+    if quantization:
+        report_quantization_error(export_model, quantization, model_inputs)
+    verify_export_parity(export_model, model_dir, model_inputs, quantization)
     
     # 5. 스케일러 정보 저장 (정규화가 적용된 경우에만)
-    if scaler is not None:
+    if optimize and scaler is not None:
+        # 정규화가 모델 첫 Dense 레이어에 포함된 경우
+        scaler_info = {
+            'preprocessing': 'folded_into_model',
+            'description': '정규화가 모델 첫 Dense 레이어에 포함됨 (입력을 그대로 사용)'
+        }
+        
+        with open(os.path.join(model_dir, 'scaler_info.json'), 'w') as f:
+            json.dump(scaler_info, f, indent=2)
+    elif scaler is not None:
         scaler_info = {
             'mean': scaler.mean_.tolist(),
             'scale': scaler.scale_.tolist(),
@@ -451,46 +562,76 @@ def save_diverse_model_as_tfjs(model, scaler):
         'color_categories': [
             'vibrant', 'harmonious', 'cool', 'warm', 'neutral', 'contrast', 'random'
         ],
-        'mbti_optimized': True
+        'mbti_optimized': True,
+        'graph_optimized': optimize
     }
+    if projection is not None:
+        model_info['descriptor_projection'] = {**projection.summary(), 'fusion': fusion}
     
     with open(os.path.join(model_dir, 'model_info.json'), 'w', encoding='utf-8') as f:
         json.dump(model_info, f, ensure_ascii=False, indent=2)
     
     print(f"✅ 다양한 얼굴-색상 모델이 TensorFlow.js 형식으로 {model_dir}에 저장되었습니다.")
     if scaler is not None:
-        print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 파일, scaler_info.json, model_info.json")
+        print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 샤드 파일, scaler_info.json, model_info.json")
     else:
-        print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 파일, scaler_info.json (정규화 정보), model_info.json")
+        print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 샤드 파일, scaler_info.json (정규화 정보), model_info.json")
+    return model_dir
+
+def main(incremental=False, use_tf_data=False, telemetry=False, profile_steps=None, data_path=None,
+         prune_sparsity=None, descriptor_rank=None, streaming=False, chunk_size=65536):
+    """메인 실행 함수
 
-def main():
-    """메인 실행 함수"""
+    incremental=True이면 이전 체크포인트에서 새로 추가된 샘플만으로 미세 조정합니다.
+    use_tf_data=True이면 tf.data 입력 파이프라인으로 학습합니다.
+    telemetry=True이면 에포크별 성능 지표를 모델 디렉토리의 training_telemetry.jsonl에 저장합니다.
+    data_path로 기본 JSON 대신 다른 데이터셋(바이너리 디렉토리 포함)을 사용합니다.
+    streaming=True이면 데이터를 메모리로 복사하지 않고 chunk_size행 단위로 읽으며 학습합니다.
+    prune_sparsity(0~1)를 지정하면 학습 후 은닉 유닛을 가지치기하고, 제거된 유닛을 뺀
+    좁은 Dense 전용 모델(optimize=True)과 pruning_report.json을 저장합니다.
+    descriptor_rank를 지정하면 descriptor를 그 차원으로 PCA 투영해 학습하고, 투영을
+    첫 Dense에 합성한 148차원 입력 Dense 전용 모델(optimize=True)을 저장합니다.
+    """
     print("🚀 다양한 얼굴-색상 모델 학습 시작!")
     print("🎨 MBTI 예측을 위한 색상 다양성 확보")
     print("📊 148차원 입력: descriptor(128) + 물리적 특징(15) + 랜덤 시드(5)")
     
     try:
         # 데이터 로드
-        X, y, metadata = load_diverse_face_color_data()
+        X, y, metadata = load_diverse_face_color_data(data_path=data_path)
         
         # 색상 다양성 분석
         analyze_color_diversity(y, metadata)
         
         # 모델 학습 (실제 데이터 특성 반영)
-        model, history, X_val, y_val = train_diverse_face_to_color_model(X, y, metadata)
+        telemetry_log = telemetry_log_path(CHECKPOINT_PATH) if telemetry or profile_steps else None
+        model, history, X_val, y_val = train_diverse_face_to_color_model(
+            X, y, metadata, incremental=incremental, use_tf_data=use_tf_data,
+            telemetry_log=telemetry_log, profile_steps=profile_steps,
+            prune_sparsity=prune_sparsity, descriptor_rank=descriptor_rank,
+            streaming=streaming, chunk_size=chunk_size
+        )
+        projection = load_descriptor_projection(CHECKPOINT_PATH)
         
         # 모델 성능 평가
         performance = evaluate_model_performance(model, X_val, y_val, metadata)
         
-        # TensorFlow.js 형식으로 저장
-        save_diverse_model_as_tfjs(model, None)  # 정규화는 이미 적용됨
+        # TensorFlow.js 형식으로 저장 (정규화는 이미 적용됨)
+        # 검증 행의 투영 전 원본 입력으로 그래프 접기와 양자화에 따른 float32 대비 오차를 확인
+        model_dir = save_diverse_model_as_tfjs(
+            model, None, optimize=bool(prune_sparsity) or projection is not None, projection=projection,
+            reference_inputs=held_out_inputs(X, CHECKPOINT_PATH)
+        )
+        publish_telemetry(telemetry_log, model_dir)
+        if prune_sparsity:
+            publish_pruning_report(pruning_report_path(CHECKPOINT_PATH), model_dir)
         
         print("\n🎉 실제 데이터 특성을 반영한 모델 학습 및 저장 완료!")
         print("🌐 이제 브라우저에서 바로 사용할 수 있습니다!")
         print(f"📊 최종 성능: MSE={performance['mse']:.6f}, 극값 정확도={performance['extreme_accuracy']:.3f}")
         print("📁 생성된 파일들:")
         print("   - model.json: TensorFlow.js 호환 모델 구조")
-        print("   - weights_*.bin: 모델 가중치 파일들")
+        print("   - group1-shard*.bin: 모델 가중치 샤드 파일들")
         print("   - model_info.json: 모델 정보")
         
     except FileNotFoundError:
@@ -500,4 +641,13 @@ def main():
         print(f"❌ 오류 발생: {error}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    args = sys.argv[1:]
+    main(incremental='--incremental' in args, use_tf_data='--tf-data' in args,
+         telemetry='--telemetry' in args,
+         data_path=args[args.index('--data') + 1] if '--data' in args[:-1] else None,
+         prune_sparsity=float(args[args.index('--prune') + 1]) if '--prune' in args[:-1] else None,
+         descriptor_rank=(int(args[args.index('--descriptor-rank') + 1])
+                          if '--descriptor-rank' in args[:-1] else None),
+         streaming='--streaming' in args,
+         chunk_size=int(args[args.index('--chunk-size') + 1]) if '--chunk-size' in args[:-1] else 65536)
\ No newline at end of file
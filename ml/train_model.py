@@ -5,10 +5,28 @@ MBTI 컬러 팔레트 예측 모델 생성
 
 import json
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
-from sklearn.preprocessing import LabelEncoder
 import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from palette_augmentation import (
+    hex_palettes_to_array, augment_palettes_batch, repeat_labels,
+    iter_augmented_batches, augmented_steps_per_epoch
+)
+from lazy_imports import lazy_import
+from input_pipeline import index_split, kfold_splits, make_array_dataset, throughput_callback
+from training_telemetry import (
+    telemetry_callback, telemetry_log_path, publish_telemetry, DEFAULT_PROFILE_DIR
+)
+from dataset_cache import load_indicator_arrays
+from tfjs_export import write_tfjs_model, report_quantization_error, DEFAULT_SHARD_SIZE_BYTES
+from graph_optimizer import fold_inference_graph, verify_folded_model
+from numpy_runtime import verify_export_parity
+
+# TensorFlow/Keras는 실제로 사용하는 시점에 임포트 (분석·내보내기 명령의 시작 시간 단축)
+tf = lazy_import('tensorflow')
+keras = lazy_import('tensorflow.keras')
 
 def hex_to_rgb_normalized(hex_color):
     """16진수 색상을 0-1 범위의 RGB 값으로 변환"""
@@ -18,8 +36,12 @@ def hex_to_rgb_normalized(hex_color):
     b = int(hex_color[4:6], 16) / 255.0
     return [r, g, b]
 
-def load_training_data():
-    """학습 데이터 로드 및 전처리"""
+def load_training_data(use_cache=True):
+    """학습 데이터 로드 및 전처리
+
+    use_cache=True이면 각 지표 JSON을 바이너리 캐시(.npcache)로 변환해
+    {'X': 팔레트 배열, 'labels': 라벨 배열} 형태로 로드합니다.
+    """
     # 현재 스크립트의 디렉토리를 기준으로 상대 경로 계산
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(script_dir, "..", "public", "data", "training-data")
@@ -29,6 +51,9 @@ def load_training_data():
     datasets = {}
     for indicator in ['e-i', 's-n', 't-f', 'j-p']:
         file_path = os.path.join(data_dir, f"{indicator}.json")
+        if use_cache:
+            datasets[indicator] = load_indicator_arrays(file_path)
+            continue
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
             datasets[indicator] = data
@@ -46,47 +71,52 @@ def augment_color_palette(palette_rgb, noise_factor=0.05, indicator=None):
     
     return augmented.tolist()
 
-def prepare_data_for_training(datasets, use_augmentation=True):
-    """학습을 위한 데이터 준비"""
+def prepare_data_for_training(datasets, use_augmentation=True, augmentation_count=5,
+                              lazy_augmentation=False, noise_factor=0.05, seed=None):
+    """학습을 위한 데이터 준비
+
+    증강은 지표 데이터셋 전체에 대해 한 번의 NumPy 연산으로 수행합니다.
+    lazy_augmentation=True이면 증강본을 저장하지 않고 원본만 보관하며,
+    train_models에서 매 에포크 새로운 노이즈를 생성합니다.
+    """
     models_data = {}
+    rng = np.random.default_rng(seed)
     
     for indicator, data in datasets.items():
-        X = []  # 색상 팔레트 데이터
-        y = []  # 라벨 데이터
-        
-        for item in data:
+        if isinstance(data, dict):
+            # 바이너리 캐시에서 로드된 배열 형태
+            X = np.asarray(data['X'], dtype=np.float32)
+            y = data['labels']
+        else:
             # 5개 색상을 RGB로 변환하고 평탄화 (15차원 벡터)
-            palette_rgb = []
-            for color in item['palette']:
-                rgb = hex_to_rgb_normalized(color)
-                palette_rgb.extend(rgb)
-            
-            X.append(palette_rgb)
-            y.append(item['label'])
-            
-            # 데이터 증강 (모든 모델에 적용)
-            if use_augmentation:
-                # 모든 모델에 5배 증강 적용
-                augmentation_count = 5
-                for _ in range(augmentation_count):
-                    augmented_palette = augment_color_palette(palette_rgb, indicator=indicator)
-                    X.append(augmented_palette)
-                    y.append(item['label'])
-        
-        X = np.array(X, dtype=np.float32)
+            X = hex_palettes_to_array([item['palette'] for item in data])
+            y = [item['label'] for item in data]
         
         # 라벨을 숫자로 변환
+        from sklearn.preprocessing import LabelEncoder
         label_encoder = LabelEncoder()
         y_encoded = label_encoder.fit_transform(y)
         
+        # 데이터 증강 (모든 모델에 적용)
+        lazy = use_augmentation and lazy_augmentation
+        if use_augmentation and not lazy:
+            X = augment_palettes_batch(X, augmentation_count, noise_factor, rng)
+            y_encoded = repeat_labels(y_encoded, augmentation_count)
+        
         models_data[indicator] = {
             'X': X,
             'y': y_encoded,
             'label_encoder': label_encoder,
-            'classes': label_encoder.classes_
+            'classes': label_encoder.classes_,
+            'augmentation_count': augmentation_count if use_augmentation else 0,
+            'lazy_augmentation': lazy,
+            'noise_factor': noise_factor
         }
         
-        print(f"{indicator.upper()} 데이터: {len(X)} 샘플")
+        if lazy:
+            print(f"{indicator.upper()} 데이터: {len(X)} 샘플 (에포크마다 {augmentation_count}배 지연 증강)")
+        else:
+            print(f"{indicator.upper()} 데이터: {len(X)} 샘플")
     
     return models_data
 
@@ -134,74 +164,542 @@ def create_improved_model(input_dim, num_classes, indicator):
     
     return model
 
-def train_models(models_data):
-    """각 MBTI 지표별 모델 학습"""
+def train_indicator_model(indicator, data, verbose=1, use_tf_data=False, telemetry_log=None,
+                          profile_steps=None, rows=None, epochs=100):
+    """단일 MBTI 지표 모델 학습
+
+    use_tf_data=True이면 tf.data 파이프라인(input_pipeline)으로 학습합니다.
+    검증 데이터는 validation_split과 같은 마지막 20%를 인덱스로 지정하므로
+    복사가 없고, 지연 증강 노이즈도 병렬 map 안에서 생성합니다.
+    telemetry_log를 지정하면 에포크별 성능 지표를 JSONL로 기록합니다 (training_telemetry).
+    rows=(훈련 행, 검증 행)을 지정하면 마지막 20% 대신 그 분할로 학습합니다 (k-fold 교차 검증).
+    검증 행이 비어 있으면 조기 종료 없이 epochs 에포크 동안 전체 훈련 행으로 학습합니다.
+    """
+    print(f"\n=== {indicator.upper()} 모델 학습 시작 ===")
+    
+    X = data['X']
+    y = data['y']
+    num_classes = len(data['classes'])
+    
+    # 개선된 모델 생성
+    model = create_improved_model(X.shape[1], num_classes, indicator)
+    
+    # 모델 구조 출력
+    print(f"입력 차원: {X.shape[1]}")
+    print(f"클래스 수: {num_classes}")
+    print(f"클래스: {data['classes']}")
+    
+    # 학습 (기본 분할은 validation_split=0.2와 같은 마지막 20%)
+    copies = data['augmentation_count'] + 1 if data.get('lazy_augmentation') else 1
+    train_rows, val_rows = index_split(len(X), validation_split=0.2) if rows is None else rows
+    has_validation = len(val_rows) > 0
+    pipeline = 'tf.data' if use_tf_data else ('지연 증강 생성기' if copies > 1 else 'NumPy 배열')
+    label = f"{indicator.upper()}, {pipeline}"
+    callbacks = [throughput_callback(len(train_rows) * copies, label)]
+    if has_validation:
+        callbacks = [
+            # Early stopping 콜백
+            keras.callbacks.EarlyStopping(
+                monitor='val_accuracy',
+                patience=10,
+                restore_best_weights=True,
+                verbose=1
+            ),
+            # 학습률 감소 콜백
+            keras.callbacks.ReduceLROnPlateau(
+                monitor='val_loss',
+                factor=0.5,
+                patience=5,
+                min_lr=1e-7,
+                verbose=1
+            )
+        ] + callbacks
+    if telemetry_log:
+        callbacks.append(telemetry_callback(
+            len(train_rows) * copies, telemetry_log, label, profile_steps,
+            profile_dir=os.path.join(DEFAULT_PROFILE_DIR, indicator)
+        ))
+    
+    if use_tf_data:
+        val_data = None
+        if has_validation and copies > 1:
+            # 검증 데이터는 에포크마다 같도록 한 번만 증강
+            X_val = augment_palettes_batch(X[val_rows], data['augmentation_count'], data['noise_factor'])
+            y_val = repeat_labels(y[val_rows], data['augmentation_count'])
+            val_data = make_array_dataset(X_val, y_val, np.arange(len(X_val)), batch_size=32, shuffle=False)
+        elif has_validation:
+            val_data = make_array_dataset(X, y, val_rows, batch_size=32, shuffle=False)
+        
+        history = model.fit(
+            make_array_dataset(
+                X, y, train_rows, batch_size=32, shuffle=True,
+                copies=copies, noise_factor=data['noise_factor']
+            ),
+            epochs=epochs,
+            validation_data=val_data,
+            callbacks=callbacks,
+            verbose=verbose
+        )
+    elif data.get('lazy_augmentation'):
+        # 지연 증강: 검증 행은 한 번만 고정 증강하고
+        # 훈련 데이터는 매 에포크 새로운 노이즈로 증강
+        augmentation_count = data['augmentation_count']
+        validation_data = None
+        if has_validation:
+            validation_data = (
+                augment_palettes_batch(X[val_rows], augmentation_count, data['noise_factor']),
+                repeat_labels(y[val_rows], augmentation_count)
+            )
+
+        history = model.fit(
+            iter_augmented_batches(
+                X[train_rows], y[train_rows], augmentation_count,
+                batch_size=32, noise_factor=data['noise_factor']
+            ),
+            steps_per_epoch=augmented_steps_per_epoch(len(train_rows), augmentation_count, 32),
+            epochs=epochs,
+            validation_data=validation_data,
+            shuffle=False,  # 생성기가 매 에포크 직접 섞음
+            callbacks=callbacks,
+            verbose=verbose
+        )
+    elif rows is None:
+        history = model.fit(
+            X, y,
+            epochs=epochs,  # 더 많은 에포크
+            batch_size=32,
+            validation_split=0.2,
+            callbacks=callbacks,
+            verbose=verbose
+        )
+    else:
+        history = model.fit(
+            X[train_rows], y[train_rows],
+            epochs=epochs,
+            batch_size=32,
+            validation_data=(X[val_rows], y[val_rows]) if has_validation else None,
+            callbacks=callbacks,
+            verbose=verbose
+        )
+    
+    # 정확도 출력
+    final_accuracy = history.history['accuracy'][-1]
+    print(f"최종 훈련 정확도: {final_accuracy:.4f}")
+    if has_validation:
+        val_accuracy = history.history['val_accuracy'][-1]
+        print(f"최종 검증 정확도: {val_accuracy:.4f}")
+    
+    return model, history
+
+def _init_indicator_worker(threads_per_worker):
+    """워커 프로세스의 TensorFlow 스레드 수 제한 (연산 실행 전에 호출)"""
+    for name in ['OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS']:
+        os.environ[name] = str(threads_per_worker)
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def _train_indicator_worker(indicator, data, use_tf_data=False, telemetry_log=None,
+                            profile_steps=None, rows=None, epochs=100):
+    """워커 프로세스에서 지표 모델을 학습하고 직렬화 가능한 결과 반환"""
+    start_time = time.perf_counter()
+    # 여러 워커의 진행 막대가 섞이지 않도록 에포크 단위 로그 사용
+    model, history = train_indicator_model(
+        indicator, data, verbose=2, use_tf_data=use_tf_data,
+        telemetry_log=telemetry_log, profile_steps=profile_steps,
+        rows=rows, epochs=epochs
+    )
+    
+    return {
+        'model_json': model.to_json(),
+        'weights': model.get_weights(),
+        'history': history.history,
+        'elapsed': time.perf_counter() - start_time
+    }
+
+def _model_from_result(result):
+    """워커 결과(모델 JSON + 가중치)에서 Keras 모델 복원"""
+    model = keras.models.model_from_json(result['model_json'])
+    model.set_weights(result['weights'])
+    return model
+
+def _indicator_pool(num_jobs, max_workers=None, threads_per_worker=None):
+    """지표 학습용 spawn 프로세스 풀 (워커당 TensorFlow 스레드 수 제한)"""
+    cpu_count = os.cpu_count() or 1
+    max_workers = max_workers or min(num_jobs, cpu_count)
+    threads_per_worker = threads_per_worker or max(1, cpu_count // max_workers)
+    print(f"⚡ 병렬 학습: 워커 {max_workers}개 × 스레드 {threads_per_worker}개")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_indicator_worker,
+        initargs=(threads_per_worker,)
+    )
+
+def train_models(models_data, parallel=False, max_workers=None, threads_per_worker=None,
+                 use_tf_data=False, telemetry=False, profile_steps=None):
+    """각 MBTI 지표별 모델 학습
+
+    parallel=True이면 지표마다 별도 워커 프로세스에서 학습하고,
+    워커당 TensorFlow 스레드 수를 threads_per_worker로 제한합니다.
+    use_tf_data=True이면 tf.data 입력 파이프라인으로 학습합니다.
+    telemetry=True이면 지표별 성능 지표를 telemetry_log_path(지표)에 기록합니다.
+    """
     trained_models = {}
+    telemetry_logs = {
+        indicator: telemetry_log_path(indicator) if telemetry or profile_steps else None
+        for indicator in models_data
+    }
+    elapsed = {}
+    total_start = time.perf_counter()
     
+    if parallel:
+        with _indicator_pool(len(models_data), max_workers, threads_per_worker) as executor:
+            futures = {
+                indicator: executor.submit(
+                    _train_indicator_worker, indicator, data, use_tf_data,
+                    telemetry_logs[indicator], profile_steps
+                )
+                for indicator, data in models_data.items()
+            }
+            
+            for indicator, future in futures.items():
+                result = future.result()
+                model = _model_from_result(result)
+                elapsed[indicator] = result['elapsed']
+                
+                data = models_data[indicator]
+                trained_models[indicator] = {
+                    'model': model,
+                    'label_encoder': data['label_encoder'],
+                    'classes': data['classes']
+                }
+    else:
+        for indicator, data in models_data.items():
+            start_time = time.perf_counter()
+            model, history = train_indicator_model(
+                indicator, data, use_tf_data=use_tf_data,
+                telemetry_log=telemetry_logs[indicator], profile_steps=profile_steps
+            )
+            elapsed[indicator] = time.perf_counter() - start_time
+            
+            trained_models[indicator] = {
+                'model': model,
+                'label_encoder': data['label_encoder'],
+                'classes': data['classes']
+            }
+    
+    # 학습 시간 출력
+    print("\n⏱️ 지표별 학습 시간:")
+    for indicator, seconds in elapsed.items():
+        print(f"   {indicator.upper()}: {seconds:.1f}초")
+    print(f"   전체: {time.perf_counter() - total_start:.1f}초")
+    
+    return trained_models
+
+CV_EXPORT_MODES = ('refit', 'best')
+
+def cross_validate_indicators(models_data, k=5, max_workers=None, threads_per_worker=None,
+                              use_tf_data=False, export='refit', seed=42):
+    """지표별 k-fold 교차 검증
+
+    지표 × 폴드 작업을 하나의 프로세스 풀에 모두 제출해 병렬로 학습하고, 폴드별
+    검증 정확도(EarlyStopping이 복원한 최고 에포크 기준)의 평균과 분산을 출력합니다.
+    즉시 증강된 데이터는 원본과 증강본을 같은 폴드에 두어 검증 누수를 막습니다.
+    export='best'이면 검증 정확도가 가장 높은 폴드 모델을, 'refit'이면 폴드별 최고
+    에포크의 중앙값만큼 전체 데이터로 다시 학습한 모델을 반환하고, None이면 평가만 합니다.
+
+    k가 2보다 작거나 어느 지표의 팔레트 그룹 수보다 크면 학습 전에 ValueError를 발생시킵니다.
+
+    반환값: (train_models와 같은 형식의 {지표: 모델 정보} 또는 None, {지표: 교차 검증 요약})
+    """
+    if export is not None and export not in CV_EXPORT_MODES:
+        raise ValueError(f"export는 {CV_EXPORT_MODES} 또는 None이어야 합니다: {export}")
+    
+    folds = {}
     for indicator, data in models_data.items():
-        print(f"\n=== {indicator.upper()} 모델 학습 시작 ===")
-        
-        X = data['X']
-        y = data['y']
-        num_classes = len(data['classes'])
-        
-        # 개선된 모델 생성
-        model = create_improved_model(X.shape[1], num_classes, indicator)
+        eager = data['augmentation_count'] > 0 and not data.get('lazy_augmentation')
+        group_size = data['augmentation_count'] + 1 if eager else 1
+        try:
+            folds[indicator] = kfold_splits(len(data['X']), k, group_size, seed)
+        except ValueError as error:
+            raise ValueError(f"{indicator.upper()} 지표: {error}") from error
+    
+    print(f"🔁 {k}-fold 교차 검증: 지표 {len(models_data)}개 × 폴드 {k}개")
+    total_start = time.perf_counter()
+    results = {}
+    with _indicator_pool(len(models_data) * k, max_workers, threads_per_worker) as executor:
+        futures = {
+            (indicator, fold): executor.submit(
+                _train_indicator_worker, indicator, models_data[indicator], use_tf_data,
+                None, None, rows
+            )
+            for indicator, splits in folds.items()
+            for fold, rows in enumerate(splits)
+        }
+        for (indicator, fold), future in futures.items():
+            results.setdefault(indicator, []).append(future.result())
+        fold_seconds = time.perf_counter() - total_start
         
-        # 모델 구조 출력
-        print(f"입력 차원: {X.shape[1]}")
-        print(f"클래스 수: {num_classes}")
-        print(f"클래스: {data['classes']}")
+        summary = {}
+        for indicator, fold_results in results.items():
+            accuracies = [max(result['history']['val_accuracy']) for result in fold_results]
+            best_epochs = [
+                int(np.argmax(result['history']['val_accuracy'])) + 1 for result in fold_results
+            ]
+            summary[indicator] = {
+                'k': k,
+                'fold_accuracies': accuracies,
+                'mean_accuracy': float(np.mean(accuracies)),
+                'std_accuracy': float(np.std(accuracies)),
+                'variance_accuracy': float(np.var(accuracies)),
+                'best_epochs': best_epochs,
+                'best_fold': int(np.argmax(accuracies)),
+                'fold_seconds': [result['elapsed'] for result in fold_results],
+                'export': export
+            }
         
-        # Early stopping 콜백
-        early_stopping = keras.callbacks.EarlyStopping(
-            monitor='val_accuracy',
+        refit_futures = {}
+        if export == 'refit':
+            for indicator, data in models_data.items():
+                epochs = int(np.median(summary[indicator]['best_epochs']))
+                summary[indicator]['refit_epochs'] = epochs
+                rows = (np.arange(len(data['X'])), np.arange(0))
+                refit_futures[indicator] = executor.submit(
+                    _train_indicator_worker, indicator, data, use_tf_data, None, None, rows, epochs
+                )
+        refit_results = {indicator: future.result() for indicator, future in refit_futures.items()}
+    
+    # 교차 검증 결과 출력
+    print(f"\n📊 {k}-fold 교차 검증 정확도:")
+    for indicator, info in summary.items():
+        folds_text = ', '.join(f"{accuracy:.3f}" for accuracy in info['fold_accuracies'])
+        print(f"   {indicator.upper()}: {info['mean_accuracy']:.4f} ± {info['std_accuracy']:.4f} "
+              f"(분산 {info['variance_accuracy']:.6f}, 폴드 {folds_text})")
+    total_seconds = time.perf_counter() - total_start
+    sequential = sum(sum(info['fold_seconds']) for info in summary.values())
+    print(f"\n⏱️ 폴드 학습 {fold_seconds:.1f}초 (순차 실행 시 {sequential:.1f}초), 전체 {total_seconds:.1f}초")
+    
+    if export is None:
+        return None, summary
+    
+    trained_models = {}
+    for indicator, data in models_data.items():
+        if export == 'refit':
+            result = refit_results[indicator]
+            print(f"   {indicator.upper()}: 전체 데이터로 {summary[indicator]['refit_epochs']} 에포크 재학습")
+        else:
+            result = results[indicator][summary[indicator]['best_fold']]
+            print(f"   {indicator.upper()}: 폴드 {summary[indicator]['best_fold'] + 1} 모델 사용")
+        trained_models[indicator] = {
+            'model': _model_from_result(result),
+            'label_encoder': data['label_encoder'],
+            'classes': data['classes']
+        }
+    return trained_models, summary
+
+def save_cross_validation_summary(summary, model_dir):
+    """지표별 교차 검증 요약을 모델 디렉토리의 cross_validation.json으로 저장"""
+    path = os.path.join(model_dir, 'cross_validation.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
+
+MULTIHEAD_MODEL_NAME = 'mbti-multihead'
+MODEL_MANIFEST_NAME = 'mbti-models.json'
+
+def multihead_output_name(indicator):
+    """지표 이름을 Keras 출력 레이어 이름으로 변환 (e-i -> e_i)"""
+    return indicator.replace('-', '_')
+
+def create_multihead_model(input_dim, num_classes_by_indicator):
+    """공유 몸통과 지표별 softmax 헤드로 구성된 다중 헤드 모델 생성
+
+    create_improved_model과 같은 몸통(64 → 32)을 네 지표가 공유하고,
+    지표마다 16 유닛 은닉층과 softmax 출력층을 둡니다.
+    """
+    inputs = keras.Input(shape=(input_dim,))
+    x = keras.layers.Dense(64, activation='relu')(inputs)
+    x = keras.layers.BatchNormalization()(x)
+    x = keras.layers.Dropout(0.3)(x)
+    x = keras.layers.Dense(32, activation='relu')(x)
+    x = keras.layers.BatchNormalization()(x)
+    x = keras.layers.Dropout(0.3)(x)
+    
+    outputs = []
+    for indicator, num_classes in num_classes_by_indicator.items():
+        name = multihead_output_name(indicator)
+        head = keras.layers.Dense(16, activation='relu', name=f"{name}_hidden")(x)
+        head = keras.layers.Dropout(0.2, name=f"{name}_dropout")(head)
+        outputs.append(keras.layers.Dense(num_classes, activation='softmax', name=name)(head))
+    
+    model = keras.Model(inputs, outputs)
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=0.001),
+        loss=['sparse_categorical_crossentropy'] * len(outputs),
+        # 다른 지표의 샘플(가중치 0)은 정확도 계산에서도 제외
+        weighted_metrics=[['accuracy'] for _ in outputs]
+    )
+    
+    return model
+
+def prepare_multihead_data(models_data, validation_split=0.2):
+    """지표별 데이터셋을 하나로 합치고 헤드별 라벨/가중치 생성
+
+    각 샘플은 자기 지표의 헤드에만 가중치 1을 갖고, 나머지 헤드는
+    가중치 0(라벨 0)으로 학습에서 제외됩니다. 검증 데이터는 지표마다
+    마지막 validation_split 비율을 사용합니다 (validation_split과 동일한 기준).
+    """
+    indicators = list(models_data)
+    parts = {'train': [], 'val': []}
+    
+    for head, indicator in enumerate(indicators):
+        data = models_data[indicator]
+        X, y = data['X'], data['y']
+        if data.get('lazy_augmentation'):
+            X = augment_palettes_batch(X, data['augmentation_count'], data['noise_factor'])
+            y = repeat_labels(y, data['augmentation_count'])
+        split = int(len(X) * (1 - validation_split))
+        parts['train'].append((head, X[:split], y[:split]))
+        parts['val'].append((head, X[split:], y[split:]))
+    
+    def combine(items):
+        X = np.concatenate([X_part for _, X_part, _ in items]).astype(np.float32)
+        labels = [np.zeros(len(X), dtype=np.int32) for _ in indicators]
+        weights = [np.zeros(len(X), dtype=np.float32) for _ in indicators]
+        offset = 0
+        for head, X_part, y_part in items:
+            labels[head][offset:offset + len(X_part)] = y_part
+            weights[head][offset:offset + len(X_part)] = 1.0
+            offset += len(X_part)
+        return X, labels, weights
+    
+    return indicators, combine(parts['train']), combine(parts['val'])
+
+def train_multihead_model(models_data, use_tf_data=False, telemetry_log=None, profile_steps=None):
+    """네 지표를 하나의 다중 헤드 모델로 함께 학습
+
+    use_tf_data=True이면 tf.data 입력 파이프라인으로 학습합니다.
+    telemetry_log를 지정하면 에포크별 성능 지표를 JSONL로 기록합니다 (training_telemetry).
+    """
+    print(f"\n=== 다중 헤드 모델 학습 시작 ===")
+    
+    indicators, train, val = prepare_multihead_data(models_data)
+    X_train, y_train, w_train = train
+    X_val, y_val, w_val = val
+    
+    model = create_multihead_model(
+        X_train.shape[1],
+        {indicator: len(models_data[indicator]['classes']) for indicator in indicators}
+    )
+    
+    print(f"입력 차원: {X_train.shape[1]}")
+    print(f"헤드: {', '.join(indicators)}")
+    print(f"훈련 데이터: {len(X_train)}개, 검증 데이터: {len(X_val)}개")
+    
+    callbacks = [
+        keras.callbacks.EarlyStopping(
+            monitor='val_loss',
             patience=10,
             restore_best_weights=True,
             verbose=1
-        )
-        
-        # 학습률 감소 콜백
-        reduce_lr = keras.callbacks.ReduceLROnPlateau(
+        ),
+        keras.callbacks.ReduceLROnPlateau(
             monitor='val_loss',
             factor=0.5,
             patience=5,
             min_lr=1e-7,
             verbose=1
         )
-        
-        # 학습
+    ]
+    
+    label = f"다중 헤드, {'tf.data' if use_tf_data else 'NumPy 배열'}"
+    callbacks.append(throughput_callback(len(X_train), label))
+    if telemetry_log:
+        callbacks.append(telemetry_callback(len(X_train), telemetry_log, label, profile_steps))
+    
+    if use_tf_data:
         history = model.fit(
-            X, y,
-            epochs=100,  # 더 많은 에포크
+            make_array_dataset(X_train, y_train, np.arange(len(X_train)), batch_size=32,
+                               shuffle=True, sample_weight=w_train),
+            validation_data=make_array_dataset(X_val, y_val, np.arange(len(X_val)), batch_size=32,
+                                               shuffle=False, sample_weight=w_val),
+            epochs=100,
+            callbacks=callbacks,
+            verbose=1
+        )
+    else:
+        history = model.fit(
+            X_train, y_train,
+            sample_weight=w_train,
+            validation_data=(X_val, y_val, w_val),
+            epochs=100,
             batch_size=32,
-            validation_split=0.2,
-            callbacks=[early_stopping, reduce_lr],
+            callbacks=callbacks,
             verbose=1
         )
-        
-        # 정확도 출력
-        final_accuracy = history.history['accuracy'][-1]
-        val_accuracy = history.history['val_accuracy'][-1]
-        print(f"최종 훈련 정확도: {final_accuracy:.4f}")
-        print(f"최종 검증 정확도: {val_accuracy:.4f}")
-        
-        trained_models[indicator] = {
-            'model': model,
-            'label_encoder': data['label_encoder'],
-            'classes': data['classes']
-        }
     
-    return trained_models
+    # 헤드별 검증 정확도 출력
+    for indicator in indicators:
+        key = f"val_{multihead_output_name(indicator)}_accuracy"
+        if key in history.history:
+            print(f"{indicator.upper()} 최종 검증 정확도: {history.history[key][-1]:.4f}")
+    
+    return {
+        'model': model,
+        'indicators': indicators,
+        'classes': {indicator: models_data[indicator]['classes'] for indicator in indicators}
+    }
+
+def validation_inputs(models_data):
+    """지표별 기본 검증 행(마지막 20%)의 입력 {지표: 배열}
+
+    train_indicator_model의 기본 분할과 같은 행이며, 내보내기의 그래프 접기·양자화에
+    따른 float32 대비 출력 오차 검증에 사용합니다.
+    """
+    return {
+        indicator: np.asarray(data['X'][index_split(len(data['X']), validation_split=0.2)[1]],
+                              dtype=np.float32)
+        for indicator, data in models_data.items()
+    }
+
+def write_model_manifest(layout, indicators):
+    """클라이언트가 로드할 MBTI 모델 배치를 public/models/mbti-models.json에 기록
 
-def save_models_as_tfjs(trained_models):
-    """모델을 TensorFlow.js 형식으로 저장 (브라우저 최적화)"""
+    layout은 'multihead'(mbti-multihead 하나) 또는 'per-indicator'(지표별 모델)입니다.
+    MBTIPredictor는 이 파일만 보고 배치를 고르므로 없는 모델을 먼저 요청하지 않습니다.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    manifest_path = os.path.normpath(
+        os.path.join(script_dir, "..", "public", "models", MODEL_MANIFEST_NAME)
+    )
+    manifest = {'layout': layout, 'indicators': list(indicators)}
+    if layout == 'multihead':
+        manifest['model'] = MULTIHEAD_MODEL_NAME
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"   📝 모델 목록 갱신: {manifest_path} ({layout})")
+    return manifest_path
+
+def save_models_as_tfjs(trained_models, num_shards=None, shard_size_bytes=DEFAULT_SHARD_SIZE_BYTES,
+                        quantization=None, reference_inputs=None, optimize=False):
+    """모델을 TensorFlow.js 형식으로 저장 (브라우저 최적화)
+
+    가중치는 텐서별 파일 대신 num_shards개(또는 shard_size_bytes 단위)의
+    group1-shardXofY.bin 파일로 묶어 HTTP 요청 수를 줄입니다.
+    quantization('float16', 'uint8')을 지정하면 가중치를 양자화해 저장하고,
+    reference_inputs({지표: 입력 배열})에 대한 float32 대비 출력 오차를 출력합니다.
+    optimize=True이면 BatchNormalization을 Dense 가중치에 접고 Dropout을 제거한
+    Dense 전용 모델로 저장합니다.
+    이전 실행의 다중 헤드 모델(mbti-multihead)은 지우고 모델 목록(mbti-models.json)을
+    지표별 배치로 갱신하므로, 클라이언트가 오래된 다중 헤드 모델을 로드하지 않습니다.
+    """
     # 모델 저장 디렉토리 생성
     script_dir = os.path.dirname(os.path.abspath(__file__))
     models_dir = os.path.join(script_dir, "..", "public", "models")
     models_dir = os.path.normpath(models_dir)  # 경로 정규화
     os.makedirs(models_dir, exist_ok=True)
     
+    model_dirs = {}
     for indicator, model_data in trained_models.items():
         model_dir = os.path.join(models_dir, indicator)
         os.makedirs(model_dir, exist_ok=True)
@@ -215,78 +713,27 @@ def save_models_as_tfjs(trained_models):
         print(f"🔄 {indicator} 모델을 TensorFlow.js 형식으로 저장 중...")
         
         # TensorFlow.js 호환 형식으로 모델 저장
-        model = model_data['model']
-        
-        # 1. 모델 구조를 TensorFlow.js 형식으로 저장
-        model_topology = model.to_json()
-        model_config = json.loads(model_topology)
-        
-        # InputLayer의 batch_shape를 inputShape로 변환
-        if 'config' in model_config and 'layers' in model_config['config']:
-            for layer in model_config['config']['layers']:
-                if (layer.get('module') == 'keras.layers' and 
-                    layer.get('class_name') == 'InputLayer'):
-                    layer_config = layer.get('config', {})
-                    if 'batch_shape' in layer_config:
-                        batch_shape = layer_config['batch_shape']
-                        if batch_shape and len(batch_shape) > 1:
-                            # batch_shape [null, 15] -> inputShape [15]
-                            layer_config['inputShape'] = batch_shape[1:]
-                        # batch_shape 제거
-                        del layer_config['batch_shape']
-        
-        # 2. 가중치 추출 및 저장
-        weights = model.get_weights()
-        weight_files = []
-        
-        for i, weight in enumerate(weights):
-            weight_file = f"weights_{i}.bin"
-            weight_path = os.path.join(model_dir, weight_file)
-            
-            # 가중치를 float32로 저장
-            weight.astype('float32').tofile(weight_path)
-            weight_files.append(weight_file)
-        
-        # 3. 가중치 매니페스트 생성 (TensorFlow.js 호환 형식)
-        weights_manifest = [{
-            "paths": weight_files,
-            "weights": []
-        }]
+        export_model = model_data['model']
+        if optimize:
+            print("   🧩 추론 그래프 최적화: BatchNormalization 접기, Dropout 제거")
+            export_model = fold_inference_graph(export_model)
+            verify_folded_model(
+                model_data['model'], export_model, (reference_inputs or {}).get(indicator)
+            )
         
-        # 각 가중치에 대한 상세 정보 추가 (실제 레이어 이름 사용)
-        weight_names = []
-        for layer in model.layers:
-            if hasattr(layer, 'kernel'):
-                weight_names.append(f"{layer.name}/kernel")
-                if layer.use_bias:
-                    weight_names.append(f"{layer.name}/bias")
-            elif hasattr(layer, 'gamma'):
-                # BatchNormalization 레이어
-                weight_names.extend([
-                    f"{layer.name}/gamma",
-                    f"{layer.name}/beta", 
-                    f"{layer.name}/moving_mean",
-                    f"{layer.name}/moving_variance"
-                ])
-        
-        for i, weight in enumerate(weights):
-            weight_name = weight_names[i] if i < len(weight_names) else f"weight_{i}"
-            weights_manifest[0]["weights"].append({
-                "name": weight_name,
-                "shape": list(weight.shape),
-                "dtype": "float32"
-            })
-        
-        # 4. model.json 파일 생성 (TensorFlow.js 호환 형식)
-        model_json = {
-            "modelTopology": model_config,
-            "weightsManifest": weights_manifest
-        }
-        
-        with open(os.path.join(model_dir, 'model.json'), 'w') as f:
-            json.dump(model_json, f, indent=2)
+        weight_files = write_tfjs_model(
+            export_model, model_dir,
+            num_shards=num_shards, shard_size_bytes=shard_size_bytes,
+            quantization=quantization
+        )
+        if quantization:
+            report_quantization_error(
+                export_model, quantization,
+                (reference_inputs or {}).get(indicator)
+            )
+        verify_export_parity(export_model, model_dir, (reference_inputs or {}).get(indicator), quantization)
         
-        # 4. 라벨 정보 저장
+        # 5. 라벨 정보 저장
         label_info = {
             'classes': model_data['classes'].tolist(),
             'indicator': indicator
@@ -297,10 +744,87 @@ def save_models_as_tfjs(trained_models):
         
         print(f"✅ {indicator} 모델이 TensorFlow.js 형식으로 {model_dir}에 저장되었습니다.")
         print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 파일, labels.json")
+        model_dirs[indicator] = model_dir
+    
+    # 새로 학습한 지표별 모델을 가리는 이전 다중 헤드 모델 제거
+    multihead_dir = os.path.join(models_dir, MULTIHEAD_MODEL_NAME)
+    if os.path.exists(multihead_dir):
+        import shutil
+        shutil.rmtree(multihead_dir)
+        print(f"🗑️ 이전 다중 헤드 모델 삭제: {multihead_dir}")
+    write_model_manifest('per-indicator', list(trained_models))
+    
+    return model_dirs
 
 
-def main():
-    """메인 실행 함수"""
+def save_multihead_model_as_tfjs(trained_multihead, num_shards=None,
+                                 shard_size_bytes=DEFAULT_SHARD_SIZE_BYTES,
+                                 quantization=None, reference_inputs=None):
+    """다중 헤드 모델을 하나의 TensorFlow.js 모델로 저장"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    model_dir = os.path.join(script_dir, "..", "public", "models", MULTIHEAD_MODEL_NAME)
+    model_dir = os.path.normpath(model_dir)
+    
+    # 기존 파일들 삭제
+    import shutil
+    if os.path.exists(model_dir):
+        shutil.rmtree(model_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    
+    print(f"🔄 다중 헤드 모델을 TensorFlow.js 형식으로 저장 중...")
+    
+    weight_files = write_tfjs_model(
+        trained_multihead['model'], model_dir,
+        num_shards=num_shards, shard_size_bytes=shard_size_bytes,
+        quantization=quantization
+    )
+    if quantization:
+        report_quantization_error(trained_multihead['model'], quantization, reference_inputs)
+    verify_export_parity(trained_multihead['model'], model_dir, reference_inputs, quantization)
+    
+    # 모든 헤드의 라벨 정보 저장 (outputs 순서 = model.predict 출력 순서)
+    label_info = {
+        'indicators': trained_multihead['indicators'],
+        'outputs': [multihead_output_name(indicator) for indicator in trained_multihead['indicators']],
+        'classes': {
+            indicator: classes.tolist()
+            for indicator, classes in trained_multihead['classes'].items()
+        }
+    }
+    
+    with open(os.path.join(model_dir, 'labels.json'), 'w', encoding='utf-8') as f:
+        json.dump(label_info, f, ensure_ascii=False, indent=2)
+    
+    print(f"✅ 다중 헤드 모델이 TensorFlow.js 형식으로 {model_dir}에 저장되었습니다.")
+    print(f"   📁 생성된 파일: model.json, {len(weight_files)}개 가중치 파일, labels.json")
+    write_model_manifest('multihead', trained_multihead['indicators'])
+    return model_dir
+
+
+def main(multihead=False, use_tf_data=False, telemetry=False, profile_steps=None,
+         cv_folds=None, cv_export='refit', palette_index=False, parallel=False,
+         augmentation_count=5, lazy_augmentation=False):
+    """메인 실행 함수
+
+    multihead=True이면 네 개의 지표 모델 대신 하나의 다중 헤드 모델을
+    public/models/mbti-multihead에 저장합니다.
+    use_tf_data=True이면 tf.data 입력 파이프라인으로 학습합니다.
+    telemetry=True이면 에포크별 성능 지표를 각 모델 디렉토리의 training_telemetry.jsonl에 저장합니다.
+    cv_folds=k이면 지표별 k-fold 교차 검증을 병렬로 수행하고 cv_export('refit', 'best')
+    모델과 cross_validation.json을 저장합니다. cv_export=None이면 평가만 합니다.
+    palette_index=True이면 학습 팔레트와 라벨의 최근접 이웃 인덱스를
+    public/models/mbti-palette-index/palette_index.bin에 함께 저장합니다 (palette_index).
+    parallel=True이면 지표별 모델을 별도 워커 프로세스에서 병렬로 학습합니다 (기본: 순차 학습).
+    augmentation_count는 원본 샘플당 증강본 수이며, lazy_augmentation=True이면 증강본을
+    미리 만들지 않고 에포크마다 배치 단위로 새 노이즈를 생성합니다.
+    """
+    if multihead and cv_folds:
+        raise ValueError("k-fold 교차 검증은 지표별 모델에서만 사용할 수 있습니다.")
+    if cv_folds is not None and cv_folds < 2:
+        raise ValueError(f"k-fold 교차 검증의 폴드 수는 2 이상이어야 합니다: {cv_folds}")
+    if cv_folds and (telemetry or profile_steps):
+        raise ValueError("k-fold 교차 검증에서는 성능 지표 기록(--telemetry, --profile-steps)을 사용할 수 없습니다.")
+    
     print("🚀 MBTI 컬러 팔레트 모델 학습 시작!")
     print("🌐 TensorFlow.js 브라우저 호환 형식으로 저장")
     
@@ -308,24 +832,67 @@ def main():
     print("📊 학습 데이터 로드 중...")
     datasets = load_training_data()
     
+    # "비슷한 팔레트" 조회용 최근접 이웃 인덱스 (증강 전 원본 팔레트)
+    if palette_index:
+        from palette_index import build_palette_index
+        build_palette_index(datasets)
+    
     # 데이터 전처리 (데이터 증강 포함)
     print("🔧 데이터 전처리 및 증강 중...")
-    models_data = prepare_data_for_training(datasets, use_augmentation=True)
+    models_data = prepare_data_for_training(
+        datasets, use_augmentation=True, augmentation_count=augmentation_count,
+        lazy_augmentation=lazy_augmentation
+    )
     
-    # 모델 학습
+    # 모델 학습 및 TensorFlow.js 형식으로 저장
     print("🧠 모델 학습 시작...")
-    trained_models = train_models(models_data)
-    
-    # TensorFlow.js 형식으로 저장
-    print("💾 TensorFlow.js 형식으로 저장 중...")
-    save_models_as_tfjs(trained_models)
+    if multihead:
+        telemetry_log = telemetry_log_path(MULTIHEAD_MODEL_NAME) if telemetry or profile_steps else None
+        trained_multihead = train_multihead_model(
+            models_data, use_tf_data=use_tf_data,
+            telemetry_log=telemetry_log, profile_steps=profile_steps
+        )
+        print("💾 TensorFlow.js 형식으로 저장 중...")
+        reference_inputs = np.concatenate(list(validation_inputs(models_data).values()))
+        publish_telemetry(telemetry_log, save_multihead_model_as_tfjs(
+            trained_multihead, reference_inputs=reference_inputs
+        ))
+    elif cv_folds:
+        trained_models, cv_summary = cross_validate_indicators(
+            models_data, k=cv_folds, use_tf_data=use_tf_data, export=cv_export
+        )
+        if trained_models is None:
+            print("📊 교차 검증만 수행했습니다 (모델을 저장하지 않음).")
+            return
+        print("💾 TensorFlow.js 형식으로 저장 중...")
+        model_dirs = save_models_as_tfjs(trained_models, reference_inputs=validation_inputs(models_data))
+        for indicator, model_dir in model_dirs.items():
+            save_cross_validation_summary(cv_summary[indicator], model_dir)
+    else:
+        trained_models = train_models(
+            models_data, parallel=parallel, use_tf_data=use_tf_data,
+            telemetry=telemetry, profile_steps=profile_steps
+        )
+        print("💾 TensorFlow.js 형식으로 저장 중...")
+        model_dirs = save_models_as_tfjs(trained_models, reference_inputs=validation_inputs(models_data))
+        if telemetry or profile_steps:
+            for indicator, model_dir in model_dirs.items():
+                publish_telemetry(telemetry_log_path(indicator), model_dir)
     
     print("🎉 모든 모델 학습 및 저장 완료!")
     print("🌐 이제 브라우저에서 바로 사용할 수 있습니다!")
     print("📁 생성된 파일들:")
     print("   - model.json: TensorFlow.js 호환 모델 구조")
-    print("   - weights_*.bin: 모델 가중치 파일들")
+    print("   - group1-shard*.bin: 모델 가중치 샤드 파일들")
     print("   - labels.json: 라벨 정보")
 
 if __name__ == "__main__":
-    main()
+    import sys
+    args = sys.argv[1:]
+    main(multihead='--multihead' in args, use_tf_data='--tf-data' in args,
+         telemetry='--telemetry' in args,
+         cv_folds=int(args[args.index('--cv-folds') + 1]) if '--cv-folds' in args[:-1] else None,
+         palette_index='--palette-index' in args, parallel='--parallel' in args,
+         augmentation_count=(int(args[args.index('--augmentation-count') + 1])
+                             if '--augmentation-count' in args[:-1] else 5),
+         lazy_augmentation='--lazy-augmentation' in args)
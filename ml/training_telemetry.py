@@ -0,0 +1,162 @@
+"""
+학습 성능 텔레메트리
+에포크마다 소요 시간, 처리량(샘플/초), 데이터 대기/연산 시간, 프로세스 RSS,
+학습률을 JSONL 한 줄로 기록하고, 지정한 스텝 구간의 TensorBoard 프로파일러
+트레이스를 선택적으로 수집합니다. 기록 파일은 내보낸 모델 디렉토리로 옮깁니다.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+tf = lazy_import('tensorflow')
+keras = lazy_import('tensorflow.keras')
+
+TELEMETRY_FILE_NAME = 'training_telemetry.jsonl'
+TELEMETRY_SUFFIX = '.telemetry.jsonl'
+DEFAULT_PROFILE_DIR = os.path.join('logs', 'profile')
+
+
+def telemetry_log_path(name):
+    """학습 중 기록할 텔레메트리 파일 경로 (체크포인트 이름 또는 모델 이름 기준)"""
+    return os.path.splitext(name)[0] + TELEMETRY_SUFFIX
+
+
+def process_rss_bytes():
+    """현재 프로세스의 상주 메모리(RSS) 바이트 수
+
+    /proc을 사용할 수 없는 플랫폼에서는 최대 RSS로 대신합니다.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def telemetry_callback(samples_per_epoch, log_path, label='', profile_steps=None,
+                       profile_dir=DEFAULT_PROFILE_DIR):
+    """에포크별 성능 지표를 log_path(JSONL)에 기록하는 콜백
+
+    data_seconds는 학습 스텝 사이에서 기다린 시간(배치 준비, 콜백, 진행 표시),
+    compute_seconds는 학습 스텝 실행 시간, validation_seconds는 마지막 학습 배치
+    이후 에포크가 끝날 때까지의 시간(검증, 체크포인트 저장)입니다. tf.data가
+    그래프 안에서 배치를 가져오는 경우 입력 지연은 compute_seconds에 포함되므로,
+    profile_steps=(시작, 끝) 전역 스텝 구간의 프로파일러 트레이스(profile_dir)에서
+    입력 파이프라인 분석으로 나눠 확인합니다.
+    """
+
+    class TelemetryCallback(keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.records = []
+            self._step = 0
+            self._profiling = False
+            self._file = None
+
+        def on_train_begin(self, logs=None):
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            self._file = open(log_path, 'w', encoding='utf-8')
+            self._train_start = time.perf_counter()
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._epoch_start = self._batch_end = time.perf_counter()
+            self._data_seconds = 0.0
+            self._compute_seconds = 0.0
+            self._batches = 0
+
+        def on_train_batch_begin(self, batch, logs=None):
+            if profile_steps and self._step == profile_steps[0]:
+                print(f"\n🔬 프로파일러 트레이스 시작 (스텝 {profile_steps[0]}~{profile_steps[1]}): {profile_dir}")
+                tf.profiler.experimental.start(profile_dir)
+                self._profiling = True
+            self._batch_start = time.perf_counter()
+            self._data_seconds += self._batch_start - self._batch_end
+
+        def on_train_batch_end(self, batch, logs=None):
+            if logs and 'loss' in logs:
+                float(logs['loss'])  # 비동기 실행이 끝날 때까지 대기
+            self._batch_end = time.perf_counter()
+            self._compute_seconds += self._batch_end - self._batch_start
+            self._batches += 1
+            self._step += 1
+            if self._profiling and self._step >= profile_steps[1]:
+                self._stop_profiler()
+
+        def on_epoch_end(self, epoch, logs=None):
+            now = time.perf_counter()
+            wall_time = now - self._epoch_start
+            record = {
+                'label': label,
+                'epoch': epoch + 1,
+                'wall_time': wall_time,
+                'samples_per_second': samples_per_epoch / max(wall_time, 1e-9),
+                'steps': self._batches,
+                'data_seconds': self._data_seconds,
+                'compute_seconds': self._compute_seconds,
+                'validation_seconds': now - self._batch_end,
+                'rss_mb': process_rss_bytes() / 2**20,
+                'learning_rate': float(np.asarray(
+                    keras.ops.convert_to_numpy(self.model.optimizer.learning_rate)
+                )),
+                **{key: float(value) for key, value in (logs or {}).items()
+                   if key != 'learning_rate'}
+            }
+            self.records.append(record)
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+        def on_train_end(self, logs=None):
+            if self._profiling:
+                self._stop_profiler()
+            if self._file is not None:
+                self._file.close()
+            if self.records:
+                print_telemetry_summary(self.records, label)
+                print(f"   📝 에포크별 기록: {log_path}")
+
+        def _stop_profiler(self):
+            tf.profiler.experimental.stop()
+            self._profiling = False
+            print(f"\n🔬 프로파일러 트레이스 저장: {profile_dir} (tensorboard --logdir {profile_dir})")
+
+    return TelemetryCallback()
+
+
+def print_telemetry_summary(records, label=''):
+    """전체 에포크의 시간 구성과 처리량, 최대 RSS 출력"""
+    total = sum(record['wall_time'] for record in records)
+    data = sum(record['data_seconds'] for record in records)
+    compute = sum(record['compute_seconds'] for record in records)
+    validation = sum(record['validation_seconds'] for record in records)
+
+    print(f"\n📈 학습 텔레메트리{f' ({label})' if label else ''}: {len(records)} 에포크, {total:.1f}초")
+    print(f"   연산 {compute:.1f}초 ({compute / max(total, 1e-9) * 100:.0f}%), "
+          f"데이터 대기 {data:.1f}초 ({data / max(total, 1e-9) * 100:.0f}%), "
+          f"검증 {validation:.1f}초 ({validation / max(total, 1e-9) * 100:.0f}%)")
+    print(f"   처리량 {np.median([record['samples_per_second'] for record in records]):,.0f} 샘플/초 (중앙값), "
+          f"최대 RSS {max(record['rss_mb'] for record in records):,.0f}MB")
+
+
+def load_telemetry(path):
+    """JSONL 텔레메트리 파일을 에포크 기록 목록으로 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def publish_telemetry(log_path, model_dir):
+    """학습 중 기록한 텔레메트리 파일을 내보낸 모델 디렉토리로 이동"""
+    if not log_path or not os.path.exists(log_path):
+        return None
+    target = os.path.join(model_dir, TELEMETRY_FILE_NAME)
+    shutil.move(log_path, target)
+    print(f"   📝 학습 텔레메트리: {target}")
+    return target
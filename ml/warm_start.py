@@ -0,0 +1,124 @@
+"""
+체크포인트 기반 증분(warm-start) 재학습 도우미
+체크포인트 옆에 학습 상태 파일(<체크포인트>.state.json)을 두어 마지막 학습의
+샘플 수, 에포크 수, 소요 시간, 정규화 통계를 기록하고, 새로 추가된 샘플과
+이전 데이터의 재현(replay) 샘플만으로 미세 조정할 행을 고릅니다.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+TRAINING_STATE_SUFFIX = '.state.json'
+
+
+def training_state_path(checkpoint_path):
+    """체크포인트에 대응하는 학습 상태 파일 경로"""
+    return os.path.splitext(checkpoint_path)[0] + TRAINING_STATE_SUFFIX
+
+
+def load_training_state(checkpoint_path):
+    """체크포인트와 학습 상태가 모두 있으면 상태 dict, 아니면 None"""
+    state_path = training_state_path(checkpoint_path)
+    if not (os.path.exists(checkpoint_path) and os.path.exists(state_path)):
+        return None
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_training_state(checkpoint_path, n_samples, epochs, wall_time, scaler=None,
+                        previous_state=None, index_split=False):
+    """학습 결과를 상태 파일에 기록
+
+    previous_state가 없으면(처음부터 학습) 이번 학습을 콜드 스타트 기준으로
+    기록하고, 증분 학습이면 이전 상태의 콜드 스타트 기준을 그대로 유지합니다.
+    index_split은 콜드 스타트의 훈련/검증 분할 방식(True: 스트리밍·tf.data의 split_mask,
+    False: train_test_split)이며, 증류 등에서 같은 검증 행을 고를 수 있도록 함께 기록합니다.
+    """
+    run = {'n_samples': int(n_samples), 'epochs': int(epochs), 'wall_time': float(wall_time)}
+    state = {
+        **run,
+        'mode': 'cold' if previous_state is None else 'incremental',
+        'cold_start': run if previous_state is None else previous_state['cold_start'],
+        'index_split': bool(index_split) if previous_state is None
+                       else previous_state.get('index_split', False),
+        'updated': time.time()
+    }
+    if scaler is not None:
+        state['scaler'] = {
+            'mean': np.asarray(scaler.mean_).tolist(),
+            'scale': np.asarray(scaler.scale_).tolist()
+        }
+
+    with open(training_state_path(checkpoint_path), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    return state
+
+
+def scaler_from_state(state):
+    """상태 파일의 정규화 통계를 StandardScaler 호환 객체로 복원 (없으면 None)"""
+    if not state or 'scaler' not in state:
+        return None
+
+    from streaming_data import StreamingStandardScaler
+
+    return StreamingStandardScaler.from_stats(
+        state['scaler']['mean'], state['scaler']['scale'], state['n_samples']
+    )
+
+
+def held_out_inputs(X, checkpoint_path, limit=2048):
+    """체크포인트 학습에서 검증으로 남긴 행의 원본 입력 (정규화·투영 전, 최대 limit개)
+
+    학습 상태에 기록된 분할 방식(index_split)을 따르며, 상태가 없으면 NumPy 경로의
+    train_test_split 분할을 사용합니다. 내보내기의 그래프 접기·양자화 오차 검증에 사용합니다.
+    """
+    from descriptor_projection import validation_rows
+
+    state = load_training_state(checkpoint_path) or {}
+    rows = validation_rows(len(X), state.get('index_split', False))[:limit]
+    return np.asarray(X[rows], dtype=np.float32)
+
+
+def incremental_rows(n_previous, n_total, replay_ratio=1.0, rng=None):
+    """새로 추가된 행(n_previous 이후)과 이전 행의 재현 샘플 인덱스
+
+    학습 데이터는 뒤에 이어 붙여 갱신된다고 가정합니다. 재현 샘플 수는
+    새 샘플 수 × replay_ratio이며(이전 행 수를 넘지 않음), 이전 분포를
+    잊지 않도록 새 샘플과 함께 학습합니다.
+    데이터가 이전보다 적으면(파일 재생성 등) 새 행도 재현 샘플도 없으므로 경고합니다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if n_total < n_previous:
+        print(f"   ⚠️ 데이터 샘플 수({n_total})가 이전 학습({n_previous})보다 적습니다. "
+              f"데이터가 다시 생성되었다면 --incremental 없이 처음부터 학습해주세요.")
+    n_previous = min(n_previous, n_total)
+    new_rows = np.arange(n_previous, n_total)
+    replay_count = min(n_previous, int(round(len(new_rows) * replay_ratio)))
+    replay_rows = np.sort(rng.choice(n_previous, size=replay_count, replace=False))
+    return np.concatenate([replay_rows, new_rows]), len(new_rows)
+
+
+def report_warm_start_savings(state, epochs, wall_time, n_samples):
+    """콜드 스타트 대비 절약한 에포크 수와 학습 시간 출력
+
+    콜드 스타트 시간은 기준 학습 시간을 현재 샘플 수에 비례해 환산한 추정치입니다.
+    """
+    cold = state['cold_start']
+    estimated_cold_time = cold['wall_time'] * n_samples / max(cold['n_samples'], 1)
+    savings = {
+        'epochs': int(epochs),
+        'cold_start_epochs': cold['epochs'],
+        'epochs_saved': cold['epochs'] - int(epochs),
+        'wall_time': float(wall_time),
+        'estimated_cold_start_time': estimated_cold_time,
+        'time_saved': estimated_cold_time - wall_time
+    }
+
+    print(f"\n♻️ 증분 학습 결과 (콜드 스타트 대비):")
+    print(f"   에포크: {epochs}회 (콜드 스타트 {cold['epochs']}회, {savings['epochs_saved']}회 절약)")
+    print(f"   학습 시간: {wall_time:.1f}초 (콜드 스타트 추정 {estimated_cold_time:.1f}초, "
+          f"{savings['time_saved']:.1f}초 절약)")
+    return savings
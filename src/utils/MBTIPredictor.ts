@@ -18,20 +18,123 @@ export interface ModelInfo {
   indicator: string;
 }
 
+export interface MultiHeadModelInfo {
+  indicators: string[];
+  outputs: string[];
+  classes: Record<string, string[]>;
+}
+
+export interface ModelManifest {
+  layout: 'multihead' | 'per-indicator';
+  indicators: string[];
+  model?: string;
+}
+
+const MULTIHEAD_MODEL_DIR = '/models/mbti-multihead';
+
+// 학습 스크립트가 마지막으로 저장한 모델 배치 (ml/train_model.py write_model_manifest)
+const MODEL_MANIFEST_URL = '/models/mbti-models.json';
+
+const DEFAULT_INDICATORS = ['e-i', 's-n', 't-f', 'j-p'];
+
+/**
+ * 확률 배열에서 가장 높은 확률의 클래스를 예측 결과로 변환합니다.
+ */
+function toPrediction(
+  indicator: string,
+  classes: string[],
+  probabilities: ArrayLike<number>
+): MBTIPrediction {
+  let maxIndex = 0;
+  let maxProbability = probabilities[0] ?? 0;
+
+  for (let i = 1; i < probabilities.length; i += 1) {
+    const probability = probabilities[i] ?? 0;
+    if (probability > maxProbability) {
+      maxIndex = i;
+      maxProbability = probability;
+    }
+  }
+
+  return {
+    indicator,
+    prediction: classes[maxIndex] ?? '',
+    confidence: Math.round(maxProbability * 100) / 100,
+  };
+}
+
 export class MBTIPredictor {
   private models: Map<string, tf.LayersModel> = new Map();
 
   private modelInfos: Map<string, ModelInfo> = new Map();
 
+  private multiHeadModel: tf.LayersModel | null = null;
+
+  private multiHeadInfo: MultiHeadModelInfo | null = null;
+
   private isLoaded: boolean = false;
 
+  /**
+   * 모델 배치 목록을 읽습니다. 목록이 없으면 지표별 모델을 사용합니다.
+   */
+  private async loadManifest(): Promise<ModelManifest> {
+    try {
+      const response = await fetch(MODEL_MANIFEST_URL);
+      if (response.ok) {
+        return (await response.json()) as ModelManifest;
+      }
+    } catch (error) {
+      // eslint-disable-next-line no-console
+      console.warn('모델 목록을 읽을 수 없어 지표별 모델을 로드합니다.', error);
+    }
+    return { layout: 'per-indicator', indicators: DEFAULT_INDICATORS };
+  }
+
+  /**
+   * 네 지표를 한 번에 예측하는 다중 헤드 모델을 로드합니다.
+   * 모델이 없으면 false를 반환합니다.
+   */
+  private async loadMultiHeadModel(): Promise<boolean> {
+    try {
+      const response = await fetch(`${MULTIHEAD_MODEL_DIR}/labels.json`);
+      if (!response.ok) return false;
+
+      const modelInfo: MultiHeadModelInfo = await response.json();
+      const model = await tf.loadLayersModel(
+        `${MULTIHEAD_MODEL_DIR}/model.json`
+      );
+
+      this.multiHeadModel = model;
+      this.multiHeadInfo = modelInfo;
+      // eslint-disable-next-line no-console
+      console.log('✅ 다중 헤드 MBTI 모델 로드 완료');
+      return true;
+    } catch (error) {
+      // eslint-disable-next-line no-console
+      console.warn(
+        '다중 헤드 모델을 사용할 수 없어 지표별 모델을 로드합니다.',
+        error
+      );
+      return false;
+    }
+  }
+
   /**
    * 모든 MBTI 모델을 로드합니다.
    */
   async loadModels(): Promise<void> {
     if (this.isLoaded) return;
 
-    const indicators = ['e-i', 's-n', 't-f', 'j-p'];
+    // 모델 목록이 가리키는 배치만 요청 (없는 다중 헤드 모델을 먼저 요청하지 않음)
+    const manifest = await this.loadManifest();
+    if (manifest.layout === 'multihead' && (await this.loadMultiHeadModel())) {
+      this.isLoaded = true;
+      return;
+    }
+
+    const indicators = manifest.indicators.length
+      ? manifest.indicators
+      : DEFAULT_INDICATORS;
 
     try {
       // 각 지표별 모델 로드
@@ -96,35 +199,54 @@ export class MBTIPredictor {
       const prediction = model.predict(inputTensor) as tf.Tensor;
       const predictionArray = await prediction.data();
 
-      // 가장 높은 확률의 클래스 찾기
-      let maxIndex = 0;
-      let maxProbability = predictionArray[0];
-
-      for (let i = 1; i < predictionArray.length; i += 1) {
-        if (predictionArray[i] > maxProbability) {
-          maxIndex = i;
-          maxProbability = predictionArray[i];
-        }
-      }
-
-      const predictedClass = modelInfo.classes[maxIndex];
-      const confidence = maxProbability;
-
       // 메모리 정리
       inputTensor.dispose();
       prediction.dispose();
 
-      return {
-        indicator,
-        prediction: predictedClass,
-        confidence: Math.round(confidence * 100) / 100,
-      };
+      // 가장 높은 확률의 클래스 찾기
+      return toPrediction(indicator, modelInfo.classes, predictionArray);
     } catch (error) {
       inputTensor.dispose();
       throw error;
     }
   }
 
+  /**
+   * 다중 헤드 모델로 네 지표를 한 번의 추론으로 예측합니다.
+   */
+  private async predictWithMultiHead(
+    palette: ColorPalette
+  ): Promise<MBTIPrediction[]> {
+    const model = this.multiHeadModel;
+    const modelInfo = this.multiHeadInfo;
+
+    if (!model || !modelInfo) {
+      throw new Error('다중 헤드 모델이 로드되지 않았습니다.');
+    }
+
+    const inputTensor = tf.tensor2d([paletteToVector(palette)]);
+
+    try {
+      // 출력 순서는 labels.json의 indicators 순서와 같음
+      const outputs = model.predict(inputTensor) as tf.Tensor[];
+      const probabilities = await Promise.all(
+        outputs.map((output) => output.data())
+      );
+
+      outputs.forEach((output) => output.dispose());
+
+      return modelInfo.indicators.map((indicator, index) =>
+        toPrediction(
+          indicator,
+          modelInfo.classes[indicator] ?? [],
+          probabilities[index] ?? []
+        )
+      );
+    } finally {
+      inputTensor.dispose();
+    }
+  }
+
   /**
    * 색상 팔레트로부터 MBTI를 예측합니다.
    */
@@ -137,6 +259,12 @@ export class MBTIPredictor {
     const predictions: MBTIPrediction[] = [];
 
     try {
+      if (this.multiHeadModel) {
+        // 다중 헤드 모델: 한 번의 추론으로 네 지표 예측
+        predictions.push(...(await this.predictWithMultiHead(palette)));
+        return combineMBTIPredictions(predictions);
+      }
+
       // 각 지표별로 예측 수행
       const predictionPromises = indicators.map(async (indicator) => {
         return this.predictSingleIndicator(indicator, palette);
@@ -162,7 +290,9 @@ export class MBTIPredictor {
   getModelStatus(): { isLoaded: boolean; loadedModels: string[] } {
     return {
       isLoaded: this.isLoaded,
-      loadedModels: Array.from(this.models.keys()),
+      loadedModels: this.multiHeadModel
+        ? ['mbti-multihead']
+        : Array.from(this.models.keys()),
     };
   }
 
@@ -175,6 +305,9 @@ export class MBTIPredictor {
     });
     this.models.clear();
     this.modelInfos.clear();
+    this.multiHeadModel?.dispose();
+    this.multiHeadModel = null;
+    this.multiHeadInfo = null;
     this.isLoaded = false;
   }
 }
@@ -12,11 +12,34 @@ import {
 } from './ColorReasonGenerator';
 import { FaceFeatureExtractor, FaceLandmarks } from './FaceFeatureExtractor';
 
+export interface FaceColorModelManifest {
+  student: boolean;
+  model: string;
+}
+
+// 학습 스크립트가 마지막으로 저장한 모델 목록 (ml/distillation.py write_face_color_manifest)
+const FACE_COLOR_MANIFEST_URL = '/models/face-color-models.json';
+
 export class ColorPredictor {
   private faceColorModel: tf.LayersModel | null = null;
 
   private isModelsLoaded: boolean = false;
 
+  /**
+   * 모델 목록을 읽습니다. 목록이 없으면 student 없이 다양한 모델부터 시도합니다.
+   */
+  private async loadManifest(): Promise<FaceColorModelManifest> {
+    try {
+      const response = await fetch(FACE_COLOR_MANIFEST_URL);
+      if (response.ok) {
+        return (await response.json()) as FaceColorModelManifest;
+      }
+    } catch (error) {
+      console.warn('모델 목록을 읽을 수 없어 다양한 모델을 로드합니다.', error);
+    }
+    return { student: false, model: 'diverse-face-to-color' };
+  }
+
   /**
    * 커스텀 얼굴-색상 모델을 로드합니다.
    */
@@ -24,22 +47,37 @@ export class ColorPredictor {
     if (this.isModelsLoaded) return;
 
     try {
+      // 증류한 소형 모델(--distill)은 모델 목록에 있을 때만 우선 시도
+      const manifest = await this.loadManifest();
+      if (manifest.student) {
+        try {
+          const studentModelUrl = `/models/${manifest.model}/model.json`;
+          this.faceColorModel = await tf.loadLayersModel(studentModelUrl);
+          console.log('✅ 소형 얼굴-색상 모델 로드 완료 (148차원 입력)');
+        } catch (studentError) {
+          console.log('⚠️ 소형 모델 로드 실패, 다양한 모델 시도');
+        }
+      }
+
       // 다양한 모델 우선 시도, 실패하면 다른 모델들 시도
-      try {
-        const diverseModelUrl = '/models/diverse-face-to-color/model.json';
-        this.faceColorModel = await tf.loadLayersModel(diverseModelUrl);
-        console.log('✅ 다양한 얼굴-색상 모델 로드 완료 (148차원 입력)');
-      } catch (diverseError) {
-        console.log('⚠️ 다양한 모델 로드 실패, 향상된 모델 시도');
+      if (!this.faceColorModel) {
         try {
-          const enhancedModelUrl = '/models/enhanced-face-to-color/model.json';
-          this.faceColorModel = await tf.loadLayersModel(enhancedModelUrl);
-          console.log('✅ 향상된 얼굴-색상 모델 로드 완료 (148차원 입력)');
-        } catch (enhancedError) {
-          console.log('⚠️ 향상된 모델 로드 실패, 기존 모델 사용');
-          const modelUrl = '/models/face-to-color/model.json';
-          this.faceColorModel = await tf.loadLayersModel(modelUrl);
-          console.log('✅ 기존 얼굴-색상 모델 로드 완료 (128차원 입력)');
+          const diverseModelUrl = '/models/diverse-face-to-color/model.json';
+          this.faceColorModel = await tf.loadLayersModel(diverseModelUrl);
+          console.log('✅ 다양한 얼굴-색상 모델 로드 완료 (148차원 입력)');
+        } catch (diverseError) {
+          console.log('⚠️ 다양한 모델 로드 실패, 향상된 모델 시도');
+          try {
+            const enhancedModelUrl =
+              '/models/enhanced-face-to-color/model.json';
+            this.faceColorModel = await tf.loadLayersModel(enhancedModelUrl);
+            console.log('✅ 향상된 얼굴-색상 모델 로드 완료 (148차원 입력)');
+          } catch (enhancedError) {
+            console.log('⚠️ 향상된 모델 로드 실패, 기존 모델 사용');
+            const modelUrl = '/models/face-to-color/model.json';
+            this.faceColorModel = await tf.loadLayersModel(modelUrl);
+            console.log('✅ 기존 얼굴-색상 모델 로드 완료 (128차원 입력)');
+          }
         }
       }
       this.isModelsLoaded = true;